@@ -0,0 +1,94 @@
+"""Measure /robot/act requests per second against the number of API worker processes.
+
+Each worker count starts ``vct serve`` (policy trained once and shared) on a free
+port and drives it from separate client processes over keep-alive connections.
+Usage::
+
+    python -m benchmarks.bench_api_workers --workers 1 2 4 --clients 16 --duration 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+API_KEY = "bench-key"
+BODY = json.dumps({"text": "сидіти", "confidence": 0.9}).encode("utf-8")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _wait_ready(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"Server on port {port} did not become ready in {timeout:.0f}s")
+
+
+def _client(port: int, duration: float) -> int:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    headers = {"Content-Type": "application/json", "X-API-Key": API_KEY}
+    done = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        conn.request("POST", "/robot/act", body=BODY, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        done += response.status == 200
+    conn.close()
+    return done
+
+
+def _measure(workers: int, args: argparse.Namespace) -> float:
+    port = _free_port()
+    env = dict(os.environ, VCT_API_KEY=API_KEY, VCT_SIMULATE="1")
+    command = [sys.executable, "-m", "vct.cli", "serve", "--config", args.config]
+    command += ["--port", str(port), "--workers", str(workers)]
+    server = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_ready(port, args.startup_timeout)
+        with ProcessPoolExecutor(max_workers=args.clients) as pool:
+            counts = pool.map(_client, [port] * args.clients, [args.duration] * args.clients)
+            return sum(counts) / args.duration
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="vct/config.yaml")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    baseline: float | None = None
+    for workers in args.workers:
+        rate = _measure(workers, args)
+        baseline = baseline or rate
+        print(f"workers {workers:3d}: {rate:9.1f} req/s ({rate / baseline:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Compare keyword spotting, keyword spotting with Whisper escalation and Whisper alone.
+
+Templates and test clips are read from ``id,filename,label`` manifests in the
+``data/synthetic`` format. Without ``--train``/``--test`` a synthetic vocabulary of
+tone sequences is generated, which exercises latency and the escalation path but
+not real speech. Usage::
+
+    python -m benchmarks.bench_kws
+    python -m benchmarks.bench_kws --train templates.csv --test clips.csv --whisper tiny
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import statistics
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from vct.engines.kws import KWS_SAMPLE_RATE, KeywordSpottingSTT
+from vct.engines.stt import STTEngineBase, WhisperSTT
+
+# (duration share, low partial Hz, high partial Hz) per syllable.
+SYNTHETIC_WORDS = {
+    "сидіти": [(300, 900), (500, 1700), (350, 2300)],
+    "лежати": [(400, 1000), (700, 1200), (300, 2200)],
+    "до мене": [(350, 800), (300, 2200), (600, 1800)],
+    "голос": [(450, 850), (700, 1100), (450, 850)],
+}
+
+
+def _synthetic_word(label: str, rng: np.random.Generator) -> np.ndarray:
+    stretch = rng.uniform(0.85, 1.15)
+    shift = rng.uniform(0.97, 1.03)
+    parts = [np.zeros(int(KWS_SAMPLE_RATE * rng.uniform(0.05, 0.3)))]
+    for low, high in SYNTHETIC_WORDS[label]:
+        count = int(KWS_SAMPLE_RATE * 0.15 * stretch * rng.uniform(0.9, 1.1))
+        t = np.arange(count) / KWS_SAMPLE_RATE
+        tone = np.sin(2 * np.pi * low * shift * t) + 0.5 * np.sin(2 * np.pi * high * shift * t)
+        parts.append(0.4 * tone * np.hanning(count))
+    parts.append(np.zeros(int(KWS_SAMPLE_RATE * rng.uniform(0.05, 0.3))))
+    signal = np.concatenate(parts)
+    return signal + rng.normal(0.0, 0.01, signal.size)
+
+
+def _write_synthetic(directory: Path, name: str, per_label: int, seed: int) -> Path:
+    rng = np.random.default_rng(seed)
+    manifest = directory / f"{name}.csv"
+    with manifest.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["id", "filename", "label"])
+        index = 0
+        for label in SYNTHETIC_WORDS:
+            for _ in range(per_label):
+                index += 1
+                filename = f"{name}_{index:04d}.wav"
+                pcm = (np.clip(_synthetic_word(label, rng), -1, 1) * 32767).astype("<i2")
+                with wave.open(str(directory / filename), "wb") as wav:
+                    wav.setnchannels(1)
+                    wav.setsampwidth(2)
+                    wav.setframerate(KWS_SAMPLE_RATE)
+                    wav.writeframes(pcm.tobytes())
+                writer.writerow([index, filename, label])
+    return manifest
+
+
+def _read_manifest(manifest: Path) -> list[tuple[str, str]]:
+    with manifest.open(newline="", encoding="utf-8") as fh:
+        return [
+            (str(manifest.parent / row["filename"]), row["label"]) for row in csv.DictReader(fh)
+        ]
+
+
+def _run(name: str, engine: STTEngineBase, clips: list[tuple[str, str]]) -> None:
+    latencies = []
+    correct = 0
+    answered = 0
+    for path, label in clips:
+        start = time.perf_counter()
+        text = engine.transcribe(wav_path=path).strip().lower()
+        latencies.append((time.perf_counter() - start) * 1000)
+        answered += bool(text)
+        correct += text == label.lower()
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"{name:<12} accuracy {correct / len(clips):6.1%}  "
+        f"answered {answered / len(clips):6.1%} "
+        f"(precision {correct / answered if answered else 0.0:6.1%})  "
+        f"p50 {statistics.median(latencies):8.2f} ms  p95 {p95:8.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--train", type=Path, default=None, help="Template manifest")
+    parser.add_argument("--test", type=Path, default=None, help="Evaluation manifest")
+    parser.add_argument("--templates-per-label", type=int, default=3)
+    parser.add_argument("--clips-per-label", type=int, default=50)
+    parser.add_argument("--min-confidence", type=float, default=0.2)
+    parser.add_argument("--whisper", default=None, help="Whisper model used for escalation")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="vct-kws-") as tmp:
+        train = args.train or _write_synthetic(
+            Path(tmp), "train", args.templates_per_label, args.seed
+        )
+        test = args.test or _write_synthetic(Path(tmp), "test", args.clips_per_label, args.seed + 1)
+        clips = _read_manifest(test)
+        kws = KeywordSpottingSTT.from_manifest(train, min_confidence=args.min_confidence)
+        _run("kws", kws, clips)
+        if args.whisper:
+            whisper = WhisperSTT(model_name=args.whisper)
+            whisper.warmup()
+            kws.fallback = whisper
+            _run("kws+whisper", kws, clips)
+            _run("whisper", whisper, clips)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Compare API throughput with the BaseHTTPMiddleware and pure ASGI metrics middleware.
+
+Requests are driven in-process straight through the ASGI interface, so the numbers
+isolate the per-request cost of the app and its middleware stack from any server or
+network overhead. Usage::
+
+    python -m benchmarks.bench_middleware --requests 5000 --rounds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Any
+
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+API_KEY = "bench-key"
+VARIANTS = ("none", "legacy", "asgi")
+ACT_BODY = json.dumps({"text": "сидіти", "confidence": 0.9}).encode("utf-8")
+
+
+class LegacyMetricsMiddleware(BaseHTTPMiddleware):
+    """The previous implementation, labelled by raw path."""
+
+    async def dispatch(self, request: Any, call_next: Any) -> Any:
+        from vct.api.app import ACT_ENDPOINT
+        from vct.utils.metrics import observe_command_latency, record_api_request
+
+        start = time.perf_counter()
+        path = request.url.path
+        try:
+            response = await call_next(request)
+        except Exception:
+            record_api_request(path, request.method, 500)
+            raise
+        record_api_request(path, request.method, response.status_code)
+        if path == ACT_ENDPOINT:
+            observe_command_latency(path, time.perf_counter() - start)
+        return response
+
+
+def _build_app(variant: str) -> Any:
+    from vct.api.app import APISettings, create_app
+    from vct.api.middleware import MetricsMiddleware
+
+    app = create_app(APISettings(startup="lazy"))
+    for index, middleware in enumerate(app.user_middleware):
+        if middleware.cls is MetricsMiddleware:
+            if variant == "none":
+                del app.user_middleware[index]
+            elif variant == "legacy":
+                app.user_middleware[index] = Middleware(LegacyMetricsMiddleware)
+            break
+    return app
+
+
+async def _request(app: Any, method: str, path: str, body: bytes) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"x-api-key", API_KEY.encode()),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+        "state": {},
+    }
+    sent = False
+    status = 0
+
+    async def receive() -> dict[str, Any]:
+        nonlocal sent
+        if sent:
+            await asyncio.sleep(3600)
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _measure(app: Any, method: str, path: str, body: bytes, requests: int) -> float:
+    for _ in range(50):
+        await _request(app, method, path, body)
+    start = time.perf_counter()
+    for _ in range(requests):
+        if await _request(app, method, path, body) != 200:
+            raise SystemExit(f"{method} {path} failed")
+    return requests / (time.perf_counter() - start)
+
+
+async def _run(args: argparse.Namespace) -> dict[tuple[str, str], float]:
+    endpoints = [("GET", "/health", b""), ("POST", "/robot/act", ACT_BODY)]
+    apps = {variant: _build_app(variant) for variant in VARIANTS}
+    results: dict[tuple[str, str], float] = {}
+    # Interleave the variants and keep the best round to even out warm-up effects.
+    for _ in range(args.rounds):
+        for variant, app in apps.items():
+            for method, path, body in endpoints:
+                rate = await _measure(app, method, path, body, args.requests)
+                results[variant, path] = max(rate, results.get((variant, path), 0.0))
+    for app in apps.values():
+        await app.state.brain_provider.aclose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="requests per round")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ["VCT_API_KEY"] = API_KEY
+    logging.disable(logging.CRITICAL)
+    with redirect_stdout(StringIO()):
+        results = asyncio.run(_run(args))
+
+    print(f"{'endpoint':<12}{'none':>12}{'legacy':>12}{'asgi':>12}{'gain':>9}")
+    for path in ("/health", "/robot/act"):
+        none, legacy, asgi = (results[v, path] for v in VARIANTS)
+        print(f"{path:<12}{none:>10.0f}/s{legacy:>10.0f}/s{asgi:>10.0f}/s{asgi / legacy:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare the compiled phrase matcher with the legacy linear substring scan.
+
+Usage::
+
+    python -m benchmarks.bench_phrase_matcher --sizes 10 100 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Mapping
+
+from vct.robodog.phrase_matcher import PhraseMatcher
+
+# Phrase ``i`` is its index spelled with letter digits between two marker letters, so
+# no phrase occurs inside another one and filler words (built from other letters)
+# never form a phrase. Every query therefore holds at most one command, the legacy
+# first-match scan and the longest-match matcher must agree, and the scan has to walk
+# the table up to the queried phrase.
+_DIGITS = "абвгдеєжзи"
+_START, _END = "ю", "я"
+_FILLER = ("ко", "лу", "мо", "ну", "по", "ру", "со", "ту")
+
+
+def _linear_scan(commands: Mapping[str, str], text: str) -> str:
+    normalized = text.strip().lower().replace(" ", "")
+    for phrase, action in commands.items():
+        if phrase.replace(" ", "") in normalized:
+            return action
+    return "NONE"
+
+
+def _phrase(index: int, width: int) -> str:
+    code = "".join(_DIGITS[int(digit)] for digit in str(index).zfill(width))
+    split = width // 2 + 1
+    return f"{_START}{code[:split]} {code[split:]}{_END}"
+
+
+def _filler(rng: random.Random) -> str:
+    return " ".join(
+        "".join(rng.choice(_FILLER) for _ in range(rng.randint(2, 4)))
+        for _ in range(rng.randint(1, 3))
+    )
+
+
+def _queries(rng: random.Random, phrases: list[str], count: int, miss_ratio: float) -> list[str]:
+    """Return queries hitting phrases spread evenly over the table, plus some misses."""
+
+    misses = round(count * miss_ratio)
+    hits = count - misses
+    targets = [phrases[i * (len(phrases) - 1) // max(hits - 1, 1)] for i in range(hits)]
+    texts = [f"{_filler(rng)} {phrase} {_filler(rng)}" for phrase in targets]
+    texts += [_filler(rng) for _ in range(misses)]
+    rng.shuffle(texts)
+    return texts
+
+
+def _time_per_call(func: object, texts: list[str]) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        func(text)  # type: ignore[operator]
+    return (time.perf_counter() - start) / len(texts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--miss-ratio", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'phrases':>8} {'build ms':>10} {'linear us':>11} {'matcher us':>11} {'speedup':>8}")
+    for size in args.sizes:
+        width = len(str(size - 1))
+        commands = {_phrase(i, width): f"ACTION_{i}" for i in range(size)}
+        texts = _queries(rng, list(commands), args.queries, args.miss_ratio)
+
+        start = time.perf_counter()
+        matcher = PhraseMatcher(commands)
+        build_ms = (time.perf_counter() - start) * 1000.0
+        mismatches = [t for t in texts if matcher.match(t) != _linear_scan(commands, t)]
+        if mismatches:
+            raise SystemExit(f"matcher disagrees with the linear scan on {mismatches[0]!r}")
+
+        linear = _time_per_call(lambda text: _linear_scan(commands, text), texts)
+        compiled = _time_per_call(matcher.match, texts)
+        print(
+            f"{size:>8} {build_ms:>10.1f} {linear * 1e6:>11.1f} "
+            f"{compiled * 1e6:>11.1f} {linear / compiled:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare BehaviorPolicy training throughput across engines and batch sizes.
+
+Usage::
+
+    python -m benchmarks.bench_policy_train --examples 2000 --epochs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import time
+
+from vct.behavior.policy import BehaviorInputs, BehaviorPolicy, TrainingExample
+
+
+def _synthetic_dataset(size: int, seed: int) -> list[TrainingExample]:
+    rng = random.Random(seed)
+    dataset: list[TrainingExample] = []
+    for _ in range(size):
+        inputs = BehaviorInputs(
+            stimulus=rng.random(),
+            confidence=rng.random(),
+            reward_bias=rng.random(),
+            mood=rng.uniform(-1.0, 1.0),
+            stress=rng.random(),
+            fatigue=rng.random(),
+            environmental_complexity=rng.random(),
+            social_engagement=rng.random(),
+        )
+        target = 0.4 * inputs.stimulus + 0.3 * inputs.confidence + 0.3 * (1.0 - inputs.fatigue)
+        dataset.append((inputs, target))
+    return dataset
+
+
+def _run(
+    backend: str, dataset: list[TrainingExample], epochs: int, batch_size: int | None
+) -> tuple[float, float]:
+    policy = BehaviorPolicy({"seed": 0, "backend": backend})
+    start = time.perf_counter()
+    history = policy.train(dataset, epochs=epochs, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    return len(dataset) * epochs / elapsed, history[-1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--examples", type=int, default=2000)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 256, 0])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    dataset = _synthetic_dataset(args.examples, args.seed)
+    backends = ["python", "numpy"] if importlib.util.find_spec("numpy") else ["python"]
+    # The per-example loop on the pure-Python engine is the reference point.
+    baseline, _ = _run("python", dataset, args.epochs, None)
+    print(f"{'backend':<8} {'batch':>8} {'examples/s':>14} {'speedup':>8} {'final loss':>11}")
+    for backend in backends:
+        for batch_size in [None, *args.batch_sizes]:
+            rate, loss = _run(backend, dataset, args.epochs, batch_size)
+            label = "sgd" if batch_size is None else "full" if batch_size == 0 else str(batch_size)
+            print(f"{backend:<8} {label:>8} {rate:>14,.0f} {rate / baseline:>7.1f}x {loss:>11.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measure DogEnv simulation steps per second with the full and the headless brain.
+
+The full brain formats and "speaks" feedback, logs every decision, updates
+Prometheus counters and runs the simulated actuator on rewards; the headless path
+(``headless=True``) only scores commands and applies the reward rules. Console
+output of the full run is discarded. Usage::
+
+    python -m benchmarks.bench_simulation --steps 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from vct.robodog.dog_bot_brain import RoboDogBrain
+from vct.simulation.dog_env import DogEnv
+
+COMMANDS = ["сидіти", "лежати", "голос", "до мене", "лапу"]
+
+
+@contextmanager
+def _quiet_stdout() -> Iterator[None]:
+    # Log handlers hold on to the original ``sys.stdout``, so silence the descriptor.
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, 1)
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(devnull)
+        os.close(saved)
+
+
+def _measure(brain: RoboDogBrain, steps: int, headless: bool) -> tuple[float, float]:
+    commands = [COMMANDS[i % len(COMMANDS)] for i in range(steps)]
+    env = DogEnv(seed=7)
+    start = time.perf_counter()
+    result = env.simulate_commands(brain, commands, headless=headless)
+    return steps / (time.perf_counter() - start), result["success_rate"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="vct/config.yaml")
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    with _quiet_stdout():
+        brain = RoboDogBrain(cfg_path=args.config, simulate=True)
+        full_rate, full_success = _measure(brain, args.steps, headless=False)
+    headless_rate, headless_success = _measure(brain, args.steps, headless=True)
+
+    print(f"{'mode':<10}{'steps/s':>12}{'success':>10}")
+    print(f"{'full':<10}{full_rate:>12.0f}{full_success:>10.3f}")
+    print(f"{'headless':<10}{headless_rate:>12.0f}{headless_success:>10.3f}")
+    print(f"speedup: {headless_rate / full_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare peak memory of long simulations kept in ``history`` versus streamed to sinks.
+
+Every mode runs the same headless episode in a fresh process and reports how far
+its peak resident set size grew during the run. Usage::
+
+    python -m benchmarks.bench_simulation_memory --steps 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import resource
+import time
+
+MODES = ("history", "ndjson", "columnar")
+
+
+def _run(mode: str, steps: int) -> tuple[float, float, float]:
+    from vct.robodog.dog_bot_brain import RoboDogBrain
+    from vct.simulation.dog_env import DogEnv
+    from vct.simulation.sinks import ColumnarBuffer, NDJSONSink, SimulationSink
+
+    env = DogEnv(seed=7)
+    brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True, clock=env.clock)
+    commands = itertools.islice(itertools.cycle(["сидіти", "лежати", "голос"]), steps)
+    sink: SimulationSink | None = None
+    if mode == "ndjson":
+        sink = NDJSONSink(open(os.devnull, "w", encoding="utf-8"))
+    elif mode == "columnar":
+        sink = ColumnarBuffer(max_rows=65536, on_flush=lambda buffer: None)
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = env.simulate_commands(brain, commands, headless=True, sink=sink)
+    elapsed = time.perf_counter() - start
+    if sink is not None:
+        sink.close()
+    growth_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / 1024
+    return result["steps"] / elapsed, growth_mb, result["success_rate"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=200_000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'mode':<10}{'steps/s':>10}{'peak growth':>14}{'success':>10}")
+    for mode in args.modes:
+        with context.Pool(1) as pool:
+            rate, growth_mb, success = pool.apply(_run, (mode, args.steps))
+        print(f"{mode:<10}{rate:>10.0f}{growth_mb:>11.1f} MB{success:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compare serial WhisperSTT.transcribe with batched transcribe_many in clips/sec.
+
+Requires ``openai-whisper``. Usage::
+
+    python -m benchmarks.bench_stt_batch path/to/clips --model tiny --batch-size 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from vct.engines.stt import WhisperSTT
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("clips", type=Path, help="Directory with .wav clips")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = sorted(str(path) for path in args.clips.glob("*.wav"))[: args.limit]
+    if not paths:
+        raise SystemExit(f"No .wav clips found in {args.clips}")
+    stt = WhisperSTT(model_name=args.model, device=args.device)
+    stt.warmup()
+
+    start = time.perf_counter()
+    for path in paths:
+        stt.transcribe(wav_path=path)
+    serial = len(paths) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    count = sum(
+        1 for _ in stt.transcribe_many(paths, batch_size=args.batch_size, workers=args.workers)
+    )
+    batched = count / (time.perf_counter() - start)
+
+    print(f"clips: {len(paths)}")
+    print(f"serial:  {serial:8.2f} clips/s")
+    print(f"batched: {batched:8.2f} clips/s ({batched / serial:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
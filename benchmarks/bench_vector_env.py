@@ -0,0 +1,65 @@
+"""Compare Monte-Carlo rollouts on scalar DogEnv instances and one VectorDogEnv.
+
+Both simulators run the same episodes (one environment per seed, the same score
+schedule) and the final states are checked for exact equality. Usage::
+
+    python -m benchmarks.bench_vector_env --envs 1000 --steps 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from vct.simulation.dog_env import DogEnv
+from vct.simulation.vector_env import VectorDogEnv
+
+
+# A stand-in policy, confident when rested and in a good mood, in scalar and array form.
+def _score(state: dict[str, float]) -> float:
+    return max(0.0, min(1.0, 0.8 - 0.5 * state["fatigue"] + 0.2 * state["mood"]))
+
+
+def _scores(observation: dict[str, np.ndarray]) -> np.ndarray:
+    return np.clip(0.8 - 0.5 * observation["fatigue"] + 0.2 * observation["mood"], 0.0, 1.0)
+
+
+def _scalar(envs: int, steps: int, seed: int) -> tuple[float, np.ndarray]:
+    start = time.perf_counter()
+    final = []
+    for i in range(envs):
+        env = DogEnv(seed=seed + i)
+        for _ in range(steps):
+            env.step("SIT", _score(env.observe()))
+        final.append(env.observe()["mood"])
+    return time.perf_counter() - start, np.array(final)
+
+
+def _vector(envs: int, steps: int, seed: int) -> tuple[float, np.ndarray]:
+    start = time.perf_counter()
+    env = VectorDogEnv(envs, seed=seed)
+    result = env.rollout(_scores, steps)
+    return time.perf_counter() - start, result["final_state"]["mood"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    scalar_s, scalar_mood = _scalar(args.envs, args.steps, args.seed)
+    vector_s, vector_mood = _vector(args.envs, args.steps, args.seed)
+    total = args.envs * args.steps
+    print(f"{'simulator':<12}{'seconds':>10}{'env steps/s':>14}")
+    print(f"{'DogEnv':<12}{scalar_s:>10.3f}{total / scalar_s:>14.0f}")
+    print(f"{'VectorDogEnv':<12}{vector_s:>10.3f}{total / vector_s:>14.0f}")
+    identical = np.array_equal(scalar_mood, vector_mood)
+    print(f"speedup: {scalar_s / vector_s:.1f}x, identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
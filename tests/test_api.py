@@ -1,4 +1,7 @@
 import os
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
 
 os.environ.setdefault("VCT_API_KEY", "test-api-key")
 
@@ -24,3 +27,330 @@ def test_act_endpoint():
     data = r.json()
     assert data["ok"] is True
     assert data["result"]["action"] in ("SIT", "NONE")
+
+
+def test_serve_publishes_policy_for_workers(monkeypatch):
+    import uvicorn
+
+    from vct.api.serve import serve
+    from vct.behavior.policy import BehaviorPolicy
+    from vct.configuration import RoboDogSettings
+
+    seen = {}
+
+    def fake_run(target, **kwargs):
+        seen["target"] = target
+        seen["kwargs"] = kwargs
+        name = os.environ["VCT_POLICY_SHM"]
+        settings = RoboDogSettings.load(os.environ["VCT_CONFIG"])
+        worker = BehaviorPolicy(settings.policy_config, shared_memory=name)
+        seen["read_only"] = worker._model.read_only
+        seen["name"] = name
+
+    monkeypatch.setattr(uvicorn, "run", fake_run)
+    monkeypatch.delenv("VCT_POLICY_SHM", raising=False)
+    serve("vct/config.yaml", port=8123, workers=3)
+
+    assert seen["target"] == "vct.api.app:app"
+    assert seen["kwargs"]["workers"] == 3
+    assert seen["read_only"] is True
+    assert "VCT_POLICY_SHM" not in os.environ
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=seen["name"])
+
+
+@pytest.mark.parametrize("startup", ["eager", "background", "lazy"])
+def test_create_app_defers_brain_construction(startup):
+    from vct.api.app import APISettings, create_app
+
+    created = create_app(APISettings(startup=startup))
+    provider = created.state.brain_provider
+    assert not provider.ready
+
+    with TestClient(created) as client:
+        if startup == "eager":
+            assert provider.ready
+        r = client.post(
+            "/robot/act",
+            json={"text": "лежати"},
+            headers={"X-API-Key": os.environ["VCT_API_KEY"]},
+        )
+        assert r.status_code == 200
+        assert client.get("/health").json()["ready"] is True
+
+    assert {"config", "stt", "tts", "policy", "actuator", "brain"} <= set(provider.startup_timings)
+
+
+def test_act_batch_streams_ndjson_in_order():
+    import json
+
+    from vct.api.app import APISettings, create_app
+
+    created = create_app(APISettings(startup="lazy"))
+    spoken = []
+    with TestClient(created) as client:
+        brain = created.state.brain_provider.build()
+        brain.tts = type("Recorder", (), {"speak": lambda self, text, **_: spoken.append(text)})()
+        items = [
+            {"text": t, "confidence": 0.95, "reward_bias": 0.9}
+            for t in ("сидіти", "голос", "лежати")
+        ]
+        r = client.post(
+            "/robot/act/batch",
+            json={"items": items, "speak": False},
+            headers={"X-API-Key": os.environ["VCT_API_KEY"]},
+        )
+        assert r.status_code == 200
+        assert r.headers.get("content-type", "").startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in r.text.splitlines()]
+
+        empty = client.post(
+            "/robot/act/batch",
+            json={"items": []},
+            headers={"X-API-Key": os.environ["VCT_API_KEY"]},
+        )
+        assert empty.status_code == 422
+
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert [line["result"]["action"] for line in lines] == ["SIT", "BARK", "LIE_DOWN"]
+    # Ethics rules still apply in order: at most one reward inside the cooldown.
+    assert sum(line["result"]["rewarded"] for line in lines) <= 1
+    assert spoken == []
+
+
+def test_ws_control_channel_streams_decisions_rewards_and_state():
+    from starlette.websockets import WebSocketDisconnect
+
+    from vct.api.app import APISettings, create_app
+
+    created = create_app(APISettings(startup="lazy", ws_rate=0.5, ws_burst=2))
+    with TestClient(created) as client:
+        with pytest.raises(WebSocketDisconnect) as rejected:
+            with client.websocket_connect("/robot/ws", headers={"X-API-Key": "wrong"}):
+                pass
+        assert rejected.value.code == 1008
+
+        headers = {"X-API-Key": os.environ["VCT_API_KEY"]}
+        with client.websocket_connect("/robot/ws", headers=headers) as ws:
+            assert ws.receive_json()["type"] == "state"
+            command = {"type": "command", "text": "сидіти", "confidence": 0.95, "reward_bias": 0.9}
+            for request_id in range(3):
+                ws.send_json({**command, "id": request_id})
+            ws.send_json({"type": "command", "id": 9, "text": ""})
+            ws.send_text("not json")
+            messages = [ws.receive_json() for _ in range(8)]
+
+    kinds = [(m["type"], m.get("id")) for m in messages]
+    assert kinds[:3] == [("decision", 0), ("reward", 0), ("state", None)]
+    assert kinds[3:5] == [("decision", 1), ("state", None)]
+    assert kinds[5] == ("rate_limited", 2)
+    assert kinds[6] == ("rate_limited", 9)
+    assert messages[7]["type"] == "error"
+    assert messages[4]["commands"] == 2 and messages[4]["rewards"] == 1
+
+
+def test_control_session_applies_backpressure_to_slow_clients():
+    import asyncio
+    import json
+
+    from vct.api.app import ActIn
+    from vct.api.ws import ControlSession
+    from vct.robodog.dog_bot_brain import RoboDogBrain
+
+    class SlowSocket:
+        def __init__(self, count):
+            self.incoming = [json.dumps({"text": "лежати", "id": i}) for i in range(count)]
+            self.received = 0
+            self.sent = []
+            self.release = asyncio.Event()
+
+        async def receive(self):
+            if self.received == len(self.incoming):
+                await asyncio.sleep(3600)
+            self.received += 1
+            return {"type": "websocket.receive", "text": self.incoming[self.received - 1]}
+
+        async def send_json(self, message):
+            await self.release.wait()
+            self.sent.append(message)
+
+    class SilentTTS:
+        def speak(self, text, *, voice=None, language=None):
+            pass
+
+    brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True)
+    brain.tts = SilentTTS()
+
+    async def scenario():
+        socket = SlowSocket(20)
+        session = ControlSession(socket, brain, ActIn, rate=1000, burst=100, send_queue_size=4)
+        task = asyncio.create_task(session.run())
+        await asyncio.sleep(0.2)
+        stalled_at = socket.received
+        socket.release.set()
+        while len([m for m in socket.sent if m["type"] == "decision"]) < 20:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await brain.aclose()
+        return stalled_at, socket.sent
+
+    stalled_at, sent = asyncio.run(scenario())
+    # Only a handful of commands are read while the client is not consuming replies.
+    assert stalled_at <= 6
+    decisions = [m["id"] for m in sent if m["type"] == "decision"]
+    assert decisions == list(range(20))
+
+
+def test_ws_control_channel_closes_on_binary_frames():
+    from starlette.websockets import WebSocketDisconnect
+
+    from vct.api.app import APISettings, create_app
+
+    created = create_app(APISettings(startup="lazy"))
+    headers = {"X-API-Key": os.environ["VCT_API_KEY"]}
+    with TestClient(created) as client:
+        with client.websocket_connect("/robot/ws", headers=headers) as ws:
+            assert ws.receive_json()["type"] == "state"
+            ws.send_bytes(b"\x00\x01")
+            with pytest.raises(WebSocketDisconnect) as closed:
+                ws.receive_json()
+    assert closed.value.code == 1003
+
+
+def test_control_session_closes_when_sending_fails(caplog):
+    import asyncio
+
+    from vct.api.app import ActIn
+    from vct.api.ws import ControlSession
+    from vct.robodog.dog_bot_brain import RoboDogBrain
+
+    class BrokenSocket:
+        closed_with = None
+
+        async def receive(self):
+            await asyncio.sleep(3600)
+
+        async def send_json(self, message):
+            raise ValueError("cannot encode message")
+
+        async def close(self, code=1000):
+            self.closed_with = code
+
+    socket = BrokenSocket()
+    brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True)
+    session = ControlSession(socket, brain, ActIn)
+    caplog.set_level("ERROR", logger="ControlChannel")
+    asyncio.run(asyncio.wait_for(session.run(), timeout=5))
+    assert socket.closed_with == 1011
+    assert "cannot encode message" in caplog.text
+
+
+def test_token_bucket_refills_over_time():
+    from vct.api.ws import TokenBucket
+
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, burst=2, clock=lambda: now[0])
+    assert bucket.acquire() == 0.0 and bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.acquire() == 0.0
+    now[0] = 100.0
+    assert [bucket.acquire() for _ in range(3)][:2] == [0.0, 0.0]
+
+
+def test_metrics_middleware_labels_by_route_template():
+    from fastapi import FastAPI
+    from prometheus_client import REGISTRY
+
+    from vct.api.middleware import UNMATCHED_ROUTE, MetricsMiddleware
+
+    probe = FastAPI()
+    probe.add_middleware(MetricsMiddleware, latency_routes=("/probe/{item}",))
+
+    @probe.get("/probe/{item}")
+    def item(item: str) -> dict[str, str]:
+        return {"item": item}
+
+    @probe.get("/probe-fail")
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    def count(endpoint: str, status: str) -> float:
+        labels = {"endpoint": endpoint, "method": "GET", "status": status}
+        return REGISTRY.get_sample_value("vct_api_requests_total", labels) or 0.0
+
+    before = (
+        count("/probe/{item}", "200"),
+        count(UNMATCHED_ROUTE, "404"),
+        count("/probe-fail", "500"),
+    )
+    c = TestClient(probe, raise_server_exceptions=False)
+    for i in range(3):
+        assert c.get(f"/probe/{i}").status_code == 200
+    assert c.get("/nowhere/at/all").status_code == 404
+    assert c.get("/probe-fail").status_code == 500
+
+    assert count("/probe/{item}", "200") == before[0] + 3
+    assert count(UNMATCHED_ROUTE, "404") == before[1] + 1
+    assert count("/probe-fail", "500") == before[2] + 1
+    # Raw paths never become label values.
+    assert count("/probe/0", "200") == 0.0 and count("/nowhere/at/all", "404") == 0.0
+    observed = REGISTRY.get_sample_value(
+        "vct_command_latency_seconds_count", {"endpoint": "/probe/{item}"}
+    )
+    assert observed is not None and observed >= 3
+
+
+def test_api_key_store_reloads_rotated_keys(tmp_path):
+    from vct.api.security import APIKeyAuthError, APIKeyStore, hash_api_key
+
+    keys_file = tmp_path / "keys.txt"
+    keys_file.write_text(
+        f"# rotated weekly\nops {hash_api_key('alpha')}\nci sha256:{hash_api_key('beta')}\n"
+    )
+    now = [0.0]
+    store = APIKeyStore(keys_file, env_key="legacy", reload_interval=5.0, clock=lambda: now[0])
+    assert store.key_ids == ["ci", "env", "ops"]
+    assert store.verify("alpha") == "ops" and store.verify("legacy") == "env"
+    for bad in (None, "", "gamma"):
+        with pytest.raises(APIKeyAuthError):
+            store.verify(bad)
+
+    keys_file.write_text(f"ops {hash_api_key('delta')}\n")
+    os.utime(keys_file, ns=(1, 1))
+    assert store.verify("alpha") == "ops"  # not re-checked before the interval
+    now[0] = 6.0
+    assert store.verify("delta") == "ops"
+    with pytest.raises(APIKeyAuthError):
+        store.verify("alpha")
+
+    # A broken edit is ignored and the previous keys stay valid.
+    keys_file.write_text("ops not-a-digest\n")
+    os.utime(keys_file, ns=(2, 2))
+    now[0] = 12.0
+    assert store.verify("delta") == "ops"
+
+
+def test_act_accepts_any_key_from_keys_file(tmp_path):
+    from prometheus_client import REGISTRY
+
+    from vct.api.security import APIKeyStore, hash_api_key, set_api_key_store
+
+    keys_file = tmp_path / "keys.txt"
+    keys_file.write_text(f"robot-ui {hash_api_key('ui-secret')}\n")
+    set_api_key_store(APIKeyStore(keys_file))
+    try:
+        before = REGISTRY.get_sample_value("vct_api_key_requests_total", {"key_id": "robot-ui"})
+        c = TestClient(app)
+        ok = c.post("/robot/act", json={"text": "сидіти"}, headers={"X-API-Key": "ui-secret"})
+        denied = c.post(
+            "/robot/act",
+            json={"text": "сидіти"},
+            headers={"X-API-Key": os.environ["VCT_API_KEY"]},
+        )
+    finally:
+        set_api_key_store(None)
+    assert ok.status_code == 200 and denied.status_code == 401
+    after = REGISTRY.get_sample_value("vct_api_key_requests_total", {"key_id": "robot-ui"})
+    assert after == (before or 0.0) + 1
@@ -1,3 +1,16 @@
+import json
+import struct
+import sys
+
+import pytest
+
+from vct.behavior.checkpoint import (
+    FORMAT_VERSION,
+    MAGIC,
+    PolicyCheckpoint,
+    read_checkpoint,
+    write_checkpoint,
+)
 from vct.behavior.policy import BehaviorInputs, BehaviorPolicy
 
 
@@ -46,3 +59,241 @@ def test_policy_learns_from_feedback():
     trained_diff = policy.decide("SIT", positive).score - policy.decide("SIT", negative).score
     assert trained_diff > baseline_diff
     assert trained_diff > 0.2
+
+
+def test_numpy_backend_matches_python_backend():
+    pytest.importorskip("numpy")
+    dataset = [
+        (
+            BehaviorInputs(
+                stimulus=0.1 * i,
+                confidence=1.0 - 0.05 * i,
+                reward_bias=0.5,
+                mood=-0.5 + 0.1 * i,
+                fatigue=0.03 * i,
+            ),
+            0.9 if i % 2 else 0.1,
+        )
+        for i in range(10)
+    ]
+    python_policy = BehaviorPolicy({"seed": 5, "backend": "python"})
+    numpy_policy = BehaviorPolicy({"seed": 5, "backend": "numpy"})
+    assert numpy_policy.backend == "numpy"
+
+    python_history = python_policy.train(dataset, epochs=25)
+    numpy_history = numpy_policy.train(dataset, epochs=25)
+
+    assert numpy_history == pytest.approx(python_history, abs=1e-12)
+    for inputs, _ in dataset:
+        expected = python_policy.decide("SIT", inputs).score
+        assert numpy_policy.decide("SIT", inputs).score == pytest.approx(expected, abs=1e-12)
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError, match="Unsupported policy backend"):
+        BehaviorPolicy({"backend": "fortran"})
+
+
+def _ramp_dataset(size: int) -> list[tuple[BehaviorInputs, float]]:
+    return [
+        (
+            BehaviorInputs(
+                stimulus=i / size,
+                confidence=1.0 - i / size,
+                reward_bias=0.5,
+                mood=0.2,
+                fatigue=(i % 3) / 3,
+            ),
+            0.9 if i % 2 else 0.1,
+        )
+        for i in range(size)
+    ]
+
+
+def test_full_batch_training_reduces_loss():
+    policy = BehaviorPolicy({"seed": 11, "backend": "python", "learning_rate": 0.5})
+    history = policy.train(_ramp_dataset(12), epochs=60, batch_size=0)
+    assert len(history) == 60
+    assert history[-1] < history[0]
+
+
+def test_mini_batch_training_matches_across_backends():
+    pytest.importorskip("numpy")
+    dataset = _ramp_dataset(20)
+    python_policy = BehaviorPolicy({"seed": 4, "backend": "python"})
+    numpy_policy = BehaviorPolicy({"seed": 4, "backend": "numpy"})
+
+    python_history = python_policy.train(dataset, epochs=15, batch_size=6)
+    numpy_history = numpy_policy.train(dataset, epochs=15, batch_size=6)
+
+    assert numpy_history == pytest.approx(python_history, abs=1e-12)
+
+
+def test_negative_batch_size_rejected():
+    policy = BehaviorPolicy({"seed": 1, "backend": "python"})
+    with pytest.raises(ValueError, match="batch_size"):
+        policy.train(_ramp_dataset(4), epochs=1, batch_size=-2)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_decide_many_matches_single_decisions(backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    policy = BehaviorPolicy({"seed": 9, "backend": backend})
+    inputs_seq = [inputs for inputs, _ in _ramp_dataset(8)]
+    actions = ["SIT", "COME"] * 4
+
+    batch = policy.decide_many(actions, inputs_seq)
+
+    assert len(batch) == len(inputs_seq)
+    for vector, action, inputs in zip(batch, actions, inputs_seq):
+        expected = policy.decide(action, inputs)
+        assert vector.action == expected.action
+        assert vector.score == pytest.approx(expected.score, abs=1e-12)
+
+
+def test_decide_many_broadcasts_single_action_and_checks_lengths():
+    policy = BehaviorPolicy({"seed": 9, "backend": "python"})
+    inputs_seq = [inputs for inputs, _ in _ramp_dataset(3)]
+    assert policy.decide_many("SIT", inputs_seq).actions == ("SIT", "SIT", "SIT")
+    with pytest.raises(ValueError, match="same length"):
+        policy.decide_many(["SIT"], inputs_seq)
+
+
+def _checkpoint_config(path, backend="python", epochs=20):
+    training_data = [
+        {
+            "inputs": {"stimulus": i / 10, "confidence": 0.6, "reward_bias": 0.5, "mood": 0.0},
+            "target": i % 2,
+        }
+        for i in range(10)
+    ]
+    return {
+        "seed": 3,
+        "backend": backend,
+        "epochs": epochs,
+        "training_data": training_data,
+        "checkpoint": str(path),
+    }
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_checkpoint_round_trip_with_mmap(tmp_path, backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    path = tmp_path / "policy.bin"
+    trained = BehaviorPolicy(_checkpoint_config(path, backend))
+    assert path.exists()
+
+    restored = BehaviorPolicy({"seed": 0, "backend": backend})
+    metadata = restored.load_checkpoint(path, use_mmap=True)
+
+    assert metadata["fingerprint"] == trained.fingerprint
+    assert restored.training_history == trained.training_history
+    inputs = BehaviorInputs(stimulus=0.7, confidence=0.6, reward_bias=0.5, mood=0.1)
+    assert restored.decide("SIT", inputs).score == trained.decide("SIT", inputs).score
+
+    first_mapping = restored._checkpoint
+    restored.load_checkpoint(path, use_mmap=True)
+    assert first_mapping.mapping is None and restored._checkpoint is not first_mapping
+    assert restored.decide("SIT", inputs).score == trained.decide("SIT", inputs).score
+
+    restored.train([(inputs, 1.0)], epochs=1)
+    assert restored.decide("SIT", inputs).score != trained.decide("SIT", inputs).score
+
+
+def test_matching_checkpoint_skips_training(tmp_path, monkeypatch):
+    path = tmp_path / "policy.bin"
+    first = BehaviorPolicy(_checkpoint_config(path))
+
+    def fail_train(self, *args, **kwargs):
+        raise AssertionError("training should be skipped")
+
+    monkeypatch.setattr(BehaviorPolicy, "train", fail_train)
+    second = BehaviorPolicy({**_checkpoint_config(path), "checkpoint_mmap": True})
+    assert second.training_history == first.training_history
+
+    monkeypatch.undo()
+    retrained = BehaviorPolicy(_checkpoint_config(path, epochs=21))
+    assert len(retrained.training_history) == 21
+
+
+def test_corrupt_checkpoint_is_ignored(tmp_path):
+    path = tmp_path / "policy.bin"
+    path.write_bytes(b"not a checkpoint")
+    policy = BehaviorPolicy(_checkpoint_config(path, epochs=5))
+    assert len(policy.training_history) == 5
+
+    garbage = tmp_path / "garbage.bin"
+    garbage.write_bytes(b"\0" * 32)
+    with pytest.raises(ValueError, match="Not a policy checkpoint"):
+        BehaviorPolicy({"backend": "python"}).load_checkpoint(garbage)
+
+
+def test_checkpoint_without_parameter_count_is_ignored(tmp_path):
+    path = tmp_path / "policy.bin"
+    header = json.dumps({"format_version": FORMAT_VERSION, "byteorder": sys.byteorder})
+    path.write_bytes(struct.pack("<8sI", MAGIC, len(header)) + header.encode("utf-8"))
+    policy = BehaviorPolicy(_checkpoint_config(path, epochs=5))
+    assert len(policy.training_history) == 5
+
+
+def test_incompatible_checkpoint_is_closed_before_retraining(tmp_path, monkeypatch):
+    path = tmp_path / "policy.bin"
+    BehaviorPolicy(_checkpoint_config(path))
+    stored = read_checkpoint(path)
+    # Same fingerprint and shape, but one parameter short, as after a model change.
+    write_checkpoint(path, stored.metadata, stored.parameters.tobytes()[:-8])
+    stored.close()
+
+    closed = []
+    original_close = PolicyCheckpoint.close
+
+    def tracking_close(self):
+        closed.append(self)
+        original_close(self)
+
+    trained = []
+    original_train = BehaviorPolicy.train
+
+    def tracking_train(self, *args, **kwargs):
+        trained.append(self)
+        return original_train(self, *args, **kwargs)
+
+    monkeypatch.setattr(PolicyCheckpoint, "close", tracking_close)
+    monkeypatch.setattr(BehaviorPolicy, "train", tracking_train)
+    policy = BehaviorPolicy({**_checkpoint_config(path), "checkpoint_mmap": True})
+
+    assert trained == [policy]
+    assert len(closed) == 1 and closed[0].mapping is None
+    assert policy._checkpoint is None
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_shared_memory_policy_skips_training(tmp_path, monkeypatch, backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    config = _checkpoint_config(tmp_path / "unused.bin", backend)
+    config.pop("checkpoint")
+    parent = BehaviorPolicy(config)
+    segment = parent.publish_shared()
+    try:
+
+        def fail_train(self, *args, **kwargs):
+            raise AssertionError("workers must not retrain")
+
+        monkeypatch.setattr(BehaviorPolicy, "train", fail_train)
+        worker = BehaviorPolicy(config, shared_memory=segment.name)
+        inputs = BehaviorInputs(stimulus=0.7, confidence=0.6, reward_bias=0.5, mood=0.1)
+        assert worker.decide("SIT", inputs).score == parent.decide("SIT", inputs).score
+        assert worker.training_history == parent.training_history
+        assert worker._model.read_only
+
+        monkeypatch.undo()
+        other = BehaviorPolicy({**config, "epochs": 3}, shared_memory=segment.name)
+        assert len(other.training_history) == 3
+        missing = BehaviorPolicy({**config, "epochs": 2}, shared_memory="vct-no-such-segment")
+        assert len(missing.training_history) == 2
+    finally:
+        segment.close()
+        segment.unlink()
@@ -1,4 +1,10 @@
+import asyncio
+import threading
+
+import pytest
+
 from vct.robodog.dog_bot_brain import RoboDogBrain
+from vct.robodog.effects import BackgroundEffects
 
 
 def test_brain_handles_text_and_rewards():
@@ -13,3 +19,169 @@ def test_brain_from_wav_rulebased():
     brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True)
     out = brain.run_once_from_wav("data/examples/commands/sydity.wav")
     assert out["action"] in ("SIT", "NONE")
+
+
+def test_async_command_defers_speech_and_reward():
+    brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True)
+    started = threading.Event()
+    release = threading.Event()
+    spoken: list[str] = []
+
+    class SlowTTS:
+        def speak(self, text, *, voice=None, language=None):
+            started.set()
+            release.wait(timeout=5)
+            spoken.append(text)
+
+    brain.tts = SlowTTS()
+
+    async def scenario():
+        out = await brain.handle_command_async("сидіти", confidence=0.9, reward_bias=0.7)
+        assert spoken == []
+        assert await asyncio.to_thread(started.wait, 5)
+        release.set()
+        await brain.aclose()
+        return out
+
+    out = asyncio.run(scenario())
+    assert out["action"] == "SIT"
+    assert spoken and spoken[0].startswith("Дія: SIT")
+
+
+def test_background_effects_drop_speech_when_queue_full():
+    release = threading.Event()
+    spoken: list[str] = []
+
+    def speak(text):
+        release.wait(timeout=5)
+        spoken.append(text)
+
+    effects = BackgroundEffects(speak=speak, dispense=lambda: None, tts_queue_size=1)
+
+    async def scenario():
+        for index in range(4):
+            await effects.submit(f"phrase {index}", rewarded=False)
+            await asyncio.sleep(0)
+        release.set()
+        await effects.aclose()
+
+    asyncio.run(scenario())
+    assert spoken[0] == "phrase 0"
+    assert len(spoken) < 4
+
+
+def test_feedback_score_is_quantized_for_speech(tmp_path):
+    cfg = tmp_path / "config.yaml"
+    cfg.write_text(
+        "commands_map: {сидіти: SIT}\nreward_triggers: {SIT: false}\ntts_score_step: 0.25\n",
+        encoding="utf-8",
+    )
+    brain = RoboDogBrain(cfg_path=str(cfg), simulate=True)
+    assert brain._feedback_text("SIT", 0.83, False) == "Дія: SIT score=0.75"
+    assert brain._feedback_text("SIT", 0.9, True) == "Дія: SIT score=1.00 — ✅ винагорода"
+
+
+def test_brain_run_stream_acts_on_each_utterance():
+    brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True)
+    words = {0x40: "сидіти", 0x20: "", 0x30: "лежати"}
+    decoded: list[str] = []
+
+    class LoudnessSTT:
+        # The high byte of the positive half-wave identifies the "word".
+        def transcribe_pcm(self, pcm, sample_rate):
+            decoded.append(words[max(b for b in pcm[1::2] if b < 0x80)])
+            return decoded[-1]
+
+    def square(level):
+        return bytes([0x00, level, 0x00, 0x100 - level]) * 4000  # 0.5 s
+
+    brain.stt = LoudnessSTT()
+    silence = b"\x00\x00" * 8000
+    chunks = [square(0x40), silence, square(0x20), silence, square(0x30), silence]
+    results = list(brain.run_stream(chunks))
+    assert [r["action"] for r in results] == ["SIT", "LIE_DOWN"]
+    assert decoded == ["сидіти", "", "лежати"]  # no partial decodes without a callback
+
+    decoded.clear()
+    partials: list[str] = []
+    results = list(brain.run_stream(chunks, on_partial=partials.append))
+    assert [r["action"] for r in results] == ["SIT", "LIE_DOWN"]
+    assert "сидіти" in partials and len(decoded) > 3
+
+
+def test_batch_decisions_match_sequential_handling():
+    from vct.robodog.dog_bot_brain import Command
+
+    texts = ["сидіти", "голос", "лежати", "сидіти", "невідомо"]
+    commands = [Command(t, confidence=0.95, reward_bias=0.9) for t in texts]
+
+    class RecordingTTS:
+        def __init__(self):
+            self.spoken: list[str] = []
+
+        def speak(self, text, *, voice=None, language=None):
+            self.spoken.append(text)
+
+    sequential = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True)
+    batched = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True)
+    sequential.tts = RecordingTTS()
+    batched.tts = RecordingTTS()
+
+    async def scenario():
+        one_by_one = [
+            await sequential.handle_command_async(c.text, c.confidence, c.reward_bias)
+            for c in commands
+        ]
+        together = [out async for out in batched.handle_batch_async(commands, speak=False)]
+        await sequential.aclose()
+        await batched.aclose()
+        return one_by_one, together
+
+    one_by_one, together = asyncio.run(scenario())
+    assert [r["action"] for r in together] == [r["action"] for r in one_by_one]
+    assert [r["rewarded"] for r in together] == [r["rewarded"] for r in one_by_one]
+    # Fatigue follows the wall clock, so sequential scores drift by microseconds.
+    assert [r["score"] for r in together] == pytest.approx(
+        [r["score"] for r in one_by_one], abs=1e-3
+    )
+    assert together[0]["rewarded"]
+    assert len(sequential.tts.spoken) == len(commands)
+    assert batched.tts.spoken == []
+
+
+def test_aborted_batch_does_not_claim_rewards_for_unsent_results():
+    from vct.robodog.dog_bot_brain import Command
+
+    brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True)
+    claimed = []
+    claim_reward = brain._claim_reward
+
+    def recording_claim(action, score):
+        claimed.append(action)
+        return claim_reward(action, score)
+
+    brain._claim_reward = recording_claim
+    commands = [Command("сидіти", confidence=0.95, reward_bias=0.9)] * 5
+
+    async def scenario():
+        stream = brain.handle_batch_async(commands, speak=False)
+        first = await anext(stream)
+        await stream.aclose()
+        await brain.aclose()
+        return first
+
+    first = asyncio.run(scenario())
+    assert first["rewarded"]
+    assert claimed == ["SIT"]
+
+
+def test_missing_keyword_manifest_keeps_whisper_stt(tmp_path):
+    from vct.engines.stt import WhisperSTT
+
+    cfg = tmp_path / "config.yaml"
+    cfg.write_text(
+        f"commands_map: {{сидіти: SIT}}\nstt_keyword_manifest: {tmp_path / 'missing.csv'}\n",
+        encoding="utf-8",
+    )
+    brain = RoboDogBrain(cfg_path=str(cfg), simulate=True)
+    assert isinstance(brain.stt, WhisperSTT)
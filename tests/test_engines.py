@@ -1,5 +1,20 @@
-from vct.engines.stt import RuleBasedSTT, WhisperSTT
-from vct.engines.tts import OpenAITTS, PrintTTS
+import io
+import threading
+import wave
+
+import pytest
+
+from vct.engines.audio_cache import AudioCache, audio_cache_key
+from vct.engines.stt import (
+    _MODEL_REGISTRY,
+    RuleBasedSTT,
+    STTEngineBase,
+    Transcription,
+    WhisperSTT,
+)
+from vct.engines.stt_cache import CachedSTT
+from vct.engines.tts import OpenAITTS, PrintTTS, QueuedTTS, TTSEngineBase
+from vct.utils.metrics import TTS_QUEUE_EVENTS
 
 
 def test_rulebased_stt_mapping():
@@ -40,3 +55,318 @@ def test_openai_tts_fallback_without_credentials(monkeypatch, capsys):
     tts.speak("Привіт")
     captured = capsys.readouterr()
     assert "Привіт" in captured.out
+
+
+class _GatedTTS(TTSEngineBase):
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.spoken = []
+
+    def speak(self, text, *, voice=None, language=None):
+        self.started.set()
+        self.gate.wait(timeout=5)
+        self.spoken.append(text)
+
+
+def _counter_value(event):
+    return TTS_QUEUE_EVENTS.labels(event=event)._value.get()
+
+
+def test_queued_tts_returns_immediately_and_drops_oldest():
+    inner = _GatedTTS()
+    tts = QueuedTTS(inner, maxsize=2, overflow="drop_oldest")
+    dropped_before = _counter_value("dropped")
+
+    tts.speak("first")
+    assert inner.started.wait(timeout=5)
+    for phrase in ("second", "third", "fourth"):
+        tts.speak(phrase)
+    assert tts.pending == 2
+
+    inner.gate.set()
+    assert tts.flush(timeout=5)
+    tts.close(timeout=5)
+    assert inner.spoken == ["first", "third", "fourth"]
+    assert _counter_value("dropped") == dropped_before + 1
+
+
+def test_queued_tts_coalesces_identical_pending_phrases():
+    inner = _GatedTTS()
+    tts = QueuedTTS(inner, maxsize=4, overflow="coalesce")
+    coalesced_before = _counter_value("coalesced")
+
+    tts.speak("busy")
+    assert inner.started.wait(timeout=5)
+    for phrase in ("Дія: SIT", "Дія: SIT", "Дія: COME", "Дія: SIT"):
+        tts.speak(phrase)
+
+    inner.gate.set()
+    tts.close(timeout=5)
+    assert inner.spoken == ["busy", "Дія: SIT", "Дія: COME"]
+    assert _counter_value("coalesced") == coalesced_before + 2
+
+
+def test_queued_tts_rejects_unknown_overflow_policy():
+    with pytest.raises(ValueError, match="overflow policy"):
+        QueuedTTS(PrintTTS(), overflow="explode")
+
+
+def test_audio_cache_evicts_lru_and_persists_to_disk(tmp_path):
+    cache = AudioCache(tmp_path, max_memory_bytes=8, max_disk_bytes=12)
+    cache.put("a", b"1111")
+    cache.put("b", b"2222")
+    assert cache.get("a") == b"1111"
+    cache.put("c", b"3333")
+    assert cache.memory_bytes <= 8
+    assert cache.disk_bytes == 12
+
+    cache.put("d", b"4444")
+    assert not (tmp_path / "b.wav").exists()
+    reopened = AudioCache(tmp_path, max_memory_bytes=8, max_disk_bytes=12)
+    assert reopened.get("a") == b"1111"
+    assert reopened.get("b") is None
+
+
+def test_openai_tts_serves_repeated_phrases_from_cache(tmp_path):
+    class FakeResponse:
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size):
+            yield b"RIFF-"
+            yield b"audio"
+
+        def close(self):
+            return None
+
+    class FakeSession:
+        def __init__(self):
+            self.calls = 0
+
+        def post(self, *args, **kwargs):
+            self.calls += 1
+            return FakeResponse()
+
+    tts = OpenAITTS(api_key="key", playback=False, cache=AudioCache(tmp_path))
+    session = FakeSession()
+    tts._session = session
+    played = []
+    tts._play_audio = lambda audio, voice: played.append(audio)
+
+    tts.speak("Дія: SIT score=0.85")
+    tts.speak("Дія: SIT score=0.85")
+    tts.speak("Дія: SIT score=0.85", voice="coral")
+
+    assert session.calls == 2
+    assert played == [b"RIFF-audio"] * 3
+    key = audio_cache_key(tts.model, tts.voice, tts.language, "Дія: SIT score=0.85")
+    assert (tmp_path / f"{key}.wav").read_bytes() == b"RIFF-audio"
+
+
+def _wav_bytes(frames: int, rate: int = 8000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\x01\x00" * frames)
+    return buffer.getvalue()
+
+
+class _FakePlayer:
+    def __init__(self, events):
+        self.events = events
+
+    def play_buffer(self, data, channels, width, rate):
+        self.events.append(("play", len(data), channels, width, rate))
+
+        class PlayObject:
+            def is_playing(self):
+                return False
+
+            def wait_done(self):
+                return None
+
+        return PlayObject()
+
+
+def test_openai_tts_streams_playback_from_first_chunk(tmp_path):
+    audio = _wav_bytes(frames=2000)
+    events = []
+
+    class StreamingResponse:
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size):
+            for start in range(0, len(audio), 999):
+                events.append(("chunk", start))
+                yield audio[start : start + 999]
+
+        def close(self):
+            return None
+
+    class Session:
+        def post(self, *args, **kwargs):
+            assert kwargs["stream"] is True
+            return StreamingResponse()
+
+    tts = OpenAITTS(api_key="key", cache=AudioCache(tmp_path))
+    tts._session = Session()
+    tts._player = _FakePlayer(events)
+    tts.speak("Дія: COME score=0.70")
+
+    plays = [event for event in events if event[0] == "play"]
+    first_play = events.index(plays[0])
+    assert first_play < len(events) - 1
+    assert events[first_play - 1] == ("chunk", 0)
+    assert sum(event[1] for event in plays) == 2000 * 2
+    assert {event[2:] for event in plays} == {(1, 2, 8000)}
+
+    events.clear()
+    tts.speak("Дія: COME score=0.70")
+    assert events == [("play", 2000 * 2, 1, 2, 8000)]
+
+
+def test_openai_tts_does_not_replay_clip_when_stream_fails_mid_clip(tmp_path):
+    audio = _wav_bytes(frames=2000)
+    events = []
+
+    class StreamingResponse:
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size):
+            for start in range(0, len(audio), 999):
+                yield audio[start : start + 999]
+
+        def close(self):
+            return None
+
+    class Session:
+        def post(self, *args, **kwargs):
+            return StreamingResponse()
+
+    class FailingPlayer(_FakePlayer):
+        calls = 0
+
+        def play_buffer(self, data, channels, width, rate):
+            self.calls += 1
+            if self.calls == 2:
+                raise RuntimeError("audio device lost")
+            return super().play_buffer(data, channels, width, rate)
+
+    tts = OpenAITTS(api_key="key", cache=AudioCache(tmp_path))
+    tts._session = Session()
+    tts._player = FailingPlayer(events)
+    tts.speak("Дія: SIT score=0.90")
+
+    assert len(events) == 1 and events[0][1] < 2000 * 2
+    key = audio_cache_key(tts.model, tts.voice, tts.language, "Дія: SIT score=0.90")
+    assert (tmp_path / f"{key}.wav").read_bytes() == audio
+
+
+def test_whisper_models_are_shared_and_warmed_once():
+    loads = []
+    transcribed = []
+
+    class DummyModel:
+        def transcribe(self, wav_path, fp16):
+            transcribed.append(wav_path)
+            return {"text": ""}
+
+    def loader():
+        loads.append(1)
+        return DummyModel()
+
+    first = WhisperSTT(model_name="tiny", loader=loader)
+    second = WhisperSTT(model_name="tiny", loader=loader)
+    first.warmup()
+    second.warmup()
+    assert first._ensure_model() is second._ensure_model()
+    assert len(loads) == 1
+    assert len(transcribed) == 1
+    assert transcribed[0].endswith(".wav")
+    assert _MODEL_REGISTRY.refcount(first._registry_key) == 2
+
+    first.close()
+    second.close()
+    assert _MODEL_REGISTRY.refcount(first._registry_key) == 0
+    WhisperSTT(model_name="tiny", loader=loader).warmup()
+    assert len(loads) == 2
+
+
+def test_whisper_transcribe_many_streams_batches():
+    stt = WhisperSTT(model_name="batch-test", loader=lambda: object())
+    decoded_batches = []
+    stt._decode_audio = lambda path: f"audio:{path}"
+
+    def decode_batch(model, audios):
+        decoded_batches.append(list(audios))
+        return [f" {audio.split('/')[-1]} " for audio in audios]
+
+    stt._decode_batch = decode_batch
+    paths = [f"clips/{index}.wav" for index in range(5)]
+
+    results = stt.transcribe_many(paths, batch_size=2, workers=2)
+    first = next(results)
+    assert first == Transcription(path="clips/0.wav", text="0.wav")
+    assert len(decoded_batches) == 1
+
+    rest = list(results)
+    assert [item.path for item in rest] == paths[1:]
+    assert [len(batch) for batch in decoded_batches] == [2, 2, 1]
+    stt.close()
+
+
+class _CountingSTT(STTEngineBase):
+    model_name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, wav_path=None, use_mic=False):
+        self.calls += 1
+        return f"text-{self.calls}"
+
+
+def test_cached_stt_reuses_transcripts_by_content(tmp_path):
+    first = tmp_path / "first.wav"
+    copy = tmp_path / "copy.wav"
+    other = tmp_path / "other.wav"
+    first.write_bytes(b"same audio")
+    copy.write_bytes(b"same audio")
+    other.write_bytes(b"different audio")
+    index = tmp_path / "stt-index.ndjson"
+
+    engine = _CountingSTT()
+    cached = CachedSTT(engine, index, max_entries=1)
+    assert cached.transcribe(wav_path=str(first)) == "text-1"
+    assert cached.transcribe(wav_path=str(copy)) == "text-1"
+    assert cached.transcribe(wav_path=str(other)) == "text-2"
+    assert cached.transcribe(wav_path=str(first)) == "text-1"
+    assert engine.calls == 2
+    assert (cached.hits, cached.misses) == (2, 2)
+    assert list(cached._digests) == [str(first)]
+
+    reopened_engine = _CountingSTT()
+    reopened = CachedSTT(reopened_engine, index)
+    assert reopened.transcribe(wav_path=str(other)) == "text-2"
+    assert reopened_engine.calls == 0
+
+
+def test_cached_stt_keys_rule_based_engine_by_given_path(tmp_path, monkeypatch):
+    cached = CachedSTT(RuleBasedSTT(), tmp_path / "index.ndjson")
+    assert cached.transcribe(wav_path="data/examples/commands/sydity.wav") == "сидіти"
+    assert cached.transcribe(wav_path="DATA/examples/commands/SYDITY.wav") == "сидіти"
+    assert (cached.hits, cached.misses) == (1, 1)
+    # Same file name in another directory is a different clip for this engine.
+    assert cached.transcribe(wav_path="bark/clip.wav") == "голос"
+    assert cached.transcribe(wav_path="sydity/clip.wav") == "сидіти"
+    assert (cached.hits, cached.misses) == (1, 3)
+    # Another spelling of the same file must give what the engine reads from it.
+    (tmp_path / "bark").mkdir()
+    monkeypatch.chdir(tmp_path / "bark")
+    assert cached.transcribe(wav_path="clip.wav") == RuleBasedSTT().transcribe("clip.wav") == ""
+    assert (cached.hits, cached.misses) == (1, 4)
@@ -0,0 +1,128 @@
+import math
+import struct
+import wave
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from vct.engines.kws import KeywordSpottingSTT, mfcc  # noqa: E402
+from vct.engines.stt import STTEngineBase  # noqa: E402
+
+RATE = 16000
+WORDS = {"сидіти": (300, 900, 1700), "лежати": (700, 400, 1200), "голос": (1500, 1100, 500)}
+
+
+def _word(label, stretch=1.0, shift=1.0, lead_ms=100):
+    samples = [0.0] * (RATE * lead_ms // 1000)
+    for freq in WORDS[label]:
+        count = int(RATE * 0.15 * stretch)
+        for i in range(count):
+            window = math.sin(math.pi * i / count)
+            samples.append(0.4 * window * math.sin(2 * math.pi * freq * shift * i / RATE))
+    samples += [0.0] * (RATE // 10)
+    return samples
+
+
+def _pcm(samples):
+    return struct.pack(f"<{len(samples)}h", *(int(s * 32767) for s in samples))
+
+
+def _write(path, samples):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(_pcm(samples))
+    return str(path)
+
+
+class _RecordingSTT(STTEngineBase):
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, wav_path=None, use_mic=False):
+        self.calls += 1
+        return "whisper"
+
+    def transcribe_pcm(self, pcm, sample_rate):
+        self.calls += 1
+        return "whisper"
+
+
+def test_mfcc_trims_silence_and_has_expected_shape():
+    import numpy as np
+
+    padded = mfcc(np.array(_word("голос", lead_ms=500)))
+    tight = mfcc(np.array(_word("голос", lead_ms=0)))
+    assert padded.shape[1] == 13
+    assert abs(len(padded) - len(tight)) <= 2
+
+
+def test_keyword_spotting_from_manifest_recognises_variants(tmp_path):
+    manifest = tmp_path / "commands_manifest.csv"
+    rows = ["id,filename,label"]
+    for index, label in enumerate(WORDS, start=1):
+        _write(tmp_path / f"{index}.wav", _word(label))
+        rows.append(f"{index},{index}.wav,{label}")
+    rows.append("9,missing.wav,голос")
+    manifest.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    kws = KeywordSpottingSTT.from_manifest(manifest)
+    assert kws.labels == list(WORDS)
+    for label in WORDS:
+        clip = _write(tmp_path / "probe.wav", _word(label, stretch=1.1, shift=1.02, lead_ms=250))
+        assert kws.transcribe(wav_path=clip) == label
+        assert kws.transcribe_pcm(_pcm(_word(label, stretch=0.9)), RATE) == label
+    assert kws.low_confidence == 0
+
+
+def test_keyword_spotting_escalates_low_confidence_clips():
+    fallback = _RecordingSTT()
+    kws = KeywordSpottingSTT(fallback, min_confidence=0.99)
+    for label in WORDS:
+        kws.add_template_samples(label, _word(label), RATE)
+    assert kws.transcribe_pcm(_pcm(_word("лежати", stretch=1.1)), RATE) == "whisper"
+    assert fallback.calls == 1 and kws.low_confidence == 1
+
+    kws.min_confidence = 0.0
+    assert kws.transcribe_pcm(_pcm(_word("лежати")), RATE) == "лежати"
+    assert fallback.calls == 1
+
+
+def test_unreadable_clips_are_escalated(tmp_path):
+    fallback = _RecordingSTT()
+    kws = KeywordSpottingSTT(fallback)
+    kws.add_template_samples("голос", _word("голос"), RATE)
+
+    not_wav = tmp_path / "clip.mp3"
+    not_wav.write_bytes(b"ID3\x03\x00" + b"\x00" * 64)
+    assert kws.transcribe(wav_path=str(not_wav)) == "whisper"
+
+    wide = tmp_path / "wide.wav"
+    with wave.open(str(wide), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(4)
+        wav.setframerate(RATE)
+        wav.writeframes(bytes(4 * RATE // 10))
+    assert kws.transcribe(wav_path=str(wide)) == "whisper"
+    assert fallback.calls == 2 and kws.low_confidence == 0
+
+    assert KeywordSpottingSTT().transcribe(wav_path=str(not_wav)) == ""
+
+
+def test_keyword_spotting_rejects_distant_audio_without_fallback():
+    kws = KeywordSpottingSTT(max_distance=0.5)
+    for label in WORDS:
+        kws.add_template_samples(label, _word(label), RATE)
+    noise = [math.sin(i * i) * 0.3 for i in range(RATE // 2)]
+    match = kws.spot(noise, RATE)
+    assert match.confidence == 0.0
+    assert kws.transcribe_pcm(_pcm(noise), RATE) == ""
+
+
+def test_manifest_without_usable_clips_is_an_error(tmp_path):
+    manifest = tmp_path / "m.csv"
+    manifest.write_text("id,filename,label\n1,nope.wav,голос\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        KeywordSpottingSTT.from_manifest(manifest)
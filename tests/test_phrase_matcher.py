@@ -0,0 +1,23 @@
+from vct.robodog.phrase_matcher import PhraseMatcher
+
+
+def test_matches_phrase_ignoring_case_and_spaces():
+    matcher = PhraseMatcher({"до мене": "COME", "сидіти": "SIT"})
+    assert matcher.match("  Пес, ДО  МЕНЕ!") == "COME"
+    assert matcher.match("сидіти") == "SIT"
+    assert matcher.match("гуляти") == "NONE"
+    assert len(matcher) == 2
+
+
+def test_longest_overlapping_phrase_wins():
+    matcher = PhraseMatcher({"лежати": "LIE_DOWN", "не лежати": "STAND", "жати": "PRESS"})
+    assert matcher.match("не лежати") == "STAND"
+    assert matcher.match("лежати") == "LIE_DOWN"
+
+
+def test_ties_resolved_by_position_then_mapping_order():
+    matcher = PhraseMatcher({"стоп": "STOP", "сидь": "SIT"})
+    assert matcher.match("сидь стоп") == "SIT"
+    assert matcher.match("стоп сидь") == "STOP"
+    duplicate = PhraseMatcher({"до мене": "COME", "домене": "OTHER"})
+    assert duplicate.match("домене") == "COME"
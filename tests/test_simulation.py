@@ -1,5 +1,7 @@
 from types import MethodType
 
+import pytest
+
 from vct.robodog.dog_bot_brain import RoboDogBrain
 from vct.simulation.dog_env import DogEnv
 
@@ -45,3 +47,258 @@ def test_dog_env_episode_success_rate():
     assert 0.0 <= results["success_rate"] <= 1.0
     assert len(results["history"]) == len(commands)
     assert "state" in results["history"][-1]
+
+
+def test_vector_env_matches_scalar_env_bit_for_bit():
+    pytest.importorskip("numpy")
+    import random
+
+    from vct.simulation.vector_env import VectorDogEnv
+
+    seeds = [3, 11, 11, 2024, 7]
+    vector = VectorDogEnv(len(seeds), seeds=seeds, block=4)
+    scalar = [DogEnv(seed=s) for s in seeds]
+    scores = random.Random(0)
+
+    for step in range(25):
+        if step == 13:
+            # Resetting keeps consuming the same random streams as DogEnv.reset.
+            vector.reset()
+            for env in scalar:
+                env.reset()
+        batch = [scores.random() for _ in seeds]
+        out = vector.step(batch)
+        for i, env in enumerate(scalar):
+            expected = env.step("SIT", batch[i])
+            for key in ("fatigue", "mood", "reward_hist", "reward", "success_probability"):
+                assert out[key][i] == expected[key]
+            assert bool(out["success"][i]) is expected["success"]
+
+
+def test_vector_env_rollout_reports_success_rates():
+    pytest.importorskip("numpy")
+    from vct.simulation.vector_env import VectorDogEnv
+
+    env = VectorDogEnv(64, seed=1)
+    result = env.rollout(lambda obs: 1.0 - obs["fatigue"], steps=10)
+
+    assert result["success_rate"].shape == (64,)
+    assert ((0.0 <= result["success_rate"]) & (result["success_rate"] <= 1.0)).all()
+    assert (result["final_state"]["fatigue"] > 0.0).all()
+
+
+def test_headless_simulation_has_no_side_effects(capsys):
+    brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True)
+
+    def forbidden(*_args, **_kwargs):
+        raise AssertionError("headless simulation must not speak or dispense")
+
+    brain.tts.speak = forbidden
+    brain.actuator.trigger = forbidden
+    capsys.readouterr()
+
+    results = DogEnv(seed=3).simulate_commands(brain, ["сидіти"] * 20, headless=True)
+
+    assert len(results["history"]) == 20
+    assert {"action", "score", "rewarded"} <= set(results["history"][0]["brain"])
+    assert capsys.readouterr().out == ""
+
+
+def test_virtual_clock_makes_cooldown_simulations_fast_and_deterministic():
+    import time
+
+    def run():
+        env = DogEnv(seed=5, command_interval_s=0.5)
+        brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True, clock=env.clock)
+        brain.tts.speak = lambda text: None
+        start_ts = env.clock.time()
+        results = env.simulate_commands(brain, ["сидіти"] * 400, confidence=0.95)
+        return results, env.clock.time() - start_ts
+
+    started = time.perf_counter()
+    first, simulated = run()
+    second, _ = run()
+    elapsed = time.perf_counter() - started
+
+    rewards = [step["brain"]["rewarded"] for step in first["history"]]
+    assert rewards == [step["brain"]["rewarded"] for step in second["history"]]
+    assert first["final_state"] == second["final_state"]
+    # 400 commands half a second apart plus 50 ms actuator pulses, none of it real.
+    assert simulated == pytest.approx(200.0 + 0.05 * sum(rewards))
+    assert 1 < sum(rewards) <= 200 / 2.0 + 1
+    assert elapsed < 20
+
+
+def test_dog_env_moves_brain_onto_its_clock():
+    def rewards(share_clock):
+        env = DogEnv(seed=5, command_interval_s=0.5)
+        clock = {"clock": env.clock} if share_clock else {}
+        brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True, **clock)
+        brain.tts.speak = lambda text: None
+        results = env.simulate_commands(brain, ["сидіти"] * 100, confidence=0.95)
+        assert brain.clock is env.clock and brain.actuator.clock is env.clock
+        return [step["brain"]["rewarded"] for step in results["history"]]
+
+    assert rewards(share_clock=False) == rewards(share_clock=True)
+
+
+def test_virtual_clock_sleep_advances_time():
+    from vct.hardware.gpio_reward import SimulatedActuator
+    from vct.utils.clock import VirtualClock
+
+    clock = VirtualClock(start=10.0)
+    SimulatedActuator(clock).trigger(0.4)
+    assert clock.time() == pytest.approx(10.05)
+    with pytest.raises(ValueError):
+        clock.advance(-1.0)
+
+
+def test_search_space_grid_and_random_sampling():
+    from vct.simulation.sweep import Range, SearchSpace, parse_param
+
+    assert parse_param("reward_cooldown_s=1,2.5") == ("reward_cooldown_s", [1, 2.5])
+    assert parse_param("weights.mood=loguniform:0.01:1") == (
+        "weights.mood",
+        Range(0.01, 1.0, log=True),
+    )
+    with pytest.raises(ValueError):
+        parse_param("reward_cooldown_s")
+
+    grid = SearchSpace.from_specs(
+        ["reward_cooldown_s=1,2", "environment_context.complexity=0.2,0.8"]
+    )
+    assert len(list(grid.grid())) == 4
+    assert grid.column_types() == {
+        "reward_cooldown_s": int,
+        "environment_context.complexity": float,
+    }
+
+    space = SearchSpace.from_specs(["reward_cooldown_s=int:1:5", "weights.mood=uniform:0:1"])
+    with pytest.raises(ValueError):
+        list(space.grid())
+    points = list(space.sample(20, seed=3))
+    assert points == list(space.sample(20, seed=3))
+    assert all(1 <= p["reward_cooldown_s"] <= 5 and 0 <= p["weights.mood"] <= 1 for p in points)
+    with pytest.raises(ValueError):
+        SearchSpace({"not_a_setting": [1]})
+
+
+def test_run_sweep_streams_aggregated_rows(tmp_path):
+    import csv
+
+    from vct.simulation.sweep import (
+        RESULT_COLUMNS,
+        EpisodeSpec,
+        SearchSpace,
+        open_results_writer,
+        run_sweep,
+    )
+
+    space = SearchSpace.from_specs(["reward_cooldown_s=1,10"])
+    spec = EpisodeSpec(commands=("сидіти", "лежати"), steps=40, episodes=3)
+    out = tmp_path / "sweep.csv"
+    writer = open_results_writer(out, {"run_id": int, **space.column_types(), **RESULT_COLUMNS})
+    rows = []
+    for row in run_sweep("vct/config.yaml", space.grid(), spec, workers=2):
+        writer.write(row)
+        rows.append(row)
+    writer.close()
+
+    by_cooldown = {row["reward_cooldown_s"]: row for row in rows}
+    assert set(by_cooldown) == {1, 10}
+    assert all(0.0 <= row["success_mean"] <= 1.0 and row["episodes"] == 3 for row in rows)
+    # Cooldowns are applied in simulated time: a longer one means fewer rewards.
+    assert by_cooldown[1]["reward_rate"] > by_cooldown[10]["reward_rate"]
+    with out.open(encoding="utf-8") as fh:
+        written = list(csv.DictReader(fh))
+    assert sorted(int(r["run_id"]) for r in written) == [0, 1]
+
+
+def test_sweep_worker_runs_brain_and_actuator_on_virtual_time():
+    from vct.simulation import sweep
+    from vct.utils.clock import VirtualClock
+
+    sweep._init_worker("vct/config.yaml")
+    spec = sweep.EpisodeSpec(commands=("сидіти",), steps=20, episodes=2)
+    row = sweep._run_point(0, {"reward_cooldown_s": 1}, spec)
+    brain = sweep._worker_brain
+    assert row["reward_rate"] > 0
+    assert isinstance(brain.clock, VirtualClock) and brain.actuator.clock is brain.clock
+
+    for invalid in ({"steps": 0}, {"episodes": 0}, {"commands": ()}):
+        with pytest.raises(ValueError):
+            sweep.EpisodeSpec(**{"commands": ("сидіти",), **invalid})
+
+
+def test_streaming_simulation_writes_sinks_instead_of_history():
+    import io
+    import itertools
+    import json
+
+    from vct.simulation.sinks import ColumnarBuffer, NDJSONSink
+
+    def episode(sink=None):
+        env = DogEnv(seed=9)
+        brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True, clock=env.clock)
+        commands = itertools.islice(itertools.cycle(["сидіти", "голос"]), 300)
+        return env.simulate_commands(brain, commands, headless=True, sink=sink)
+
+    reference = episode()
+    stream = io.StringIO()
+    streamed = episode(NDJSONSink(stream))
+    assert streamed["history"] == [] and streamed["steps"] == 300
+    assert streamed["success_rate"] == reference["success_rate"]
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 300
+    first = json.loads(lines[0])
+    assert first["step"] == 0
+    assert first["action"] == reference["history"][0]["brain"]["action"]
+    assert first["mood"] == reference["history"][0]["state"]["mood"]
+
+    chunks = []
+    buffer = ColumnarBuffer(max_rows=128, on_flush=lambda b: chunks.append(b.columns()))
+    with buffer:
+        episode(buffer)
+    assert [len(chunk["step"]) for chunk in chunks] == [128, 128, 44]
+    assert chunks[1]["step"][0] == 128 and chunks[-1]["step"][-1] == 299
+    assert sum(sum(chunk["success"]) for chunk in chunks) == round(reference["success_rate"] * 300)
+    assert buffer.actions[chunks[0]["action"][0]] == first["action"]
+
+
+def test_columnar_buffer_requires_flush_callback_when_bounded():
+    from vct.simulation.sinks import ColumnarBuffer
+
+    with pytest.raises(ValueError):
+        ColumnarBuffer(max_rows=10)
+    unbounded = ColumnarBuffer()
+    unbounded.write(
+        {
+            "step": 0,
+            "action": "SIT",
+            "score": 0.7,
+            "rewarded": True,
+            "success": False,
+            "reward": 0.0,
+            "fatigue": 0.05,
+            "mood": -0.1,
+            "reward_hist": 0.4,
+            "success_probability": 0.7,
+        }
+    )
+    columns = unbounded.columns()
+    assert len(unbounded) == 1 and columns["score"][0] == 0.7 and columns["rewarded"][0] == 1
+
+
+def test_columnar_buffer_to_numpy_copies_columns():
+    pytest.importorskip("numpy")
+    from vct.simulation.sinks import ColumnarBuffer
+
+    env = DogEnv(seed=9)
+    brain = RoboDogBrain(cfg_path="vct/config.yaml", simulate=True, clock=env.clock)
+    chunks = []
+    with ColumnarBuffer(max_rows=8, on_flush=lambda b: chunks.append(b.to_numpy())) as buffer:
+        env.simulate_commands(brain, ["сидіти"] * 10, headless=True, sink=buffer)
+
+    assert [len(chunk["step"]) for chunk in chunks] == [8, 2]
+    assert chunks[0]["step"].tolist() == list(range(8))
+    assert chunks[1]["mood"].dtype.kind == "f"
@@ -0,0 +1,108 @@
+import math
+import struct
+import wave
+
+import pytest
+
+from vct.engines.stt import STTEngineBase
+from vct.engines.stt_stream import EnergyVAD, PCMRingBuffer, StreamingSTT, WavFileSource
+
+RATE = 16000
+
+
+def _tone(ms, amplitude=8000):
+    count = RATE * ms // 1000
+    return struct.pack(
+        f"<{count}h",
+        *(int(amplitude * math.sin(2 * math.pi * 440 * i / RATE)) for i in range(count)),
+    )
+
+
+def _silence(ms):
+    return b"\x00\x00" * (RATE * ms // 1000)
+
+
+class _LengthSTT(STTEngineBase):
+    """Reports how many milliseconds of audio each call received."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe_pcm(self, pcm, sample_rate):
+        ms = len(pcm) * 1000 // (2 * sample_rate)
+        self.calls.append(ms)
+        return f"{ms}ms"
+
+
+def test_energy_vad_thresholds_rms_level():
+    vad = EnergyVAD(threshold_db=-40.0)
+    assert vad.is_speech(_tone(20))
+    assert not vad.is_speech(_silence(20))
+    assert not vad.is_speech(_tone(20, amplitude=100))
+    assert EnergyVAD.level_db(_silence(20)) == -math.inf
+
+
+def test_streaming_stt_emits_partials_then_final_at_end_of_speech():
+    engine = _LengthSTT()
+    stream = StreamingSTT(engine, partial_ms=400, hangover_ms=300, preroll_ms=100)
+    audio = _silence(500) + _tone(1000) + _silence(400) + _tone(300) + _silence(400)
+
+    events = []
+    finals_at = []
+    chunk = 320 * 2  # 20 ms
+    for offset in range(0, len(audio), chunk):
+        for event in stream.feed(audio[offset : offset + chunk]):
+            events.append(event)
+            if event.final:
+                finals_at.append((offset + chunk) * 1000 // (2 * RATE))
+    events += stream.flush()
+
+    finals = [e for e in events if e.final]
+    partials = [e for e in events if not e.final]
+    assert len(finals) == 2
+    assert partials and all(not p.final for p in partials)
+    # Each utterance is finalised one hangover after its speech ends, not at EOF.
+    assert finals_at == [1500 + 300, 2200 + 300]
+    # Preroll keeps the onset and trailing hangover silence is trimmed.
+    assert finals[0].start == pytest.approx(0.4)
+    assert finals[0].end == pytest.approx(1.5)
+    assert finals[0].text == "1100ms"
+
+
+def test_streaming_stt_flush_finalises_open_utterance():
+    engine = _LengthSTT()
+    stream = StreamingSTT(engine, partial_ms=None)
+    events = stream.feed(_tone(600))
+    assert events == [] and stream.in_speech
+    finals = stream.flush()
+    assert [e.final for e in finals] == [True]
+    assert not stream.in_speech
+
+
+def test_ring_buffer_overwrites_oldest_audio():
+    ring = PCMRingBuffer(capacity=8)
+    ring.write(b"abcdef")
+    ring.write(b"ghij")
+    assert ring.overruns == 2
+    assert ring.read(100) == b"cdefghij"
+    ring.close()
+    assert ring.read(100) == b""
+    with pytest.raises(ValueError):
+        ring.write(b"kl")
+
+
+def test_wav_replay_through_ring_buffer_feeds_streaming_stt(tmp_path):
+    path = tmp_path / "command.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(_silence(200) + _tone(500) + _silence(500))
+
+    source = WavFileSource(path)
+    ring = PCMRingBuffer(capacity=RATE * 2 * 5)
+    source.replay_into(ring)
+    engine = _LengthSTT()
+    events = list(StreamingSTT(engine, sample_rate=source.sample_rate).transcripts(ring))
+    assert [e.final for e in events if e.final] == [True]
+    assert ring.overruns == 0
@@ -1,67 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import json
 import os
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from time import perf_counter
-from typing import Any
+from typing import Any, Literal, cast
 
-from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, WebSocket, status
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
-from fastapi.responses import JSONResponse, Response
-from pydantic import BaseModel, Field, constr
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
-from starlette.middleware.base import BaseHTTPMiddleware
+from pydantic import BaseModel, Field, constr
 
-from ..robodog.dog_bot_brain import RoboDogBrain
+from ..robodog.dog_bot_brain import Command, RoboDogBrain
 from ..utils.logging import get_logger
-from ..utils.metrics import (
-    observe_command_latency,
-    record_api_request,
-    record_command,
-)
-from .security import APIKeyAuthError, require_api_key
+from ..utils.metrics import record_command, record_startup_duration
+from .middleware import MetricsMiddleware
+from .security import API_KEY_NAME, APIKeyAuthError, check_api_key, require_api_key
+from .ws import ControlSession
 
 log = get_logger("API")
-CFG = os.getenv("VCT_CONFIG", "vct/config.yaml")
-SIM = os.getenv("VCT_SIMULATE", "1") == "1"
-GPIO_PIN = int(os.getenv("VCT_GPIO_PIN", "0")) or None
-_https_env = os.getenv("VCT_REQUIRE_HTTPS", "0")
-REQUIRE_HTTPS = _https_env == "1"
-brain = RoboDogBrain(cfg_path=CFG, gpio_pin=GPIO_PIN, simulate=SIM)
 
 ACT_ENDPOINT = "/robot/act"
+ACT_BATCH_ENDPOINT = "/robot/act/batch"
+MAX_BATCH_SIZE = 1000
+WS_ENDPOINT = "/robot/ws"
+StartupMode = Literal["eager", "background", "lazy"]
+_STARTUP_MODES = ("eager", "background", "lazy")
+
+
+@dataclass(frozen=True)
+class APISettings:
+    """Process-level options of the API, usually read from the environment."""
+
+    config_path: str = "vct/config.yaml"
+    simulate: bool = True
+    gpio_pin: int | None = None
+    require_https: bool = False
+    policy_shm: str | None = None
+    startup: StartupMode = "eager"
+    ws_rate: float = 10.0
+    ws_burst: int = 10
+    ws_send_queue: int = 32
+
+    @classmethod
+    def from_env(cls) -> APISettings:
+        startup = os.getenv("VCT_STARTUP", "eager")
+        if startup not in _STARTUP_MODES:
+            raise ValueError(f"VCT_STARTUP must be one of {_STARTUP_MODES}, not {startup!r}")
+        return cls(
+            config_path=os.getenv("VCT_CONFIG", "vct/config.yaml"),
+            simulate=os.getenv("VCT_SIMULATE", "1") == "1",
+            gpio_pin=int(os.getenv("VCT_GPIO_PIN", "0")) or None,
+            require_https=os.getenv("VCT_REQUIRE_HTTPS", "0") == "1",
+            # Set by ``vct serve`` so that workers map the parent's policy weights.
+            policy_shm=os.getenv("VCT_POLICY_SHM") or None,
+            startup=cast(StartupMode, startup),
+            ws_rate=float(os.getenv("VCT_WS_RATE", "10")),
+            ws_burst=int(os.getenv("VCT_WS_BURST", "10")),
+            ws_send_queue=int(os.getenv("VCT_WS_SEND_QUEUE", "32")),
+        )
+
 
-app = FastAPI(title="VCT API", version="0.14.0")
+class BrainProvider:
+    """Build the :class:`RoboDogBrain` once, off the event loop, when first needed.
 
+    Construction loads the config, probes the speech engines, prepares the policy
+    and opens the actuator, so it runs in a worker thread. Concurrent callers share
+    a single build, and :meth:`start_background` begins it without blocking.
+    """
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):  # type: ignore[override]
-        path = request.url.path
-        method = request.method
-        start = perf_counter()
-        try:
-            response = await call_next(request)
-        except Exception:
-            duration = perf_counter() - start
-            record_api_request(path, method, 500)
-            if path == ACT_ENDPOINT:
-                observe_command_latency(path, duration)
-            raise
-        duration = perf_counter() - start
-        record_api_request(path, method, response.status_code)
-        if path == ACT_ENDPOINT:
-            observe_command_latency(path, duration)
-        return response
+    def __init__(self, settings: APISettings) -> None:
+        self.settings = settings
+        self.startup_timings: dict[str, float] = {}
+        self._brain: RoboDogBrain | None = None
+        self._lock = threading.Lock()
+        self._task: asyncio.Task[RoboDogBrain] | None = None
 
+    @property
+    def ready(self) -> bool:
+        return self._brain is not None
 
-app.add_middleware(MetricsMiddleware)
-if REQUIRE_HTTPS:
-    app.add_middleware(HTTPSRedirectMiddleware)
+    def build(self) -> RoboDogBrain:
+        with self._lock:
+            if self._brain is None:
+                start = perf_counter()
+                brain = RoboDogBrain(
+                    cfg_path=self.settings.config_path,
+                    gpio_pin=self.settings.gpio_pin,
+                    simulate=self.settings.simulate,
+                    policy_shm=self.settings.policy_shm,
+                )
+                total = perf_counter() - start
+                record_startup_duration("brain", total)
+                self.startup_timings = {**brain.startup_timings, "brain": total}
+                log.info(
+                    "RoboDog brain ready in %.3fs (%s)",
+                    total,
+                    ", ".join(f"{k}={v:.3f}s" for k, v in brain.startup_timings.items()),
+                )
+                self._brain = brain
+            return self._brain
+
+    def start_background(self) -> None:
+        if self._brain is None and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(asyncio.to_thread(self.build))
+
+    async def get(self) -> RoboDogBrain:
+        if self._brain is not None:
+            return self._brain
+        if self._task is not None and not self._task.done():
+            return await asyncio.shield(self._task)
+        return await asyncio.to_thread(self.build)
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._brain is not None:
+            await self._brain.aclose()
+
+
+async def get_brain(request: Request) -> RoboDogBrain:
+    provider: BrainProvider = request.app.state.brain_provider
+    return await provider.get()
 
 
-@app.exception_handler(APIKeyAuthError)
 async def api_key_auth_exception_handler(_: Request, exc: APIKeyAuthError) -> JSONResponse:
     return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
 
 
-@app.exception_handler(Exception)
 async def unhandled_exception_handler(_: Request, exc: Exception) -> JSONResponse:
     if isinstance(exc, HTTPException):
         return JSONResponse(
@@ -72,9 +144,13 @@ async def unhandled_exception_handler(_: Request, exc: Exception) -> JSONRespons
     return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
-@app.get("/health")
-def health() -> dict[str, bool | str]:
-    return {"status": "ok", "simulate": SIM}
+router = APIRouter()
+
+
+@router.get("/health")
+def health(request: Request) -> dict[str, bool | str]:
+    provider: BrainProvider = request.app.state.brain_provider
+    return {"status": "ok", "simulate": provider.settings.simulate, "ready": provider.ready}
 
 
 class ActIn(BaseModel):
@@ -84,14 +160,104 @@ class ActIn(BaseModel):
     mood: float = Field(0.0, ge=-1.0, le=1.0)
 
 
-@app.post("/robot/act")
-def act(inp: ActIn, _: str = Depends(require_api_key)) -> dict[str, Any]:
+@router.post(ACT_ENDPOINT)
+async def act(
+    inp: ActIn,
+    _: str = Depends(require_api_key),
+    brain: RoboDogBrain = Depends(get_brain),
+) -> dict[str, Any]:
     record_command("api")
-    out = brain.handle_command(inp.text, inp.confidence, inp.reward_bias, inp.mood)
+    out = await brain.handle_command_async(inp.text, inp.confidence, inp.reward_bias, inp.mood)
     return {"ok": True, "result": out}
 
 
-@app.get("/metrics")
+class ActBatchIn(BaseModel):
+    items: list[ActIn] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    speak: bool = True
+
+
+@router.post(ACT_BATCH_ENDPOINT)
+async def act_batch(
+    batch: ActBatchIn,
+    _: str = Depends(require_api_key),
+    brain: RoboDogBrain = Depends(get_brain),
+) -> StreamingResponse:
+    """Decide many commands in one request and stream results as NDJSON lines."""
+
+    commands = [Command(i.text, i.confidence, i.reward_bias, i.mood) for i in batch.items]
+    record_command("api_batch", len(commands))
+
+    async def lines() -> AsyncIterator[bytes]:
+        index = 0
+        async for out in brain.handle_batch_async(commands, speak=batch.speak):
+            record = {"index": index, "ok": True, "result": out}
+            yield (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            index += 1
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.websocket(WS_ENDPOINT)
+async def control_channel(websocket: WebSocket) -> None:
+    """Continuous command session authenticated once with ``X-API-Key``."""
+
+    try:
+        check_api_key(websocket.headers.get(API_KEY_NAME))
+    except APIKeyAuthError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    provider: BrainProvider = websocket.app.state.brain_provider
+    brain = await provider.get()
+    await websocket.accept()
+    settings = provider.settings
+    session = ControlSession(
+        websocket,
+        brain,
+        ActIn,
+        rate=settings.ws_rate,
+        burst=settings.ws_burst,
+        send_queue_size=settings.ws_send_queue,
+    )
+    await session.run()
+
+
+@router.get("/metrics")
 def metrics(_: str = Depends(require_api_key)) -> Response:
     payload = generate_latest()
     return Response(content=payload, media_type=CONTENT_TYPE_LATEST)
+
+
+def create_app(settings: APISettings | None = None) -> FastAPI:
+    """Build the API without constructing the RoboDog brain at import time.
+
+    ``settings.startup`` picks when the brain is built: ``"eager"`` during lifespan
+    startup, ``"background"`` in a thread started at startup (requests wait for
+    it), or ``"lazy"`` on the first request that needs it. Startup time of each
+    component is logged and exported as ``vct_startup_seconds``.
+    """
+
+    settings = settings or APISettings.from_env()
+    provider = BrainProvider(settings)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        if settings.startup == "eager":
+            await provider.get()
+        elif settings.startup == "background":
+            provider.start_background()
+        yield
+        await provider.aclose()
+
+    app = FastAPI(title="VCT API", version="0.14.0", lifespan=lifespan)
+    app.state.settings = settings
+    app.state.brain_provider = provider
+    app.add_middleware(MetricsMiddleware, latency_routes=(ACT_ENDPOINT,))
+    if settings.require_https:
+        app.add_middleware(HTTPSRedirectMiddleware)
+    app.add_exception_handler(APIKeyAuthError, api_key_auth_exception_handler)  # type: ignore[arg-type]
+    app.add_exception_handler(Exception, unhandled_exception_handler)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
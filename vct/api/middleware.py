@@ -0,0 +1,69 @@
+"""Pure ASGI middleware used by the VCT API."""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from time import perf_counter
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.metrics import API_REQUEST_COUNTER, COMMAND_LATENCY
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Count requests and time command endpoints without wrapping the response.
+
+    Requests are labelled with the template of the route that handled them (for
+    example ``/items/{item_id}``) rather than the raw path, so label cardinality is
+    bounded by the number of routes; requests that match no route share the
+    ``<unmatched>`` label. Labelled Prometheus children are created once per
+    ``(route, method, status)`` and reused afterwards.
+    """
+
+    def __init__(self, app: ASGIApp, *, latency_routes: Collection[str] = ()) -> None:
+        self.app = app
+        self.latency_routes = frozenset(latency_routes)
+        self._counters: dict[tuple[str, str, int], Any] = {}
+        self._histograms: dict[str, Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._record(scope, status_code, perf_counter() - start)
+
+    def _record(self, scope: Scope, status_code: int, duration: float) -> None:
+        route = scope.get("route")
+        template = getattr(route, "path", None) or UNMATCHED_ROUTE
+        key = (template, scope["method"], status_code)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = API_REQUEST_COUNTER.labels(
+                endpoint=template, method=key[1].upper(), status=str(status_code)
+            )
+            self._counters[key] = counter
+        counter.inc()
+        if template in self.latency_routes:
+            histogram = self._histograms.get(template)
+            if histogram is None:
+                histogram = self._histograms[template] = COMMAND_LATENCY.labels(endpoint=template)
+            histogram.observe(duration)
+
+
+__all__ = ["MetricsMiddleware", "UNMATCHED_ROUTE"]
@@ -2,16 +2,26 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
-from typing import Optional
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
 
 from fastapi import HTTPException, Security, status
 from fastapi.security.api_key import APIKeyHeader
 
+from ..utils.logging import get_logger
+from ..utils.metrics import API_KEY_REQUESTS
+
 API_KEY_NAME = "X-API-Key"
-_api_key_value = os.getenv("VCT_API_KEY")
+ENV_KEY_ID = "env"
 _api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
+log = get_logger("APIKeys")
+
 
 class APIKeyAuthError(HTTPException):
     """Raised when the provided API key is missing or invalid."""
@@ -24,19 +34,188 @@ class APIKeyAuthError(HTTPException):
         )
 
 
-def _get_configured_key() -> str:
-    if not _api_key_value:
-        raise RuntimeError(
-            "API key authentication is enabled but no VCT_API_KEY environment "
-            "variable was provided."
-        )
-    return _api_key_value
+def _digest(api_key: str) -> bytes:
+    return hashlib.sha256(api_key.encode("utf-8")).digest()
+
+
+def hash_api_key(api_key: str) -> str:
+    """Return the hex SHA-256 digest under which ``api_key`` is stored in a keys file."""
+
+    return _digest(api_key).hex()
+
+
+def parse_keys_file(text: str) -> dict[bytes, str]:
+    """Parse ``<key id> <sha256 hex digest>`` lines into a digest -> key id map.
+
+    Blank lines and ``#`` comments are ignored; a malformed line raises
+    :class:`ValueError` so that a half-edited file never replaces working keys.
+    """
+
+    keys: dict[bytes, str] = {}
+    for lineno, raw in enumerate(text.splitlines(), start=1):
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) != 2:
+            raise ValueError(f"line {lineno}: expected '<key id> <sha256 digest>'")
+        key_id, digest = parts
+        digest = digest.removeprefix("sha256:")
+        try:
+            raw_digest = bytes.fromhex(digest)
+        except ValueError:
+            raw_digest = b""
+        if len(raw_digest) != hashlib.sha256().digest_size:
+            raise ValueError(f"line {lineno}: {key_id!r} does not have a SHA-256 hex digest")
+        keys[raw_digest] = key_id
+    return keys
+
+
+class APIKeyStore:
+    """Hashed API keys, optionally loaded from a file that is reloaded on change.
+
+    A presented key is hashed once with SHA-256 and looked up by digest, so a check
+    costs the same regardless of how many keys are configured and only digests,
+    never the secrets themselves, are compared. ``path`` is re-read when its
+    modification time or size changes, checked at most every ``reload_interval``
+    seconds, so keys can be rotated without restarting the server. ``env_key`` is a
+    plain key (``VCT_API_KEY``) that is accepted under the id ``env``.
+
+    Every check increments ``vct_api_key_requests_total`` for the matched key id,
+    or for ``<invalid>``/``<missing>``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        env_key: str | None = None,
+        reload_interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.reload_interval = reload_interval
+        self._clock = clock
+        self._env_keys = {_digest(env_key): ENV_KEY_ID} if env_key else {}
+        self._keys: dict[bytes, str] = {}
+        self._publish({})
+        self._signature: tuple[int, int] | None = None
+        self._next_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._counters: dict[str, Any] = {}
+        if self.path is not None:
+            self.reload()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def key_ids(self) -> list[str]:
+        return sorted(set(self._keys.values()))
+
+    def _publish(self, keys: dict[bytes, str]) -> None:
+        # Readers never lock: the new mapping is swapped in with one assignment.
+        self._keys = {**keys, **self._env_keys}
+
+    def reload(self) -> bool:
+        """Re-read the keys file if it changed; return whether the key set was replaced."""
+
+        if self.path is None:
+            return False
+        with self._reload_lock:
+            self._next_check = self._clock() + self.reload_interval
+            try:
+                stat = self.path.stat()
+            except OSError as exc:
+                if self._signature is None:
+                    raise RuntimeError(f"API keys file {self.path} cannot be read: {exc}") from exc
+                log.warning(
+                    "API keys file %s is unavailable (%s); keeping current keys", self.path, exc
+                )
+                return False
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return False
+            try:
+                keys = parse_keys_file(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                if self._signature is None:
+                    raise RuntimeError(f"Invalid API keys file {self.path}: {exc}") from exc
+                log.warning("Ignoring invalid API keys file %s (%s)", self.path, exc)
+                self._signature = signature
+                return False
+            self._publish(keys)
+            self._signature = signature
+        log.info("Loaded %d API key(s) from %s", len(keys), self.path)
+        return True
+
+    def _maybe_reload(self) -> None:
+        if self.path is not None and self._clock() >= self._next_check:
+            # A concurrent request already reloading is fine: keep serving current keys.
+            if not self._reload_lock.locked():
+                self.reload()
+
+    def _count(self, key_id: str) -> None:
+        counter = self._counters.get(key_id)
+        if counter is None:
+            counter = self._counters[key_id] = API_KEY_REQUESTS.labels(key_id=key_id)
+        counter.inc()
+
+    def verify(self, api_key: str | None) -> str:
+        """Return the id of ``api_key`` or raise :class:`APIKeyAuthError`."""
+
+        self._maybe_reload()
+        if not api_key:
+            self._count("<missing>")
+            raise APIKeyAuthError()
+        key_id = self._keys.get(_digest(api_key))
+        if key_id is None:
+            self._count("<invalid>")
+            raise APIKeyAuthError()
+        self._count(key_id)
+        return key_id
+
+
+_store: APIKeyStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_api_key_store() -> APIKeyStore:
+    """Return the process-wide key store built from ``VCT_API_KEYS_FILE``/``VCT_API_KEY``."""
+
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = os.getenv("VCT_API_KEYS_FILE") or None
+                env_key = os.getenv("VCT_API_KEY") or None
+                if path is None and env_key is None:
+                    raise RuntimeError(
+                        "API key authentication is enabled but neither VCT_API_KEYS_FILE "
+                        "nor VCT_API_KEY environment variable was provided."
+                    )
+                _store = APIKeyStore(
+                    path,
+                    env_key=env_key,
+                    reload_interval=float(os.getenv("VCT_API_KEYS_RELOAD_S", "2")),
+                )
+    return _store
+
+
+def set_api_key_store(store: APIKeyStore | None) -> None:
+    """Replace the process-wide key store; ``None`` rebuilds it from the environment."""
+
+    global _store
+    _store = store
+
+
+def check_api_key(api_key: str | None) -> str:
+    """Validate ``api_key`` against the configured keys; raise :class:`APIKeyAuthError`."""
+
+    return get_api_key_store().verify(api_key)
 
 
-def require_api_key(api_key: Optional[str] = Security(_api_key_header)) -> str:
-    """Validate that the incoming request provides the expected API key."""
+def require_api_key(api_key: str | None = Security(_api_key_header)) -> str:
+    """Validate that the incoming request provides a known API key; return its id."""
 
-    expected = _get_configured_key()
-    if api_key != expected:
-        raise APIKeyAuthError()
-    return expected
+    return check_api_key(api_key)
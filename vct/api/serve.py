@@ -0,0 +1,61 @@
+"""Multi-process API serving with policy weights trained once and shared."""
+
+from __future__ import annotations
+
+import os
+
+from ..behavior.policy import BehaviorPolicy
+from ..configuration import RoboDogSettings
+from ..utils.logging import get_logger
+
+log = get_logger("Serve")
+
+APP = "vct.api.app:app"
+
+
+def serve(
+    config: str,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 1,
+) -> None:
+    """Run the API with ``workers`` processes sharing one copy of the policy.
+
+    The parent builds (and, if configured, trains) the behaviour policy once and
+    publishes its parameters in a shared memory segment. Its name is passed to the
+    workers through ``VCT_POLICY_SHM``; each worker maps the weights read-only
+    instead of training its own copy. The segment is removed when the server stops.
+    """
+
+    try:
+        import uvicorn
+    except ImportError as exc:  # pragma: no cover - uvicorn is a core dependency
+        raise RuntimeError("uvicorn is required to serve the API") from exc
+
+    settings = RoboDogSettings.load(config)
+    policy = BehaviorPolicy(settings.policy_config)
+    segment = policy.publish_shared()
+    log.info(
+        "Published policy %s in shared memory %s (%d bytes) for %d workers",
+        policy.fingerprint[:12],
+        segment.name,
+        segment.size,
+        workers,
+    )
+    previous = {key: os.environ.get(key) for key in ("VCT_CONFIG", "VCT_POLICY_SHM")}
+    os.environ["VCT_CONFIG"] = config
+    os.environ["VCT_POLICY_SHM"] = segment.name
+    try:
+        uvicorn.run(APP, host=host, port=port, workers=workers)
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        segment.close()
+        segment.unlink()
+
+
+__all__ = ["serve"]
@@ -0,0 +1,196 @@
+"""WebSocket control channel for continuous command sessions."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from ..robodog.dog_bot_brain import RoboDogBrain
+from ..utils.logging import get_logger
+from ..utils.metrics import record_background_drop, record_command
+
+log = get_logger("ControlChannel")
+
+
+class TokenBucket:
+    """Allow ``rate`` events per second on average with bursts of up to ``burst``."""
+
+    def __init__(
+        self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+
+class ControlSession:
+    """Serve one authenticated WebSocket connection.
+
+    Clients send ``{"type": "command", "id": ..., "text": ..., ...}`` messages with
+    the fields of ``ActIn``. Each command is answered with a ``decision`` message,
+    followed by a ``reward`` event when a treat was granted and a ``state`` update.
+    Commands beyond the per-connection rate limit get ``rate_limited`` with a
+    ``retry_after`` hint and are not executed.
+
+    Outgoing messages pass through a bounded queue drained by a sender task.
+    Decisions and rewards wait for room in the queue, so a client that stops
+    reading also stops having its commands read (backpressure); state updates are
+    dropped instead, since the next one supersedes them.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        brain: RoboDogBrain,
+        command_model: type[Any],
+        *,
+        rate: float = 10.0,
+        burst: int = 10,
+        send_queue_size: int = 32,
+    ) -> None:
+        self.websocket = websocket
+        self.brain = brain
+        self.command_model = command_model
+        self.bucket = TokenBucket(rate, burst)
+        self._outbox: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=send_queue_size)
+        self.commands = 0
+        self.rewards = 0
+        self.rate_limited = 0
+        self.last_action: str | None = None
+
+    async def run(self) -> None:
+        sender = asyncio.create_task(self._send_loop())
+        receiver = asyncio.create_task(self._receive_loop())
+        self._push_state()
+        try:
+            await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (sender, receiver):
+                task.cancel()
+            await asyncio.gather(sender, receiver, return_exceptions=True)
+        send_error = None if sender.cancelled() else sender.exception()
+        if send_error is not None:
+            log.error("Sending to WebSocket client failed; closing", exc_info=send_error)
+            await self._close(status.WS_1011_INTERNAL_ERROR)
+        elif not receiver.cancelled():
+            close_code = receiver.result()  # re-raises errors from handling commands
+            if close_code is not None:
+                await self._close(close_code)
+
+    async def _receive_loop(self) -> int | None:
+        """Handle incoming text frames; return a close code for unsupported input."""
+
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return None
+            text = message.get("text")
+            if text is None:
+                log.info("Closing WebSocket session after a binary frame")
+                return status.WS_1003_UNSUPPORTED_DATA
+            await self._handle(text)
+
+    async def _send_loop(self) -> None:
+        while True:
+            message = await self._outbox.get()
+            try:
+                await self.websocket.send_json(message)
+            except WebSocketDisconnect:
+                return
+
+    async def _close(self, code: int) -> None:
+        try:
+            await self.websocket.close(code=code)
+        except (RuntimeError, WebSocketDisconnect):
+            pass  # the client is already gone
+
+    async def _handle(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            await self._outbox.put({"type": "error", "detail": "Message is not valid JSON"})
+            return
+        if not isinstance(message, dict):
+            await self._outbox.put({"type": "error", "detail": "Message must be an object"})
+            return
+        kind = message.get("type", "command")
+        request_id = message.get("id")
+        if kind == "ping":
+            await self._outbox.put({"type": "pong", "id": request_id})
+            return
+        if kind != "command":
+            await self._outbox.put(
+                {"type": "error", "id": request_id, "detail": f"Unknown message type {kind!r}"}
+            )
+            return
+        retry_after = self.bucket.acquire()
+        if retry_after:
+            self.rate_limited += 1
+            await self._outbox.put(
+                {"type": "rate_limited", "id": request_id, "retry_after": round(retry_after, 3)}
+            )
+            return
+        try:
+            command = self.command_model.model_validate(
+                {k: v for k, v in message.items() if k not in ("type", "id")}
+            )
+        except ValidationError as exc:
+            await self._outbox.put(
+                {"type": "error", "id": request_id, "detail": exc.errors(include_url=False)}
+            )
+            return
+        record_command("ws")
+        result = await self.brain.handle_command_async(
+            command.text, command.confidence, command.reward_bias, command.mood
+        )
+        self.commands += 1
+        self.last_action = result["action"]
+        await self._outbox.put({"type": "decision", "id": request_id, "result": result})
+        if result["rewarded"]:
+            self.rewards += 1
+            await self._outbox.put(
+                {
+                    "type": "reward",
+                    "id": request_id,
+                    "action": result["action"],
+                    "score": result["score"],
+                }
+            )
+        self._push_state()
+
+    def _push_state(self) -> None:
+        state = {
+            "type": "state",
+            "commands": self.commands,
+            "rewards": self.rewards,
+            "rate_limited": self.rate_limited,
+            "last_action": self.last_action,
+        }
+        try:
+            self._outbox.put_nowait(state)
+        except asyncio.QueueFull:
+            record_background_drop("ws_state")
+
+
+__all__ = ["ControlSession", "TokenBucket"]
@@ -0,0 +1,202 @@
+"""Flat binary checkpoints for trained behaviour policies.
+
+A checkpoint is laid out as::
+
+    MAGIC (8 bytes) | header length (uint32, little endian) | JSON header | padding
+    | float64 parameters
+
+The parameter block starts on an 8-byte boundary so that it can be memory-mapped
+and viewed as doubles without copying. Forked API workers that map the same file
+read-only share a single copy of the weights through the page cache. The same
+layout can be published in a :mod:`multiprocessing.shared_memory` segment so that
+worker processes attach to weights trained once by their parent.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"VCTPOL\x00\x01"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<8sI")
+_ALIGNMENT = 8
+
+
+@dataclass
+class PolicyCheckpoint:
+    """Decoded checkpoint: JSON metadata plus a read-only view of the parameters."""
+
+    metadata: dict[str, Any]
+    parameters: memoryview[float]
+    mapping: mmap.mmap | SharedMemory | None = None
+
+    def close(self) -> None:
+        self.parameters.release()
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+
+
+def fingerprint(payload: Any) -> str:
+    """Return a stable SHA-256 digest of a JSON-serialisable payload."""
+
+    canonical = json.dumps(
+        {"format": FORMAT_VERSION, "payload": payload},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def encode_checkpoint(metadata: dict[str, Any], parameters: bytes) -> bytes:
+    """Serialise ``parameters`` (packed float64 values) with ``metadata``."""
+
+    if len(parameters) % 8:
+        raise ValueError("Checkpoint parameters must be packed float64 values")
+    header = dict(metadata)
+    header["format_version"] = FORMAT_VERSION
+    header["byteorder"] = sys.byteorder
+    header["parameter_count"] = len(parameters) // 8
+    encoded = json.dumps(header, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    padding = -(_PREFIX.size + len(encoded)) % _ALIGNMENT
+    return b"".join((_PREFIX.pack(MAGIC, len(encoded)), encoded, b"\0" * padding, parameters))
+
+
+def write_checkpoint(path: str | Path, metadata: dict[str, Any], parameters: bytes) -> None:
+    """Atomically write ``parameters`` (packed float64 values) with ``metadata``."""
+
+    payload = encode_checkpoint(metadata, parameters)
+    path_obj = Path(path)
+    path_obj.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path_obj.name}-", dir=path_obj.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(payload)
+        os.replace(tmp_name, path_obj)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_checkpoint(path: str | Path, *, use_mmap: bool = False) -> PolicyCheckpoint:
+    """Load a checkpoint, optionally memory-mapping the parameter block read-only."""
+
+    path_obj = Path(path)
+    mapping: mmap.mmap | None = None
+    with path_obj.open("rb") as fh:
+        if use_mmap:
+            mapping = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = memoryview(mapping)
+        else:
+            buffer = memoryview(fh.read())
+    return _decode(buffer, str(path_obj), mapping, exact=True)
+
+
+def publish_shared(
+    metadata: dict[str, Any], parameters: bytes, name: str | None = None
+) -> SharedMemory:
+    """Copy a checkpoint into a new shared memory segment and return it.
+
+    The caller owns the segment and must ``close()`` and ``unlink()`` it once no
+    process needs the weights any more.
+    """
+
+    payload = encode_checkpoint(metadata, parameters)
+    segment = SharedMemory(name=name, create=True, size=len(payload))
+    buffer = segment.buf
+    assert buffer is not None
+    buffer[: len(payload)] = payload
+    return segment
+
+
+def attach_shared(name: str) -> PolicyCheckpoint:
+    """Map a checkpoint published by :func:`publish_shared` without copying it."""
+
+    segment = _open_untracked(name)
+    buffer = segment.buf
+    assert buffer is not None
+    # Segments may be rounded up to a page, so trailing bytes are expected.
+    return _decode(buffer.toreadonly(), f"shared memory {name!r}", segment, exact=False)
+
+
+def _open_untracked(name: str) -> SharedMemory:
+    """Attach to ``name`` without letting this process's exit unlink the segment."""
+
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    # Workers spawned by the publisher share its resource tracker, which already
+    # knows the segment. A process with its own tracker must not register it, or
+    # the segment is unlinked for everyone as soon as that process exits.
+    shared_tracker = getattr(resource_tracker._resource_tracker, "_fd", None) is not None
+    segment = SharedMemory(name=name)
+    if not shared_tracker:
+        resource_tracker.unregister(segment._name, "shared_memory")  # type: ignore[attr-defined]
+    return segment
+
+
+def _decode(
+    buffer: memoryview,
+    source: str,
+    mapping: mmap.mmap | SharedMemory | None,
+    *,
+    exact: bool,
+) -> PolicyCheckpoint:
+    try:
+        metadata, offset = _parse_header(buffer, source)
+        count = int(metadata["parameter_count"])
+        end = offset + count * 8
+        if end > len(buffer) or (exact and end != len(buffer)):
+            raise ValueError(f"Truncated or oversized policy checkpoint: {source}")
+        parameters = buffer[offset:end].cast("d")
+    except BaseException:
+        buffer.release()
+        if mapping is not None:
+            mapping.close()
+        raise
+    buffer.release()
+    return PolicyCheckpoint(metadata=metadata, parameters=parameters, mapping=mapping)
+
+
+def _parse_header(buffer: memoryview, path: str) -> tuple[dict[str, Any], int]:
+    if len(buffer) < _PREFIX.size:
+        raise ValueError(f"Not a policy checkpoint: {path}")
+    magic, header_len = _PREFIX.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"Not a policy checkpoint: {path}")
+    start = _PREFIX.size
+    metadata = json.loads(bytes(buffer[start : start + header_len]).decode("utf-8"))
+    if metadata.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported policy checkpoint version in {path}")
+    if metadata.get("byteorder") != sys.byteorder:
+        raise ValueError(
+            f"Policy checkpoint {path} was written on a host with different byte order"
+        )
+    offset = start + header_len
+    offset += -offset % _ALIGNMENT
+    return metadata, offset
+
+
+__all__ = [
+    "FORMAT_VERSION",
+    "MAGIC",
+    "PolicyCheckpoint",
+    "attach_shared",
+    "encode_checkpoint",
+    "fingerprint",
+    "publish_shared",
+    "read_checkpoint",
+    "write_checkpoint",
+]
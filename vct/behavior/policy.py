@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+import importlib.util
+import logging
 import math
 import random
-from collections.abc import Iterable, Sequence
-from dataclasses import dataclass
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
 from typing import Any
 
+from ..utils.optional import require_numpy
+from .checkpoint import (
+    PolicyCheckpoint,
+    attach_shared,
+    fingerprint,
+    publish_shared,
+    read_checkpoint,
+    write_checkpoint,
+)
+
+log = logging.getLogger(__name__)
+
 
 def _clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
     return max(low, min(high, value))
@@ -56,6 +73,29 @@ class BehaviorVector:
     action: str
 
 
+@dataclass(frozen=True)
+class BehaviorBatch:
+    """Scores for many inputs held in a flat array instead of per-item objects.
+
+    ``scores`` is an :class:`array.array` of doubles for the pure-Python engine and a
+    ``float64`` NumPy array for the NumPy engine. Indexing yields a
+    :class:`BehaviorVector` on demand.
+    """
+
+    actions: tuple[str, ...]
+    scores: Any
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def __getitem__(self, index: int) -> BehaviorVector:
+        return BehaviorVector(score=float(self.scores[index]), action=self.actions[index])
+
+    def __iter__(self) -> Iterator[BehaviorVector]:
+        for index in range(len(self.actions)):
+            yield self[index]
+
+
 _DEFAULT_WEIGHT_MAP: dict[str, float] = {
     "stimulus": 0.4,
     "confidence": 0.3,
@@ -88,6 +128,7 @@ class _AdaptiveMLP:
         self.hidden_bias = [0.0 for _ in range(hidden_size)]
         self.output_weights = [self._rng.uniform(-scale, scale) for _ in range(hidden_size)]
         self.output_bias = 0.0
+        self.read_only = False
 
     def forward(self, features: Sequence[float]) -> tuple[float, list[float]]:
         hidden: list[float] = []
@@ -104,6 +145,9 @@ class _AdaptiveMLP:
         score, _ = self.forward(features)
         return score
 
+    def predict_many(self, features: Any) -> Any:
+        return array("d", (self.forward(row)[0] for row in features))
+
     def train_step(self, features: Sequence[float], target: float) -> float:
         score, hidden = self.forward(features)
         error = score - target
@@ -131,6 +175,95 @@ class _AdaptiveMLP:
 
         return 0.5 * (score - target) ** 2
 
+    def feature_matrix(self, rows: Iterable[Sequence[float]]) -> Any:
+        """Materialise feature rows in the layout preferred by this engine."""
+
+        return [list(row) for row in rows]
+
+    def select_rows(self, matrix: Any, indices: Sequence[int]) -> Any:
+        return [matrix[i] for i in indices]
+
+    def train_batch(self, features: Any, targets: Sequence[float]) -> float:
+        """Apply one gradient step averaged over a batch and return the summed loss."""
+
+        batch_len = len(targets)
+        if batch_len == 0:
+            return 0.0
+        grad_output_weights = [0.0] * self.hidden_size
+        grad_output_bias = 0.0
+        grad_hidden_weights = [[0.0] * self.input_size for _ in range(self.hidden_size)]
+        grad_hidden_bias = [0.0] * self.hidden_size
+        total_loss = 0.0
+        for row, target in zip(features, targets):
+            score, hidden = self.forward(row)
+            error = score - target
+            d_output = error * score * (1.0 - score)
+            grad_output_bias += d_output
+            for i, (weight, h_val) in enumerate(zip(self.output_weights, hidden)):
+                grad_output_weights[i] += d_output * h_val
+                grad = (1.0 - h_val**2) * weight * d_output
+                grad_hidden_bias[i] += grad
+                neuron_grads = grad_hidden_weights[i]
+                for j, x_val in enumerate(row):
+                    neuron_grads[j] += grad * x_val
+            total_loss += 0.5 * error**2
+
+        step = self.learning_rate / batch_len
+        for i in range(self.hidden_size):
+            self.output_weights[i] -= step * grad_output_weights[i]
+            for j in range(self.input_size):
+                self.hidden_weights[i][j] -= step * grad_hidden_weights[i][j]
+            self.hidden_bias[i] -= step * grad_hidden_bias[i]
+        self.output_bias -= step * grad_output_bias
+        return total_loss
+
+    @property
+    def parameter_count(self) -> int:
+        return self.hidden_size * self.input_size + 2 * self.hidden_size + 1
+
+    def export_parameters(self) -> bytes:
+        """Pack all weights and biases into contiguous float64 values."""
+
+        values = array("d")
+        for row in self.hidden_weights:
+            values.extend(row)
+        values.extend(self.hidden_bias)
+        values.extend(self.output_weights)
+        values.append(self.output_bias)
+        return values.tobytes()
+
+    def load_parameters(self, values: memoryview[float], *, copy: bool = True) -> None:
+        """Restore parameters from a float64 view produced by :meth:`export_parameters`.
+
+        With ``copy=False`` the network keeps read-only views into ``values`` (for
+        example a memory-mapped checkpoint) instead of materialising its own copy.
+        """
+
+        if len(values) != self.parameter_count:
+            raise ValueError(f"Expected {self.parameter_count} parameters, got {len(values)}")
+        hidden_end = self.hidden_size * self.input_size
+        output_end = hidden_end + 2 * self.hidden_size
+        rows: Sequence[Any] = [
+            values[i * self.input_size : (i + 1) * self.input_size] for i in range(self.hidden_size)
+        ]
+        bias: Sequence[float] = values[hidden_end : hidden_end + self.hidden_size]
+        output: Sequence[float] = values[hidden_end + self.hidden_size : output_end]
+        if copy:
+            rows = [list(row) for row in rows]
+            bias = list(bias)
+            output = list(output)
+        self.hidden_weights = rows  # type: ignore[assignment]
+        self.hidden_bias = bias  # type: ignore[assignment]
+        self.output_weights = output  # type: ignore[assignment]
+        self.output_bias = float(values[output_end])
+        self.read_only = not copy
+
+    def ensure_writable(self) -> None:
+        """Replace shared read-only parameter views with private copies."""
+
+        if self.read_only:
+            self.load_parameters(memoryview(self.export_parameters()).cast("d"), copy=True)
+
     def set_linear_mapping(self, feature_weights: Sequence[float], bias: float = 0.0) -> None:
         for i in range(self.hidden_size):
             for j in range(self.input_size):
@@ -143,11 +276,159 @@ class _AdaptiveMLP:
         self.output_bias = bias
 
 
+class _NumpyAdaptiveMLP(_AdaptiveMLP):
+    """Vectorised variant of :class:`_AdaptiveMLP` backed by NumPy arrays.
+
+    Weights are drawn from the same random stream as the pure-Python network and then
+    copied into contiguous ``float64`` arrays, so both engines start from identical
+    parameters and produce the same scores up to floating point summation order.
+    """
+
+    hidden_weights: Any
+    hidden_bias: Any
+    output_weights: Any
+
+    def __init__(
+        self,
+        input_size: int,
+        hidden_size: int,
+        learning_rate: float,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._np = require_numpy("the 'numpy' policy backend")
+        super().__init__(input_size, hidden_size, learning_rate, rng)
+        np = self._np
+        self.hidden_weights = np.ascontiguousarray(self.hidden_weights, dtype=np.float64)
+        self.hidden_bias = np.asarray(self.hidden_bias, dtype=np.float64)
+        self.output_weights = np.asarray(self.output_weights, dtype=np.float64)
+
+    def forward(self, features: Sequence[float]) -> tuple[float, Any]:
+        x = self._np.asarray(features, dtype=self._np.float64)
+        hidden = self._np.tanh(self.hidden_weights @ x + self.hidden_bias)
+        output_activation = float(self.output_weights @ hidden) + self.output_bias
+        score = 1.0 / (1.0 + math.exp(-output_activation))
+        return score, hidden
+
+    def train_step(self, features: Sequence[float], target: float) -> float:
+        x = self._np.asarray(features, dtype=self._np.float64)
+        score, hidden = self.forward(x)
+        error = score - target
+        d_output = error * score * (1.0 - score)
+
+        grad_hidden = (1.0 - hidden**2) * self.output_weights * d_output
+
+        self.output_weights -= self.learning_rate * (d_output * hidden)
+        self.output_bias -= self.learning_rate * d_output
+
+        step = self.learning_rate * grad_hidden
+        self.hidden_weights -= self._np.outer(step, x)
+        self.hidden_bias -= step
+
+        return 0.5 * (score - target) ** 2
+
+    def feature_matrix(self, rows: Iterable[Sequence[float]]) -> Any:
+        np = self._np
+        matrix = np.asarray(list(rows), dtype=np.float64)
+        return matrix.reshape(-1, self.input_size)
+
+    def select_rows(self, matrix: Any, indices: Sequence[int]) -> Any:
+        return matrix[self._np.asarray(indices, dtype=self._np.intp)]
+
+    def predict_many(self, features: Any) -> Any:
+        np = self._np
+        x = np.asarray(features, dtype=np.float64).reshape(-1, self.input_size)
+        hidden = np.tanh(x @ self.hidden_weights.T + self.hidden_bias)
+        return 1.0 / (1.0 + np.exp(-(hidden @ self.output_weights + self.output_bias)))
+
+    def train_batch(self, features: Any, targets: Sequence[float]) -> float:
+        np = self._np
+        x = np.asarray(features, dtype=np.float64)
+        t = np.asarray(targets, dtype=np.float64)
+        batch_len = t.shape[0]
+        if batch_len == 0:
+            return 0.0
+        hidden = np.tanh(x @ self.hidden_weights.T + self.hidden_bias)
+        scores = 1.0 / (1.0 + np.exp(-(hidden @ self.output_weights + self.output_bias)))
+        errors = scores - t
+        d_output = errors * scores * (1.0 - scores)
+        grad_hidden = (1.0 - hidden**2) * self.output_weights * d_output[:, None]
+
+        step = self.learning_rate / batch_len
+        self.output_weights -= step * (d_output @ hidden)
+        self.output_bias -= step * float(d_output.sum())
+        self.hidden_weights -= step * (grad_hidden.T @ x)
+        self.hidden_bias -= step * grad_hidden.sum(axis=0)
+        return float(0.5 * (errors @ errors))
+
+    def set_linear_mapping(self, feature_weights: Sequence[float], bias: float = 0.0) -> None:
+        np = self._np
+        self.hidden_weights[:] = 0.0
+        diagonal = min(self.hidden_size, self.input_size)
+        self.hidden_weights[np.arange(diagonal), np.arange(diagonal)] = 1.0
+        self.hidden_bias[:] = 0.0
+        self.output_weights[:] = 0.0
+        count = min(self.hidden_size, len(feature_weights))
+        self.output_weights[:count] = np.asarray(feature_weights[:count], dtype=np.float64)
+        self.output_bias = bias
+
+    def export_parameters(self) -> bytes:
+        np = self._np
+        return np.concatenate(
+            (
+                self.hidden_weights.ravel(),
+                self.hidden_bias,
+                self.output_weights,
+                np.asarray([self.output_bias], dtype=np.float64),
+            )
+        ).tobytes()
+
+    def load_parameters(self, values: memoryview[float], *, copy: bool = True) -> None:
+        np = self._np
+        if len(values) != self.parameter_count:
+            raise ValueError(f"Expected {self.parameter_count} parameters, got {len(values)}")
+        flat = np.frombuffer(values, dtype=np.float64)
+        if copy:
+            flat = flat.copy()
+        hidden_end = self.hidden_size * self.input_size
+        output_end = hidden_end + 2 * self.hidden_size
+        self.hidden_weights = flat[:hidden_end].reshape(self.hidden_size, self.input_size)
+        self.hidden_bias = flat[hidden_end : hidden_end + self.hidden_size]
+        self.output_weights = flat[hidden_end + self.hidden_size : output_end]
+        self.output_bias = float(flat[output_end])
+        self.read_only = not copy
+
+
+def _numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+_BACKENDS: dict[str, type[_AdaptiveMLP]] = {
+    "python": _AdaptiveMLP,
+    "numpy": _NumpyAdaptiveMLP,
+}
+
+
+def _resolve_backend(name: Any) -> str:
+    backend = str(name or "python").strip().lower()
+    if backend == "auto":
+        return "numpy" if _numpy_available() else "python"
+    if backend not in _BACKENDS:
+        raise ValueError(
+            f"Unsupported policy backend: {name!r} (expected one of: auto, "
+            + ", ".join(sorted(_BACKENDS))
+            + ")"
+        )
+    return backend
+
+
 TrainingExample = tuple[BehaviorInputs, float]
 
+# Config keys that only control how a policy is stored or executed, not what it learns.
+_RUNTIME_ONLY_KEYS = frozenset({"backend", "checkpoint", "checkpoint_mmap", "training_data"})
+
 
 class BehaviorPolicy:
-    def __init__(self, config: dict[str, Any] | None = None):
+    def __init__(self, config: dict[str, Any] | None = None, *, shared_memory: str | None = None):
         config = dict(config or {})
         legacy_weights: dict[str, float] = {}
         if config and all(isinstance(v, int | float) for v in config.values()):
@@ -162,22 +443,157 @@ class BehaviorPolicy:
         hidden_size = max(int(config.get("hidden_size", feature_count)), feature_count)
         seed = config.get("seed")
         self._rng = random.Random(seed) if seed is not None else random.Random()
-        self._model = _AdaptiveMLP(
+        self.backend = _resolve_backend(config.get("backend"))
+        self._model = _BACKENDS[self.backend](
             input_size=feature_count,
             hidden_size=hidden_size,
             learning_rate=learning_rate,
             rng=self._rng,
         )
         self._trained = False
+        self._checkpoint: PolicyCheckpoint | None = None
         self.training_history: list[float] = []
         if legacy_weights:
             self._warm_start_from_weights(legacy_weights)
         training_data = config.get("training_data", [])
-        if training_data:
-            dataset = list(self._parse_training_data(training_data))
-            if dataset:
-                epochs = int(config.get("epochs", 150))
-                self.train(dataset, epochs=epochs)
+        dataset = list(self._parse_training_data(training_data)) if training_data else []
+        self.fingerprint = self._compute_fingerprint(config, legacy_weights, dataset)
+        if shared_memory and self._restore_matching_shared(shared_memory):
+            return
+        checkpoint_path = config.get("checkpoint")
+        if checkpoint_path and self._restore_matching_checkpoint(
+            checkpoint_path, use_mmap=bool(config.get("checkpoint_mmap", False))
+        ):
+            return
+        if dataset:
+            epochs = int(config.get("epochs", 150))
+            batch_size = config.get("batch_size")
+            self.train(
+                dataset,
+                epochs=epochs,
+                batch_size=None if batch_size is None else int(batch_size),
+            )
+            if checkpoint_path:
+                self.save_checkpoint(checkpoint_path)
+
+    @staticmethod
+    def _compute_fingerprint(
+        config: dict[str, Any],
+        legacy_weights: dict[str, float],
+        dataset: Sequence[TrainingExample],
+    ) -> str:
+        return fingerprint(
+            {
+                "config": {k: v for k, v in config.items() if k not in _RUNTIME_ONLY_KEYS},
+                "weights": legacy_weights,
+                "features": BehaviorInputs.feature_names(),
+                "data": [[asdict(inputs), target] for inputs, target in dataset],
+            }
+        )
+
+    def _restore_matching_checkpoint(self, path: str | Path, *, use_mmap: bool) -> bool:
+        if not Path(path).exists():
+            return False
+        try:
+            checkpoint = read_checkpoint(path, use_mmap=use_mmap)
+        except (OSError, ValueError, KeyError) as exc:
+            log.warning("Ignoring unreadable policy checkpoint %s (%s)", path, exc)
+            return False
+        return self._restore_matching(checkpoint, str(path), use_mmap=use_mmap)
+
+    def _restore_matching_shared(self, name: str) -> bool:
+        try:
+            checkpoint = attach_shared(name)
+        except (OSError, ValueError, KeyError) as exc:
+            log.warning("Ignoring unavailable shared policy %r (%s)", name, exc)
+            return False
+        return self._restore_matching(checkpoint, f"shared memory {name!r}", use_mmap=True)
+
+    def _restore_matching(
+        self, checkpoint: PolicyCheckpoint, source: str, *, use_mmap: bool
+    ) -> bool:
+        if checkpoint.metadata.get("fingerprint") != self.fingerprint:
+            log.info("Policy checkpoint in %s is stale; retraining", source)
+            checkpoint.close()
+            return False
+        try:
+            self._apply_checkpoint(checkpoint, use_mmap=use_mmap)
+        except ValueError as exc:
+            log.warning("Ignoring incompatible policy checkpoint in %s (%s)", source, exc)
+            return False
+        return True
+
+    def save_checkpoint(self, path: str | Path) -> None:
+        """Persist the network parameters and training metadata to ``path``."""
+
+        write_checkpoint(path, self._checkpoint_metadata(), self._model.export_parameters())
+
+    def publish_shared(self, name: str | None = None) -> SharedMemory:
+        """Copy the parameters into a new shared memory segment for worker processes.
+
+        Workers pass the segment's ``name`` as ``shared_memory`` to map the weights
+        read-only instead of training their own copy. The caller owns the segment
+        and must ``close()`` and ``unlink()`` it when serving stops.
+        """
+
+        return publish_shared(self._checkpoint_metadata(), self._model.export_parameters(), name)
+
+    def attach_shared(self, name: str) -> dict[str, Any]:
+        """Map parameters published with :meth:`publish_shared` and return their metadata."""
+
+        checkpoint = attach_shared(name)
+        self._apply_checkpoint(checkpoint, use_mmap=True)
+        return checkpoint.metadata
+
+    def _checkpoint_metadata(self) -> dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "backend": self.backend,
+            "input_size": self._model.input_size,
+            "hidden_size": self._model.hidden_size,
+            "learning_rate": self._model.learning_rate,
+            "feature_names": list(BehaviorInputs.feature_names()),
+            "trained": self._trained,
+            "training_history": self.training_history,
+        }
+
+    def load_checkpoint(self, path: str | Path, *, use_mmap: bool = False) -> dict[str, Any]:
+        """Load parameters saved by :meth:`save_checkpoint` and return its metadata.
+
+        With ``use_mmap=True`` the file is mapped read-only and the network reads its
+        weights straight from the mapping, so forked workers share one copy. Training a
+        mapped policy first copies the weights into private memory.
+        """
+
+        checkpoint = read_checkpoint(path, use_mmap=use_mmap)
+        self._apply_checkpoint(checkpoint, use_mmap=use_mmap)
+        return checkpoint.metadata
+
+    def _apply_checkpoint(self, checkpoint: PolicyCheckpoint, *, use_mmap: bool) -> None:
+        metadata = checkpoint.metadata
+        expected_shape = (self._model.input_size, self._model.hidden_size)
+        try:
+            if (metadata.get("input_size"), metadata.get("hidden_size")) != expected_shape:
+                raise ValueError(
+                    "Checkpoint network shape "
+                    f"{(metadata.get('input_size'), metadata.get('hidden_size'))} "
+                    f"does not match policy shape {expected_shape}"
+                )
+            self._model.load_parameters(checkpoint.parameters, copy=not use_mmap)
+        except BaseException:
+            # Never keep the mapping open for a checkpoint we did not adopt.
+            checkpoint.close()
+            raise
+        # The network no longer reads from a previously mapped checkpoint.
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+            self._checkpoint = None
+        if use_mmap:
+            self._checkpoint = checkpoint
+        else:
+            checkpoint.close()
+        self.training_history = [float(v) for v in metadata.get("training_history", [])]
+        self._trained = bool(metadata.get("trained", False))
 
     def _warm_start_from_weights(self, weight_map: dict[str, float]) -> None:
         features = []
@@ -202,23 +618,85 @@ class BehaviorPolicy:
                     inputs = BehaviorInputs(**inputs_payload)
                     yield inputs, _clamp(float(item["score"]))
 
-    def train(self, dataset: Sequence[TrainingExample], epochs: int = 150) -> list[float]:
+    def train(
+        self,
+        dataset: Sequence[TrainingExample],
+        epochs: int = 150,
+        batch_size: int | None = None,
+    ) -> list[float]:
+        """Fit the policy network and return the mean loss of every epoch.
+
+        ``batch_size=None`` keeps classic per-example SGD. A positive value averages
+        gradients over mini-batches of that size and ``0`` trains on the full dataset
+        in a single batch per epoch. Feature vectors are materialised only once.
+        """
+
         if not dataset:
             return []
+        self._model.ensure_writable()
         data = list(dataset)
+        features = self._model.feature_matrix(inputs.as_vector() for inputs, _ in data)
+        targets = [_clamp(target) for _, target in data]
+        if batch_size is None:
+            history = self._train_per_example(features, targets, epochs)
+        else:
+            history = self._train_batched(features, targets, epochs, batch_size)
+        self.training_history.extend(history)
+        self._trained = True
+        return history
+
+    def _train_per_example(self, features: Any, targets: list[float], epochs: int) -> list[float]:
+        order = list(range(len(targets)))
         history: list[float] = []
         for _ in range(max(1, epochs)):
-            self._rng.shuffle(data)
+            self._rng.shuffle(order)
             total_loss = 0.0
-            for inputs, target in data:
-                features = inputs.as_vector()
-                total_loss += self._model.train_step(features, _clamp(target))
-            history.append(total_loss / len(data))
-        self.training_history.extend(history)
-        self._trained = True
+            for index in order:
+                total_loss += self._model.train_step(features[index], targets[index])
+            history.append(total_loss / len(order))
+        return history
+
+    def _train_batched(
+        self, features: Any, targets: list[float], epochs: int, batch_size: int
+    ) -> list[float]:
+        if batch_size < 0:
+            raise ValueError("batch_size must be a non-negative integer")
+        count = len(targets)
+        size = count if batch_size == 0 else min(batch_size, count)
+        order = list(range(count))
+        history: list[float] = []
+        for _ in range(max(1, epochs)):
+            self._rng.shuffle(order)
+            total_loss = 0.0
+            for start in range(0, count, size):
+                batch = order[start : start + size]
+                total_loss += self._model.train_batch(
+                    self._model.select_rows(features, batch),
+                    [targets[i] for i in batch],
+                )
+            history.append(total_loss / count)
         return history
 
     def decide(self, action: str, inputs: BehaviorInputs) -> BehaviorVector:
         score = self._model.predict(inputs.as_vector())
         score = _clamp(score)
         return BehaviorVector(score=score, action=action)
+
+    def decide_many(
+        self, actions: str | Sequence[str], inputs_seq: Sequence[BehaviorInputs]
+    ) -> BehaviorBatch:
+        """Score many inputs with a single batched forward pass.
+
+        ``actions`` is either one action shared by every input or a sequence with one
+        action per input.
+        """
+
+        if isinstance(actions, str):
+            action_tuple = (actions,) * len(inputs_seq)
+        else:
+            action_tuple = tuple(actions)
+            if len(action_tuple) != len(inputs_seq):
+                raise ValueError("actions and inputs_seq must have the same length")
+        features = self._model.feature_matrix(inputs.as_vector() for inputs in inputs_seq)
+        scores = self._model.predict_many(features)
+        return BehaviorBatch(actions=action_tuple, scores=scores)
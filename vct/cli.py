@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import secrets
+import sys
 from collections.abc import Sequence
+from typing import Any
 
 from .configuration import RoboDogSettings, apply_key_path, parse_typed_value
 from .robodog.dog_bot_brain import RoboDogBrain
@@ -43,6 +47,72 @@ def _handle_config_set(args: argparse.Namespace) -> None:
     print(f"✅ Updated {args.key} in {args.config}")
 
 
+def _handle_serve_command(args: argparse.Namespace) -> None:
+    from .api.serve import serve
+
+    serve(args.config, host=args.host, port=args.port, workers=args.workers)
+
+
+def _handle_hash_key_command(args: argparse.Namespace) -> None:
+    from .api.security import hash_api_key
+
+    key = args.key or secrets.token_urlsafe(32)
+    if not args.key:
+        print(f"New API key for {args.key_id}: {key}", file=sys.stderr)
+    print(f"{args.key_id} {hash_api_key(key)}")
+
+
+def _handle_sweep_command(args: argparse.Namespace) -> None:
+    from .simulation.sweep import (
+        RESULT_COLUMNS,
+        EpisodeSpec,
+        SearchSpace,
+        open_results_writer,
+        run_sweep,
+    )
+
+    commands = args.commands or list(RoboDogSettings.load(args.config).commands_map)
+    try:
+        space = SearchSpace.from_specs(args.param)
+        points = list(space.sample(args.random, args.seed) if args.random else space.grid())
+        spec = EpisodeSpec(
+            commands=tuple(commands),
+            steps=args.steps,
+            episodes=args.episodes,
+            seed=args.seed,
+            command_interval_s=args.command_interval,
+            confidence=args.confidence,
+            reward_bias=args.reward_bias,
+        )
+    except ValueError as exc:
+        args.parser.error(str(exc))
+    columns = {"run_id": int, **space.column_types(), **RESULT_COLUMNS}
+    try:
+        writer = open_results_writer(args.out, columns, row_group_size=args.row_group_size)
+    except (ValueError, RuntimeError) as exc:
+        # Unknown extensions and a missing pyarrow are usage errors, reported
+        # before any worker process is started.
+        args.parser.error(str(exc))
+    best: dict[str, Any] | None = None
+    try:
+        for row in run_sweep(args.config, points, spec, workers=args.workers):
+            writer.write(row)
+            params = {name: row[name] for name in space.params}
+            print(
+                f"[{row['run_id'] + 1}/{len(points)}] success={row['success_mean']:.3f}"
+                f"±{row['success_std']:.3f} {json.dumps(params, ensure_ascii=False)}",
+                flush=True,
+            )
+            if best is None or row["success_mean"] > best["success_mean"]:
+                best = row
+    finally:
+        writer.close()
+    if best is not None:
+        params = {name: best[name] for name in space.params}
+        print(f"Best: {json.dumps(params, ensure_ascii=False)} success={best['success_mean']:.3f}")
+    print(f"Results written to {args.out}")
+
+
 def _split_key_path(path: str) -> Sequence[str]:
     return [segment.strip() for segment in path.split(".") if segment.strip()]
 
@@ -56,6 +126,57 @@ def main() -> None:
     _add_common_run_arguments(run_parser)
     run_parser.set_defaults(func=_handle_run_command)
 
+    serve_parser = sub.add_parser("serve", help="Serve the REST API with shared policy weights")
+    serve_parser.add_argument("--config", default="vct/config.yaml")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    serve_parser.set_defaults(func=_handle_serve_command)
+
+    hash_parser = sub.add_parser(
+        "hash-key", help="Print a VCT_API_KEYS_FILE line for a new or given API key"
+    )
+    hash_parser.add_argument("key_id", help="Name reported in vct_api_key_requests_total")
+    hash_parser.add_argument("--key", help="Existing key to hash instead of generating one")
+    hash_parser.set_defaults(func=_handle_hash_key_command)
+
+    sweep_parser = sub.add_parser(
+        "sweep", help="Simulate episodes over a grid or random search of settings"
+    )
+    sweep_parser.add_argument("--config", default="vct/config.yaml")
+    sweep_parser.add_argument(
+        "--param",
+        action="append",
+        required=True,
+        help="KEY=V1,V2,... or KEY=uniform:LOW:HIGH (also loguniform, int); repeatable",
+    )
+    sweep_parser.add_argument(
+        "--random", type=int, default=0, help="Sample this many points instead of the grid"
+    )
+    sweep_parser.add_argument("--episodes", type=int, default=8, help="Seeds per point")
+    sweep_parser.add_argument("--steps", type=int, default=200, help="Commands per episode")
+    sweep_parser.add_argument("--seed", type=int, default=0)
+    sweep_parser.add_argument(
+        "--command",
+        dest="commands",
+        action="append",
+        help="Command phrase to cycle through (default: every phrase of commands_map)",
+    )
+    sweep_parser.add_argument("--command-interval", type=float, default=1.0)
+    sweep_parser.add_argument("--confidence", type=float, default=0.85)
+    sweep_parser.add_argument("--reward-bias", type=float, default=0.5)
+    sweep_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    sweep_parser.add_argument(
+        "--out", default="sweep_results.csv", help="Results file (.csv, or .parquet with pyarrow)"
+    )
+    sweep_parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=1,
+        help="Parquet rows buffered per row group (1 writes each point as it finishes)",
+    )
+    sweep_parser.set_defaults(func=_handle_sweep_command, parser=sweep_parser)
+
     config_parser = sub.add_parser("config", help="Inspect or modify configuration")
     config_parser.add_argument("--config", default="vct/config.yaml")
     config_sub = config_parser.add_subparsers(dest="config_cmd")
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from collections.abc import Iterable, Mapping, MutableMapping
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
@@ -22,6 +22,13 @@ class RoboDogSettings(BaseModel):
     reward_triggers: dict[str, bool] = Field(default_factory=dict)
     environment_context: dict[str, float] = Field(default_factory=dict)
     mood_initial: str | None = None
+    stt_warmup: bool = False
+    stt_cache_path: str | None = None
+    stt_keyword_manifest: str | None = None
+    stt_keyword_min_confidence: float = Field(0.2, ge=0.0, le=1.0)
+    tts_queue_size: int = Field(0, ge=0)
+    tts_overflow: Literal["drop_oldest", "coalesce", "block"] = "drop_oldest"
+    tts_score_step: float = Field(0.0, ge=0.0, le=1.0)
 
     @field_validator("weights", mode="before")
     @classmethod
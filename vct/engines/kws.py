@@ -0,0 +1,264 @@
+"""Keyword spotting on MFCC features as a cheap first stage before full ASR."""
+
+from __future__ import annotations
+
+import csv
+import logging
+import wave
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from ..utils.optional import require_numpy
+from .stt import STTEngineBase
+
+log = logging.getLogger(__name__)
+
+KWS_SAMPLE_RATE = 16000
+_N_MFCC = 13
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """Best template match for a clip."""
+
+    label: str
+    confidence: float
+    distance: float
+
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> Any:
+    np = require_numpy("KeywordSpottingSTT")
+
+    def to_mel(hz: Any) -> Any:
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def to_hz(mel: Any) -> Any:
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    edges = to_hz(np.linspace(to_mel(0.0), to_mel(sample_rate / 2), n_mels + 2))
+    bins = np.floor((n_fft + 1) * edges / sample_rate).astype(int)
+    bank = np.zeros((n_mels, n_fft // 2 + 1))
+    for m in range(1, n_mels + 1):
+        left, centre, right = bins[m - 1], bins[m], bins[m + 1]
+        if centre > left:
+            bank[m - 1, left:centre] = (np.arange(left, centre) - left) / (centre - left)
+        if right > centre:
+            bank[m - 1, centre:right] = (right - np.arange(centre, right)) / (right - centre)
+    return bank
+
+
+@lru_cache(maxsize=8)
+def _dct_matrix(n_mfcc: int, n_mels: int) -> Any:
+    np = require_numpy("KeywordSpottingSTT")
+    n = np.arange(n_mels)
+    basis = np.cos(np.pi / n_mels * (n + 0.5)[None, :] * np.arange(n_mfcc)[:, None])
+    basis *= np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    return basis
+
+
+def mfcc(
+    samples: Any,
+    sample_rate: int = KWS_SAMPLE_RATE,
+    *,
+    n_mfcc: int = _N_MFCC,
+    n_mels: int = 26,
+    frame_ms: int = 25,
+    hop_ms: int = 10,
+) -> Any:
+    """Return an ``(frames, n_mfcc)`` array of cepstral coefficients.
+
+    ``samples`` is a float array in ``[-1, 1]``. Frames quieter than 40 dB below
+    the loudest one are trimmed from both ends so leading and trailing silence
+    does not dilute the keyword.
+    """
+
+    np = require_numpy("KeywordSpottingSTT")
+    frame = sample_rate * frame_ms // 1000
+    hop = sample_rate * hop_ms // 1000
+    signal = np.asarray(samples, dtype=np.float64)
+    if signal.size < frame:
+        signal = np.pad(signal, (0, frame - signal.size))
+    signal = np.append(signal[0], signal[1:] - 0.97 * signal[:-1])
+    frames = np.lib.stride_tricks.sliding_window_view(signal, frame)[::hop]
+    n_fft = 1 << (frame - 1).bit_length()
+    power = np.abs(np.fft.rfft(frames * np.hamming(frame), n_fft)) ** 2 / n_fft
+
+    energy = power.sum(axis=1)
+    voiced = np.flatnonzero(energy > energy.max() * 1e-4)
+    if voiced.size:
+        power = power[voiced[0] : voiced[-1] + 1]
+
+    mel = np.log(power @ _mel_filterbank(sample_rate, n_fft, n_mels).T + 1e-10)
+    return mel @ _dct_matrix(n_mfcc, n_mels).T
+
+
+class KeywordSpottingSTT(STTEngineBase):
+    """Recognise a small command vocabulary by matching MFCC templates.
+
+    Each clip is reduced to a fixed-length fingerprint: MFCCs are time-normalised
+    to ``frames`` steps and mean/variance normalised, so matching is a single
+    vectorised nearest-neighbour search over all templates and takes well under a
+    millisecond after feature extraction.
+
+    Confidence is the relative margin between the best label and the runner-up,
+    and drops to zero when the best match is further than ``max_distance``. Clips
+    below ``min_confidence`` are escalated to ``fallback`` (typically
+    :class:`~vct.engines.stt.WhisperSTT`); without a fallback they are reported as
+    unrecognised. :attr:`low_confidence` counts such clips either way.
+    """
+
+    def __init__(
+        self,
+        fallback: STTEngineBase | None = None,
+        *,
+        min_confidence: float = 0.2,
+        max_distance: float | None = None,
+        frames: int = 32,
+    ) -> None:
+        self._np = require_numpy("KeywordSpottingSTT")
+        self.fallback = fallback
+        self.min_confidence = min_confidence
+        self.max_distance = max_distance
+        self.frames = frames
+        self.labels: list[str] = []
+        self._template_labels: list[int] = []
+        self._templates = self._np.empty((0, frames * _N_MFCC))
+        self.low_confidence = 0
+
+    @classmethod
+    def from_manifest(
+        cls,
+        manifest: str | Path,
+        fallback: STTEngineBase | None = None,
+        **kwargs: Any,
+    ) -> KeywordSpottingSTT:
+        """Build templates from an ``id,filename,label`` CSV like ``data/synthetic``.
+
+        File names are resolved relative to the manifest. Missing clips are
+        skipped with a warning.
+        """
+
+        manifest = Path(manifest)
+        engine = cls(fallback, **kwargs)
+        with manifest.open(newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                path = manifest.parent / row["filename"]
+                if not path.exists():
+                    log.warning("Keyword template %s is missing; skipping", path)
+                    continue
+                engine.add_template(row["label"], path)
+        if not engine.labels:
+            raise ValueError(f"No keyword templates could be loaded from {manifest}")
+        return engine
+
+    @property
+    def model_name(self) -> str:
+        return f"kws-{len(self._template_labels)}"
+
+    def add_template(self, label: str, wav_path: str | Path) -> None:
+        samples, rate = self._read_wav(wav_path)
+        self.add_template_samples(label, samples, rate)
+
+    def add_template_samples(self, label: str, samples: Any, sample_rate: int) -> None:
+        np = self._np
+        if label not in self.labels:
+            self.labels.append(label)
+        self._template_labels.append(self.labels.index(label))
+        row = self._fingerprint(samples, sample_rate)[None, :]
+        self._templates = np.vstack([self._templates, row])
+
+    def _fingerprint(self, samples: Any, sample_rate: int) -> Any:
+        np = self._np
+        features = mfcc(samples, sample_rate)
+        # Resample every coefficient track to a fixed number of steps.
+        source = np.linspace(0.0, 1.0, len(features))
+        target = np.linspace(0.0, 1.0, self.frames)
+        warped = np.stack(
+            [np.interp(target, source, features[:, k]) for k in range(features.shape[1])], axis=1
+        )
+        warped -= warped.mean(axis=0)
+        warped /= warped.std(axis=0) + 1e-8
+        return warped.ravel() / np.sqrt(warped.size)
+
+    def spot(self, samples: Any, sample_rate: int = KWS_SAMPLE_RATE) -> KeywordMatch:
+        """Return the best matching label for ``samples`` and its confidence."""
+
+        np = self._np
+        if not self._template_labels:
+            return KeywordMatch(label="", confidence=0.0, distance=float("inf"))
+        distances = np.linalg.norm(
+            self._templates - self._fingerprint(samples, sample_rate), axis=1
+        )
+        per_label = np.full(len(self.labels), np.inf)
+        np.minimum.at(per_label, self._template_labels, distances)
+        order = np.argsort(per_label)
+        best = float(per_label[order[0]])
+        if len(order) > 1 and per_label[order[1]] > 0:
+            confidence = 1.0 - best / float(per_label[order[1]])
+        else:
+            confidence = 1.0
+        if self.max_distance is not None and best > self.max_distance:
+            confidence = 0.0
+        return KeywordMatch(label=self.labels[order[0]], confidence=confidence, distance=best)
+
+    def _resolve(self, match: KeywordMatch, escalate: Callable[[STTEngineBase], str]) -> str:
+        if match.confidence >= self.min_confidence:
+            return match.label
+        self.low_confidence += 1
+        return self._escalate(escalate)
+
+    def _escalate(self, escalate: Callable[[STTEngineBase], str]) -> str:
+        if self.fallback is None:
+            return ""
+        try:
+            return escalate(self.fallback)
+        except RuntimeError as exc:
+            log.warning("Keyword fallback unavailable (%s); disabling escalation", exc)
+            self.fallback = None
+            return ""
+
+    def transcribe(self, wav_path: str | None = None, use_mic: bool = False) -> str:
+        if use_mic or not wav_path:
+            return ""
+
+        def escalate(engine: STTEngineBase) -> str:
+            return engine.transcribe(wav_path=wav_path)
+
+        try:
+            samples, rate = self._read_wav(wav_path)
+        except (wave.Error, ValueError, EOFError) as exc:
+            # Clips the spotter cannot read (not WAV, not 16-bit) go to the full engine.
+            log.info("Keyword spotting cannot read %s (%s); escalating", wav_path, exc)
+            return self._escalate(escalate)
+        return self._resolve(self.spot(samples, rate), escalate)
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int) -> str:
+        samples = self._np.frombuffer(pcm, dtype=self._np.int16) / 32768.0
+        return self._resolve(
+            self.spot(samples, sample_rate),
+            lambda engine: engine.transcribe_pcm(pcm, sample_rate),
+        )
+
+    def warmup(self) -> None:
+        if self.fallback is not None:
+            self.fallback.warmup()
+
+    def _read_wav(self, wav_path: str | Path) -> tuple[Any, int]:
+        with wave.open(str(wav_path), "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"{wav_path} must be 16-bit PCM")
+            channels = wav.getnchannels()
+            rate = wav.getframerate()
+            data = wav.readframes(wav.getnframes())
+        samples = self._np.frombuffer(data, dtype=self._np.int16) / 32768.0
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        return samples, rate
+
+
+__all__ = ["KeywordMatch", "KeywordSpottingSTT", "mfcc"]
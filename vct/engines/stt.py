@@ -2,22 +2,128 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import logging
+import os
+import tempfile
+import threading
+import wave
+import weakref
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
 from typing import Any
 
+from ..utils.optional import require_numpy
+
+log = logging.getLogger(__name__)
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+@dataclass(frozen=True)
+class Transcription:
+    """Transcript of one clip produced by a batch transcription run."""
+
+    path: str
+    text: str
+
 
 class STTEngineBase:
     """Abstract interface for speech-to-text backends."""
 
+    #: Whether transcripts depend on the clip's file name rather than its audio.
+    cache_by_path = False
+
     def transcribe(self, wav_path: str | None = None, use_mic: bool = False) -> str:
         """Return text transcription for the given audio clip."""
 
         raise NotImplementedError
 
+    def warmup(self) -> None:
+        """Prepare the engine so that the first real request is not slower."""
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int) -> str:
+        """Transcribe mono 16-bit PCM held in memory.
+
+        The default implementation spills the audio to a temporary WAV file and
+        delegates to :meth:`transcribe`; engines that can consume samples directly
+        should override it.
+        """
+
+        path = _write_wav(pcm, sample_rate)
+        try:
+            return self.transcribe(wav_path=path)
+        finally:
+            os.unlink(path)
+
+
+class _ModelRegistry:
+    """Process-wide, reference-counted store of loaded speech models.
+
+    Engines that ask for the same key share one model instance. The model is
+    dropped once the last engine holding it releases its reference.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, list[Any]] = {}
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self._warm: set[Hashable] = set()
+
+    def acquire(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Load outside the registry lock so unrelated models can load concurrently.
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry[1] += 1
+                    return entry[0]
+            model = loader()
+            with self._lock:
+                self._entries[key] = [model, 1]
+            return model
+
+    def release(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._entries[key]
+                self._warm.discard(key)
+
+    def refcount(self, key: Hashable) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            return int(entry[1]) if entry is not None else 0
+
+    def mark_warm(self, key: Hashable) -> bool:
+        """Record that ``key`` has been warmed up; return ``False`` if it already was."""
+
+        with self._lock:
+            if key in self._warm or key not in self._entries:
+                return False
+            self._warm.add(key)
+            return True
+
+
+_MODEL_REGISTRY = _ModelRegistry()
+
 
 class RuleBasedSTT(STTEngineBase):
     """Legacy keyword-based recogniser kept as a lightweight fallback."""
 
+    cache_by_path = True
+
     KEYWORDS = {"sydity": "сидіти", "lezhaty": "лежати", "do_mene": "до мене", "bark": "голос"}
 
     def transcribe(self, wav_path: str | None = None, use_mic: bool = False) -> str:
@@ -43,6 +149,11 @@ class WhisperSTT(STTEngineBase):
         self.device = device
         self._loader = loader
         self._model: _WhisperModel | None = None
+        self._finalizer: weakref.finalize | None = None
+        # Custom loaders may return anything, so they only share with themselves.
+        self._registry_key: Hashable = (
+            (model_name, device) if loader is None else (model_name, device, loader)
+        )
 
     def _load_model(self) -> _WhisperModel:
         try:
@@ -57,9 +168,35 @@ class WhisperSTT(STTEngineBase):
     def _ensure_model(self) -> _WhisperModel:
         if self._model is None:
             loader = self._loader or self._load_model
-            self._model = loader()
+            self._model = _MODEL_REGISTRY.acquire(self._registry_key, loader)
+            self._finalizer = weakref.finalize(self, _MODEL_REGISTRY.release, self._registry_key)
         return self._model
 
+    def close(self) -> None:
+        """Release this engine's reference to the shared model."""
+
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._model = None
+
+    def warmup(self) -> None:
+        """Load the shared model and run it once on a short silent clip.
+
+        The first inference pays for lazy initialisation inside the model (kernel
+        selection, caches), so doing it at startup keeps the first user request
+        as fast as the following ones. Each shared model is warmed only once.
+        """
+
+        model = self._ensure_model()
+        if not _MODEL_REGISTRY.mark_warm(self._registry_key):
+            return
+        path = _write_silent_wav()
+        try:
+            model.transcribe(path, fp16=self._supports_fp16())
+        finally:
+            os.unlink(path)
+
     @staticmethod
     def _supports_fp16() -> bool:
         try:
@@ -78,9 +215,105 @@ class WhisperSTT(STTEngineBase):
         text = result.get("text", "") if isinstance(result, dict) else ""
         return text.strip()
 
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int) -> str:
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            # Let Whisper's ffmpeg loader resample through a temporary file.
+            return super().transcribe_pcm(pcm, sample_rate)
+        np = require_numpy("WhisperSTT.transcribe_pcm")
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        model = self._ensure_model()
+        result = model.transcribe(audio, fp16=self._supports_fp16())
+        text = result.get("text", "") if isinstance(result, dict) else ""
+        return text.strip()
+
+    def transcribe_many(
+        self,
+        paths: Iterable[str],
+        *,
+        batch_size: int = 16,
+        workers: int = 4,
+    ) -> Iterator[Transcription]:
+        """Transcribe many clips, yielding results as each batch finishes.
+
+        Audio is decoded and resampled on a pool of ``workers`` threads while the
+        previous batch runs through the model. Each batch is padded to Whisper's
+        30 second window and decoded with a single model call. Throughput is
+        logged in clips per second when the run completes.
+        """
+
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        clips = [str(path) for path in paths]
+        if not clips:
+            return
+        model = self._ensure_model()
+        batches = [clips[i : i + batch_size] for i in range(0, len(clips), batch_size)]
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            in_flight: deque[tuple[list[str], list[Future[Any]]]] = deque()
+            upcoming = iter(batches)
+
+            def prefetch() -> None:
+                batch = next(upcoming, None)
+                if batch is not None:
+                    in_flight.append((batch, [pool.submit(self._decode_audio, p) for p in batch]))
+
+            # Keep one batch decoding while the model works on the current one.
+            prefetch()
+            prefetch()
+            while in_flight:
+                batch, futures = in_flight.popleft()
+                prefetch()
+                audios = [future.result() for future in futures]
+                texts = self._decode_batch(model, audios)
+                for path, text in zip(batch, texts):
+                    yield Transcription(path=path, text=text.strip())
+        elapsed = perf_counter() - start
+        log.info(
+            "Transcribed %d clips in %.2fs (%.1f clips/s)",
+            len(clips),
+            elapsed,
+            len(clips) / elapsed if elapsed > 0 else float("inf"),
+        )
+
+    @staticmethod
+    def _decode_audio(path: str) -> Any:
+        """Load ``path`` as 16 kHz mono audio padded or trimmed to 30 seconds."""
+
+        import whisper
+
+        return whisper.pad_or_trim(whisper.load_audio(path))
+
+    def _decode_batch(self, model: Any, audios: Sequence[Any]) -> list[str]:
+        """Run one batched Whisper decode over pre-padded audio arrays."""
+
+        import torch
+        import whisper
+
+        mels = torch.stack(
+            [whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels) for audio in audios]
+        ).to(model.device)
+        results = whisper.decode(model, mels, whisper.DecodingOptions(fp16=self._supports_fp16()))
+        return [result.text for result in results]
+
+
+def _write_wav(pcm: bytes, sample_rate: int, prefix: str = "vct-pcm-") -> str:
+    fd, path = tempfile.mkstemp(prefix=prefix, suffix=".wav")
+    with os.fdopen(fd, "wb") as fh, wave.open(fh, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return path
+
+
+def _write_silent_wav(seconds: float = 0.5, sample_rate: int = 16000) -> str:
+    silence = b"\x00\x00" * int(seconds * sample_rate)
+    return _write_wav(silence, sample_rate, prefix="vct-warmup-")
+
 
 class _WhisperModel:
     """Protocol-like duck type for whisper model objects."""
 
-    def transcribe(self, wav_path: str, *, fp16: bool) -> dict[str, Any]:
+    def transcribe(self, wav_path: Any, *, fp16: bool) -> dict[str, Any]:
         raise NotImplementedError
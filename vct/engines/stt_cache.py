@@ -0,0 +1,159 @@
+"""Persistent cache of speech-to-text results keyed by audio content."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .stt import STTEngineBase
+
+_HASH_CHUNK = 1 << 16
+
+
+class CachedSTT(STTEngineBase):
+    """Wrap an STT engine and reuse transcripts of clips it has already seen.
+
+    Entries are keyed by the engine class, its ``model_name`` (if any) and a
+    SHA-256 digest of the audio file, so replaying the same clip under another name
+    is still a hit. Engines that derive their answer from the file name rather than
+    the audio (``cache_by_path = True``, e.g. :class:`RuleBasedSTT`) are keyed by
+    the path exactly as it was passed, which is all such an engine reads.
+
+    Transcripts are appended to an NDJSON ``index_path`` and only byte offsets are
+    kept for the whole index; at most ``max_entries`` transcripts are held in an
+    in-memory LRU, and the content digests of at most as many paths.
+    """
+
+    def __init__(
+        self,
+        engine: STTEngineBase,
+        index_path: str | Path | None = None,
+        *,
+        max_entries: int = 1024,
+    ) -> None:
+        self.engine = engine
+        self.index_path = Path(index_path) if index_path else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lru: OrderedDict[str, str] = OrderedDict()
+        self._offsets: dict[str, int] = {}
+        self._digests: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.index_path is not None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._load_offsets()
+
+    @property
+    def model_name(self) -> str:
+        return str(getattr(self.engine, "model_name", ""))
+
+    def _load_offsets(self) -> None:
+        assert self.index_path is not None
+        if not self.index_path.exists():
+            return
+        with self.index_path.open("rb") as fh:
+            offset = 0
+            for line in fh:
+                try:
+                    key = json.loads(line)["key"]
+                except (ValueError, KeyError, TypeError):
+                    # A partially written trailing line from an interrupted append.
+                    pass
+                else:
+                    self._offsets[key] = offset
+                offset += len(line)
+
+    def _cache_key(self, wav_path: str) -> str | None:
+        if getattr(self.engine, "cache_by_path", False):
+            identity = "path:" + wav_path.lower()
+        else:
+            digest = self._content_digest(wav_path)
+            if digest is None:
+                return None
+            identity = "sha256:" + digest
+        engine = type(self.engine).__name__
+        return f"{engine}|{self.model_name}|{identity}"
+
+    def _content_digest(self, wav_path: str) -> str | None:
+        try:
+            stat = os.stat(wav_path)
+        except OSError:
+            return None
+        # Skip rehashing files that have not changed since we last saw them.
+        known = self._digests.get(wav_path)
+        if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+            self._digests.move_to_end(wav_path)
+            return known[2]
+        digest = hashlib.sha256()
+        with open(wav_path, "rb") as fh:
+            for block in iter(lambda: fh.read(_HASH_CHUNK), b""):
+                digest.update(block)
+        hexdigest = digest.hexdigest()
+        self._digests[wav_path] = (stat.st_size, stat.st_mtime_ns, hexdigest)
+        self._digests.move_to_end(wav_path)
+        while len(self._digests) > self.max_entries:
+            self._digests.popitem(last=False)
+        return hexdigest
+
+    def _lookup(self, key: str) -> str | None:
+        text = self._lru.get(key)
+        if text is not None:
+            self._lru.move_to_end(key)
+            return text
+        offset = self._offsets.get(key)
+        if offset is None or self.index_path is None:
+            return None
+        with self.index_path.open("rb") as fh:
+            fh.seek(offset)
+            record = json.loads(fh.readline())
+        text = str(record["text"])
+        self._remember(key, text)
+        return text
+
+    def _remember(self, key: str, text: str) -> None:
+        self._lru[key] = text
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _store(self, key: str, text: str) -> None:
+        self._remember(key, text)
+        if self.index_path is None:
+            return
+        line = json.dumps({"key": key, "text": text}, ensure_ascii=False) + "\n"
+        with self.index_path.open("ab") as fh:
+            offset = fh.tell()
+            fh.write(line.encode("utf-8"))
+        self._offsets[key] = offset
+
+    def transcribe(self, wav_path: str | None = None, use_mic: bool = False) -> str:
+        if use_mic or not wav_path:
+            return self.engine.transcribe(wav_path=wav_path, use_mic=use_mic)
+        path = str(wav_path)
+        with self._lock:
+            key = self._cache_key(path)
+            cached = self._lookup(key) if key is not None else None
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+        text = self.engine.transcribe(wav_path=path)
+        if key is not None:
+            with self._lock:
+                self._store(key, text)
+        return text
+
+    def transcribe_pcm(self, pcm: bytes, sample_rate: int) -> str:
+        # Live audio practically never repeats byte for byte, so skip the index.
+        return self.engine.transcribe_pcm(pcm, sample_rate)
+
+    def warmup(self) -> None:
+        self.engine.warmup()
+
+
+__all__ = ["CachedSTT"]
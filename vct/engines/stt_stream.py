@@ -0,0 +1,336 @@
+"""Streaming speech recognition driven by an energy-based voice activity detector."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+import wave
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .stt import STTEngineBase
+
+_SAMPLE_WIDTH = 2
+
+
+@dataclass(frozen=True)
+class StreamingTranscript:
+    """Transcript of the utterance in progress (``final=False``) or a finished one."""
+
+    text: str
+    final: bool
+    start: float
+    end: float
+
+
+class PCMRingBuffer:
+    """Bounded byte ring that decouples an audio producer from the recogniser.
+
+    A capture callback calls :meth:`write` with mono 16-bit PCM; the consumer
+    iterates the buffer to receive chunks as they arrive. When the consumer falls
+    behind, the oldest audio is overwritten and counted in :attr:`overruns` so that
+    recognition always works on the most recent sound.
+    """
+
+    def __init__(self, capacity: int = 16000 * _SAMPLE_WIDTH * 10) -> None:
+        if capacity < _SAMPLE_WIDTH:
+            raise ValueError("capacity must hold at least one sample")
+        # Keep the ring aligned to whole samples.
+        self.capacity = capacity - capacity % _SAMPLE_WIDTH
+        self._buffer = bytearray(self.capacity)
+        self._start = 0
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.overruns = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, data: bytes) -> None:
+        view = memoryview(data)
+        if len(view) > self.capacity:
+            self.overruns += len(view) - self.capacity
+            view = view[len(view) - self.capacity :]
+        with self._cond:
+            if self._closed:
+                raise ValueError("write to a closed ring buffer")
+            overflow = self._size + len(view) - self.capacity
+            if overflow > 0:
+                self._start = (self._start + overflow) % self.capacity
+                self._size -= overflow
+                self.overruns += overflow
+            end = (self._start + self._size) % self.capacity
+            first = min(len(view), self.capacity - end)
+            self._buffer[end : end + first] = view[:first]
+            self._buffer[: len(view) - first] = view[first:]
+            self._size += len(view)
+            self._cond.notify_all()
+
+    def read(self, max_bytes: int, timeout: float | None = None) -> bytes:
+        """Return up to ``max_bytes`` of buffered audio, waiting for some to arrive.
+
+        An empty result means the buffer was closed and drained, or ``timeout``
+        expired before any audio was written.
+        """
+
+        max_bytes -= max_bytes % _SAMPLE_WIDTH
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._size or self._closed, timeout):
+                return b""
+            count = min(max_bytes, self._size)
+            first = min(count, self.capacity - self._start)
+            chunk = bytes(self._buffer[self._start : self._start + first])
+            chunk += self._buffer[: count - first]
+            self._start = (self._start + count) % self.capacity
+            self._size -= count
+            return chunk
+
+    def close(self) -> None:
+        """Signal end of stream; readers drain what is left and then stop."""
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.capacity)
+            if not chunk:
+                if self._closed:
+                    return
+                continue
+            yield chunk
+
+
+class WavFileSource:
+    """Replay a mono 16-bit WAV file as a stream of PCM chunks.
+
+    Stands in for a microphone in tests and offline runs. With ``realtime=True``
+    chunks are paced at the rate they would be captured.
+    """
+
+    def __init__(self, path: str | Path, *, chunk_ms: int = 20, realtime: bool = False) -> None:
+        self.path = Path(path)
+        self.chunk_ms = chunk_ms
+        self.realtime = realtime
+        with wave.open(str(self.path), "rb") as wav:
+            if wav.getnchannels() != 1 or wav.getsampwidth() != _SAMPLE_WIDTH:
+                raise ValueError(f"{self.path} must be mono 16-bit PCM")
+            self.sample_rate = wav.getframerate()
+
+    def __iter__(self) -> Iterator[bytes]:
+        frames = max(1, self.sample_rate * self.chunk_ms // 1000)
+        started = time.monotonic()
+        played = 0
+        with wave.open(str(self.path), "rb") as wav:
+            while True:
+                chunk = wav.readframes(frames)
+                if not chunk:
+                    return
+                if self.realtime:
+                    delay = started + played / self.sample_rate - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                played += len(chunk) // _SAMPLE_WIDTH
+                yield chunk
+
+    def replay_into(self, ring: PCMRingBuffer) -> threading.Thread:
+        """Feed the file into ``ring`` from a background thread, closing it at the end."""
+
+        def pump() -> None:
+            try:
+                for chunk in self:
+                    ring.write(chunk)
+            finally:
+                ring.close()
+
+        thread = threading.Thread(target=pump, name="vct-wav-replay", daemon=True)
+        thread.start()
+        return thread
+
+
+class EnergyVAD:
+    """Frame classifier that flags speech by its RMS level in dBFS."""
+
+    def __init__(self, threshold_db: float = -40.0) -> None:
+        self.threshold_db = threshold_db
+        # Compare mean squares directly instead of taking a log per frame.
+        self._threshold_ms = (32768.0 * 10 ** (threshold_db / 20)) ** 2
+
+    def is_speech(self, frame: bytes) -> bool:
+        samples = array("h")
+        samples.frombytes(frame)
+        if not samples:
+            return False
+        return sum(s * s for s in samples) / len(samples) >= self._threshold_ms
+
+    @staticmethod
+    def level_db(frame: bytes) -> float:
+        samples = array("h")
+        samples.frombytes(frame)
+        if not samples:
+            return -math.inf
+        mean_square = sum(s * s for s in samples) / len(samples)
+        return 10 * math.log10(mean_square) - 20 * math.log10(32768.0) if mean_square else -math.inf
+
+
+class StreamingSTT:
+    """Segment a PCM stream into utterances and transcribe them incrementally.
+
+    Audio is cut into ``frame_ms`` frames and classified by the ``vad``. An
+    utterance starts after ``min_speech_ms`` of consecutive speech (the preceding
+    ``preroll_ms`` is kept so word onsets are not clipped) and ends after
+    ``hangover_ms`` of silence or once it reaches ``max_utterance_ms``. While the
+    utterance is open a partial transcript is produced every ``partial_ms``; the
+    final transcript is produced as soon as the end of speech is detected, so
+    downstream latency is measured from the end of the command rather than the
+    end of the recording.
+    """
+
+    def __init__(
+        self,
+        engine: STTEngineBase,
+        *,
+        sample_rate: int = 16000,
+        vad: EnergyVAD | None = None,
+        frame_ms: int = 20,
+        min_speech_ms: int = 100,
+        hangover_ms: int = 300,
+        preroll_ms: int = 200,
+        partial_ms: int | None = 500,
+        max_utterance_ms: int = 10000,
+    ) -> None:
+        if frame_ms <= 0:
+            raise ValueError("frame_ms must be positive")
+        self.engine = engine
+        self.sample_rate = sample_rate
+        self.vad = vad or EnergyVAD()
+        self.frame_ms = frame_ms
+        self._frame_bytes = max(1, sample_rate * frame_ms // 1000) * _SAMPLE_WIDTH
+        self._min_speech = max(1, -(-min_speech_ms // frame_ms))
+        self._hangover = max(1, -(-hangover_ms // frame_ms))
+        self._partial = -(-partial_ms // frame_ms) if partial_ms else 0
+        self._max_frames = max(1, max_utterance_ms // frame_ms)
+        self._preroll: deque[bytes] = deque(
+            maxlen=max(self._min_speech, preroll_ms // frame_ms + self._min_speech)
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop any buffered audio and return to waiting for speech."""
+
+        self._pending = bytearray()
+        self._preroll.clear()
+        self._segment: bytearray | None = None
+        self._segment_start = 0
+        self._segment_frames = 0
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._since_partial = 0
+        self._frames_seen = 0
+
+    @property
+    def in_speech(self) -> bool:
+        return self._segment is not None
+
+    def feed(self, pcm: bytes) -> list[StreamingTranscript]:
+        """Consume a chunk of audio and return any transcripts it completed."""
+
+        self._pending += pcm
+        events: list[StreamingTranscript] = []
+        frame_bytes = self._frame_bytes
+        offset = 0
+        while len(self._pending) - offset >= frame_bytes:
+            frame = bytes(self._pending[offset : offset + frame_bytes])
+            offset += frame_bytes
+            event = self._process(frame)
+            if event is not None:
+                events.append(event)
+        del self._pending[:offset]
+        return events
+
+    def flush(self) -> list[StreamingTranscript]:
+        """Finish the stream, emitting a final transcript for any open utterance."""
+
+        events: list[StreamingTranscript] = []
+        if self._segment is not None:
+            if self._pending:
+                self._segment += self._pending
+            events.append(self._finish())
+        self.reset()
+        return events
+
+    def transcripts(self, chunks: Iterable[bytes]) -> Iterator[StreamingTranscript]:
+        """Yield transcripts while consuming ``chunks`` (a source or ring buffer)."""
+
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.flush()
+
+    def _seconds(self, frames: int) -> float:
+        return frames * self.frame_ms / 1000
+
+    def _process(self, frame: bytes) -> StreamingTranscript | None:
+        self._frames_seen += 1
+        speech = self.vad.is_speech(frame)
+        if self._segment is None:
+            self._preroll.append(frame)
+            self._voiced_run = self._voiced_run + 1 if speech else 0
+            if self._voiced_run < self._min_speech:
+                return None
+            self._segment = bytearray(b"".join(self._preroll))
+            self._segment_frames = len(self._preroll)
+            self._segment_start = self._frames_seen - self._segment_frames
+            self._preroll.clear()
+            self._silent_run = 0
+            self._since_partial = 0
+            return None
+        self._segment += frame
+        self._segment_frames += 1
+        self._silent_run = 0 if speech else self._silent_run + 1
+        if self._silent_run >= self._hangover or self._segment_frames >= self._max_frames:
+            return self._finish()
+        self._since_partial += 1
+        if self._partial and self._since_partial >= self._partial:
+            self._since_partial = 0
+            return self._transcript(final=False)
+        return None
+
+    def _finish(self) -> StreamingTranscript:
+        event = self._transcript(final=True)
+        self._segment = None
+        self._voiced_run = 0
+        return event
+
+    def _transcript(self, *, final: bool) -> StreamingTranscript:
+        assert self._segment is not None
+        audio = bytes(self._segment)
+        if final and self._silent_run:
+            # The hangover is trailing silence; do not make the engine decode it.
+            audio = audio[: len(audio) - self._silent_run * self._frame_bytes]
+        text = self.engine.transcribe_pcm(audio, self.sample_rate)
+        start = self._seconds(self._segment_start)
+        return StreamingTranscript(
+            text=text,
+            final=final,
+            start=start,
+            end=start + len(audio) / (self.sample_rate * _SAMPLE_WIDTH),
+        )
+
+
+__all__ = [
+    "EnergyVAD",
+    "PCMRingBuffer",
+    "StreamingSTT",
+    "StreamingTranscript",
+    "WavFileSource",
+]
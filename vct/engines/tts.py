@@ -3,12 +3,20 @@ from __future__ import annotations
 import importlib
 import logging
 import os
+import struct
 import tempfile
+import threading
+from collections import deque
+from collections.abc import Iterable
 from contextlib import suppress
+from dataclasses import dataclass
 from pathlib import Path
 from types import ModuleType
 from typing import Any, cast
 
+from ..utils.metrics import record_tts_cache_lookup, record_tts_queue_event
+from .audio_cache import AudioCache, audio_cache_key
+
 log = logging.getLogger(__name__)
 
 
@@ -55,10 +63,103 @@ class Pyttsx3TTS(TTSEngineBase):
         self.engine.runAndWait()
 
 
+@dataclass(frozen=True)
+class _WavFormat:
+    channels: int
+    sample_width: int
+    sample_rate: int
+    data_offset: int
+    data_size: int | None  # ``None`` when the stream does not announce its length
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+
+def _parse_wav_header(buffer: bytes | bytearray) -> _WavFormat | None:
+    """Parse a RIFF/WAVE header, returning ``None`` until enough bytes have arrived."""
+
+    if len(buffer) < 12:
+        return None
+    if buffer[0:4] != b"RIFF" or buffer[8:12] != b"WAVE":
+        raise ValueError("Audio payload is not a RIFF/WAVE stream")
+    fmt: tuple[int, int, int] | None = None
+    pos = 12
+    while len(buffer) >= pos + 8:
+        chunk_id, size = struct.unpack_from("<4sI", buffer, pos)
+        if chunk_id == b"fmt ":
+            if len(buffer) < pos + 24:
+                return None
+            _, channels, rate, _, _, bits = struct.unpack_from("<HHIIHH", buffer, pos + 8)
+            fmt = (channels, bits // 8, rate)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAVE stream has no fmt chunk before its data")
+            channels, width, rate = fmt
+            # Streaming encoders often leave the size as 0 or 0xFFFFFFFF.
+            data_size = size if 0 < size < 0xFFFFFFFF else None
+            return _WavFormat(channels, width, rate, pos + 8, data_size)
+        pos += 8 + size + (size & 1)
+    return None
+
+
+class _StreamingPlayback:
+    """Feed PCM into ``simpleaudio`` while the rest of the clip is still arriving.
+
+    The first frames start playing immediately; later frames accumulate while the
+    current segment plays and are submitted as one buffer once it finishes.
+    """
+
+    def __init__(self, player: ModuleType, fmt: _WavFormat) -> None:
+        self._player = player
+        self._fmt = fmt
+        self._remaining = fmt.data_size
+        self._pending = bytearray()
+        self._segment = bytearray()
+        self._current: Any | None = None
+
+    def feed(self, data: bytes | memoryview) -> None:
+        if self._remaining is not None:
+            data = data[: self._remaining]
+            self._remaining -= len(data)
+        self._pending += data
+        if self._current is None or not self._current.is_playing():
+            self._submit()
+
+    def _submit(self) -> None:
+        usable = len(self._pending) - len(self._pending) % self._fmt.frame_size
+        if not usable:
+            return
+        # Hand the accumulated buffer over as is and start a fresh one with the
+        # partial trailing frame, instead of copying the segment out of it.
+        segment = self._pending
+        self._pending = bytearray(memoryview(segment)[usable:])
+        del segment[usable:]
+        if self._current is not None:
+            self._current.wait_done()
+        self._current = self._player.play_buffer(
+            segment, self._fmt.channels, self._fmt.sample_width, self._fmt.sample_rate
+        )
+        # Keep the segment alive for as long as the device may read from it.
+        self._segment = segment
+
+    @property
+    def started(self) -> bool:
+        """Whether any part of the clip has been handed to the audio device."""
+
+        return self._current is not None
+
+    def finish(self) -> None:
+        self._submit()
+        if self._current is not None:
+            self._current.wait_done()
+
+
 class OpenAITTS(TTSEngineBase):
     """Cloud TTS that uses the OpenAI speech synthesis API for realistic voices."""
 
     api_url = "https://api.openai.com/v1/audio/speech"
+    stream_chunk_size = 4096
 
     def __init__(
         self,
@@ -67,12 +168,14 @@ class OpenAITTS(TTSEngineBase):
         model: str | None = None,
         language: str | None = None,
         playback: bool = True,
+        cache: AudioCache | None = None,
     ) -> None:
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.voice = voice or os.getenv("OPENAI_TTS_VOICE") or "alloy"
         self.model = model or os.getenv("OPENAI_TTS_MODEL", "gpt-4o-mini-tts")
         self.language = language or os.getenv("OPENAI_TTS_LANGUAGE")
         self.playback = playback
+        self.cache = cache or AudioCache(os.getenv("VCT_TTS_CACHE_DIR"))
         self._fallback = PrintTTS()
         self._session: Any | None = None
         try:  # pragma: no cover - executed in runtime environments with network access
@@ -113,16 +216,23 @@ class OpenAITTS(TTSEngineBase):
         if not self.api_key or self._session is None:
             self._fallback.speak(text, voice=voice)
             return
+        voice_name = voice or self.voice
+        lang = language or self.language
+        key = audio_cache_key(self.model or "", voice_name, lang, text)
+        cached = self.cache.get(key)
+        record_tts_cache_lookup(cached is not None)
+        if cached is not None:
+            self._play_audio(cached, voice_name)
+            return
         payload = {
             "model": self.model,
-            "voice": voice or self.voice,
+            "voice": voice_name,
             "input": text,
             "format": "wav",
         }
-        lang = language or self.language
         if lang:
             payload["language"] = lang
-        try:  # pragma: no cover - network calls not executed in tests
+        try:
             response = self._session.post(
                 self.api_url,
                 headers={
@@ -131,9 +241,16 @@ class OpenAITTS(TTSEngineBase):
                 },
                 json=payload,
                 timeout=30,
+                stream=True,
             )
-            response.raise_for_status()
-            audio_bytes = response.content
+            try:
+                response.raise_for_status()
+                audio_bytes = self._stream_audio(
+                    response.iter_content(chunk_size=self.stream_chunk_size), voice_name
+                )
+            finally:
+                with suppress(Exception):
+                    response.close()
         except Exception as exc:
             log.warning("OpenAI TTS unavailable (%s); falling back to console output", exc)
             self._fallback.speak(text, voice=voice)
@@ -141,21 +258,83 @@ class OpenAITTS(TTSEngineBase):
         if not audio_bytes:
             self._fallback.speak(text, voice=voice)
             return
-        self._play_audio(audio_bytes, voice or self.voice)
+        self.cache.put(key, audio_bytes)
+
+    def _stream_audio(self, chunks: Iterable[bytes], voice: str) -> bytes:
+        """Play the response while it downloads and return the complete clip."""
+
+        received: list[bytes] = []
+        header = bytearray()
+        playback: _StreamingPlayback | None = None
+        can_stream = self.playback and self._player is not None
+        interrupted = False
+        for chunk in chunks:
+            if not chunk:
+                continue
+            received.append(chunk)
+            if not can_stream:
+                continue
+            try:
+                if playback is None:
+                    header += chunk
+                    fmt = _parse_wav_header(header)
+                    if fmt is None:
+                        continue
+                    assert self._player is not None
+                    playback = _StreamingPlayback(self._player, fmt)
+                    playback.feed(bytes(header[fmt.data_offset :]))
+                else:
+                    playback.feed(chunk)
+            except Exception as exc:
+                interrupted = self._streaming_failed(playback, exc)
+                can_stream = False
+                playback = None
+        audio_bytes = b"".join(received)
+        if playback is not None:
+            try:
+                playback.finish()
+                return audio_bytes
+            except Exception as exc:
+                interrupted = self._streaming_failed(playback, exc)
+        if not interrupted:
+            self._play_audio(audio_bytes, voice)
+        return audio_bytes
+
+    @staticmethod
+    def _streaming_failed(playback: _StreamingPlayback | None, exc: Exception) -> bool:
+        """Log a streaming failure; return ``True`` if part of the clip was already heard.
+
+        Replaying a clip whose beginning has been played would repeat it, so the
+        download-then-play fallback is only used when nothing was played yet.
+        """
+
+        if playback is not None and playback.started:
+            log.warning("Streaming playback failed mid-clip (%s); skipping the rest", exc)
+            return True
+        log.warning("Streaming playback failed (%s); playing after download", exc)
+        return False
 
     def _play_audio(self, audio_bytes: bytes, voice: str) -> None:
         if not audio_bytes:
             return
-        tmp_path = self._persist_audio(audio_bytes)
         if self.playback and self._player is not None:
-            try:  # pragma: no cover - depends on host audio stack
-                wave = self._player.WaveObject.from_wave_file(str(tmp_path))
-                play_obj = wave.play()
+            try:
+                fmt = _parse_wav_header(audio_bytes)
+                if fmt is None:
+                    raise ValueError("incomplete WAVE header")
+                end = len(audio_bytes)
+                if fmt.data_size is not None:
+                    end = min(end, fmt.data_offset + fmt.data_size)
+                end -= (end - fmt.data_offset) % fmt.frame_size
+                pcm = memoryview(audio_bytes)[fmt.data_offset : end]
+                play_obj = self._player.play_buffer(
+                    pcm, fmt.channels, fmt.sample_width, fmt.sample_rate
+                )
                 play_obj.wait_done()
-                tmp_path.unlink(missing_ok=True)
                 return
             except Exception as exc:
                 log.warning("Audio playback failed (%s); keeping synthesized file", exc)
+        tmp_path = self._persist_audio(audio_bytes)
         print(f"[{voice}] Аудіо збережено у {tmp_path}")
 
     @staticmethod
@@ -164,3 +343,97 @@ class OpenAITTS(TTSEngineBase):
         with os.fdopen(fd, "wb") as fh:
             fh.write(audio_bytes)
         return Path(path)
+
+
+TTS_OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "block")
+
+
+class QueuedTTS(TTSEngineBase):
+    """Speak through another engine on a dedicated worker thread.
+
+    :meth:`speak` only enqueues the phrase, so callers no longer wait for speech to
+    finish. The queue is bounded and ``overflow`` decides what happens when it is
+    full:
+
+    * ``drop_oldest`` discards the oldest pending phrase;
+    * ``coalesce`` skips phrases identical to one already pending and otherwise
+      behaves like ``drop_oldest``;
+    * ``block`` waits for the worker to free a slot.
+    """
+
+    def __init__(
+        self,
+        engine: TTSEngineBase,
+        maxsize: int = 8,
+        overflow: str = "drop_oldest",
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if overflow not in TTS_OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unsupported TTS overflow policy: {overflow!r} "
+                f"(expected one of: {', '.join(TTS_OVERFLOW_POLICIES)})"
+            )
+        self.engine = engine
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._pending: deque[tuple[str, str | None, str | None]] = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="vct-tts", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def speak(self, text: str, *, voice: str | None = None, language: str | None = None) -> None:
+        item = (text, voice, language)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("QueuedTTS is closed")
+            if self.overflow == "coalesce" and item in self._pending:
+                record_tts_queue_event("coalesced")
+                return
+            if self.overflow == "block":
+                self._cond.wait_for(lambda: len(self._pending) < self.maxsize or self._closed)
+                if self._closed:
+                    raise RuntimeError("QueuedTTS is closed")
+            elif len(self._pending) >= self.maxsize:
+                dropped = self._pending.popleft()
+                record_tts_queue_event("dropped")
+                log.debug("TTS queue full; dropped %r", dropped[0])
+            self._pending.append(item)
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                text, voice, language = self._pending.popleft()
+                self._busy = True
+                self._cond.notify_all()
+            try:
+                self.engine.speak(text, voice=voice, language=language)
+            except Exception:
+                log.exception("Queued TTS engine failed to speak %r", text)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued phrase has been spoken."""
+
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Speak the remaining phrases and stop the worker thread."""
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import time
 
+from ..utils.clock import SYSTEM_CLOCK, Clock
+
 
 class RewardActuatorBase:
     """Base class describing a reward actuator."""
@@ -13,11 +15,18 @@ class RewardActuatorBase:
 
 
 class SimulatedActuator(RewardActuatorBase):
-    """Actuator that merely logs the reward trigger for simulations."""
+    """Actuator that merely logs the reward trigger for simulations.
+
+    The short pause that stands in for the dispenser goes through ``clock``, so
+    with a :class:`~vct.utils.clock.VirtualClock` it takes no real time.
+    """
+
+    def __init__(self, clock: Clock = SYSTEM_CLOCK) -> None:
+        self.clock = clock
 
     def trigger(self, seconds: float = 0.5) -> None:
         print(f"[REWARD] Simulated dispenser {seconds:.2f}s")
-        time.sleep(min(seconds, 0.05))
+        self.clock.sleep(min(seconds, 0.05))
 
 
 class GPIOActuator(RewardActuatorBase):
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
-import time
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
 from typing import Any
 
 from ..behavior.policy import BehaviorInputs, BehaviorPolicy
 from ..configuration import RoboDogSettings
+from ..engines.kws import KeywordSpottingSTT
 from ..engines.stt import RuleBasedSTT, STTEngineBase, WhisperSTT
-from ..engines.tts import OpenAITTS, PrintTTS, Pyttsx3TTS, TTSEngineBase
+from ..engines.stt_cache import CachedSTT
+from ..engines.stt_stream import StreamingSTT
+from ..engines.tts import OpenAITTS, PrintTTS, Pyttsx3TTS, QueuedTTS, TTSEngineBase
 from ..ethics.guard import EthicsGuard
 from ..hardware.gpio_reward import GPIOActuator, RewardActuatorBase, SimulatedActuator
+from ..utils.clock import SYSTEM_CLOCK, Clock
 from ..utils.logging import get_logger
-from ..utils.metrics import record_reward
+from ..utils.metrics import observe_stage_latency, record_reward, record_startup_duration
+from .effects import BackgroundEffects
+from .phrase_matcher import PhraseMatcher
 
 log = get_logger("RoboDogBrain")
 
@@ -19,54 +28,182 @@ def _clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
     return max(low, min(high, value))
 
 
+@dataclass(frozen=True)
+class Command:
+    """One text command with the context that :meth:`RoboDogBrain.handle_command` takes."""
+
+    text: str
+    confidence: float = 0.85
+    reward_bias: float = 0.5
+    mood: float = 0.0
+    fatigue: float | None = None
+
+
 class RoboDogBrain:
-    def __init__(self, cfg_path: str, gpio_pin: int | None = None, simulate: bool = False):
-        self.settings = RoboDogSettings.load(cfg_path)
-        self.cfg = self.settings.model_dump()
-        try:
-            self.stt: STTEngineBase = WhisperSTT()
-        except RuntimeError as exc:
-            log.warning("Whisper STT unavailable (%s), falling back to rule-based engine", exc)
-            self.stt = RuleBasedSTT()
-        if simulate:
-            self.tts: TTSEngineBase = PrintTTS()
-        elif OpenAITTS.is_configured():
-            self.tts = OpenAITTS()
-        else:
-            self.tts = Pyttsx3TTS()
-        self.policy = BehaviorPolicy(self.settings.policy_config)
+    def __init__(
+        self,
+        cfg_path: str,
+        gpio_pin: int | None = None,
+        simulate: bool = False,
+        policy_shm: str | None = None,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
+        self.clock = clock
+        self.startup_timings: dict[str, float] = {}
+        with self._startup("config"):
+            self.settings = RoboDogSettings.load(cfg_path)
+            self.cfg = self.settings.model_dump()
+            self._matcher = PhraseMatcher(self.settings.commands_map)
+        with self._startup("stt"):
+            try:
+                self.stt: STTEngineBase = self._with_stt_cache(self._build_stt())
+                if self.settings.stt_warmup:
+                    self.stt.warmup()
+            except RuntimeError as exc:
+                log.warning("STT engine unavailable (%s), falling back to rule-based engine", exc)
+                self.stt = self._with_stt_cache(RuleBasedSTT())
+        with self._startup("tts"):
+            if simulate:
+                self.tts: TTSEngineBase = PrintTTS()
+            elif OpenAITTS.is_configured():
+                self.tts = OpenAITTS()
+            else:
+                self.tts = Pyttsx3TTS()
+            if self.settings.tts_queue_size:
+                self.tts = QueuedTTS(
+                    self.tts,
+                    maxsize=self.settings.tts_queue_size,
+                    overflow=self.settings.tts_overflow,
+                )
+        with self._startup("policy"):
+            self.policy = BehaviorPolicy(self.settings.policy_config, shared_memory=policy_shm)
         self.environment_context: dict[str, float] = self.settings.environment_context
         self.reward_map: dict[str, bool] = self.settings.reward_triggers
         self.cooldown_s = float(self.settings.reward_cooldown_s)
         self.simulate = simulate
         self.actuator: RewardActuatorBase
-        if simulate or gpio_pin is None:
-            self.actuator = SimulatedActuator()
-        else:
-            self.actuator = GPIOActuator(gpio_pin)
+        with self._startup("actuator"):
+            if simulate or gpio_pin is None:
+                self.actuator = SimulatedActuator(clock)
+            else:
+                self.actuator = GPIOActuator(gpio_pin)
         self.guard = EthicsGuard()
         self._last_reward_ts = 0.0
+        self.effects = BackgroundEffects(speak=self._speak, dispense=self._dispense)
+
+    def reconfigure(
+        self, settings: RoboDogSettings, *, policy: BehaviorPolicy | None = None
+    ) -> None:
+        """Apply new decision settings in place and forget past rewards.
+
+        Speech engines and the actuator are kept, so simulations can reuse one
+        brain across many configurations. The policy is rebuilt only when its
+        configuration changed, unless a prepared ``policy`` is passed.
+        """
+
+        if policy is not None:
+            self.policy = policy
+        elif settings.policy_config != self.settings.policy_config:
+            self.policy = BehaviorPolicy(settings.policy_config)
+        if settings.commands_map != self.settings.commands_map:
+            self._matcher = PhraseMatcher(settings.commands_map)
+        self.settings = settings
+        self.cfg = settings.model_dump()
+        self.environment_context = settings.environment_context
+        self.reward_map = settings.reward_triggers
+        self.cooldown_s = float(settings.reward_cooldown_s)
+        self.guard = EthicsGuard()
+        self._last_reward_ts = 0.0
+
+    def set_clock(self, clock: Clock) -> None:
+        """Move reward timing and the simulated actuator onto ``clock``.
+
+        Past reward timestamps belong to the previous clock, so cooldowns start over.
+        """
+
+        self.clock = clock
+        if isinstance(self.actuator, SimulatedActuator):
+            self.actuator.clock = clock
+        self.guard = EthicsGuard()
+        self._last_reward_ts = 0.0
+
+    @contextmanager
+    def _startup(self, component: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            self.startup_timings[component] = elapsed
+            record_startup_duration(component, elapsed)
+
+    def _build_stt(self) -> STTEngineBase:
+        whisper = WhisperSTT()
+        if not self.settings.stt_keyword_manifest:
+            return whisper
+        try:
+            return KeywordSpottingSTT.from_manifest(
+                self.settings.stt_keyword_manifest,
+                fallback=whisper,
+                min_confidence=self.settings.stt_keyword_min_confidence,
+            )
+        except (OSError, ValueError, RuntimeError) as exc:
+            log.warning("Keyword spotting unavailable (%s); using Whisper directly", exc)
+            return whisper
+
+    def _with_stt_cache(self, engine: STTEngineBase) -> STTEngineBase:
+        if not self.settings.stt_cache_path:
+            return engine
+        return CachedSTT(engine, self.settings.stt_cache_path)
 
     def _action_from_text(self, text: str) -> str:
-        m = self.settings.commands_map
-        n = text.strip().lower().replace(" ", "")
-        for k, v in m.items():
-            if k.replace(" ", "") in n:
-                return v
-        return "NONE"
+        return self._matcher.match(text)
+
+    def _claim_reward(self, action: str, score: float) -> bool:
+        """Apply the reward rules and record the reward without actuating."""
 
-    def _maybe_reward(self, action: str, score: float) -> bool:
         if not self.reward_map.get(action, False):
             return False
-        now = time.time()
+        now = self.clock.time()
         if not self.guard.can_reward(now, action, score, self.cooldown_s):
             return False
-        self.actuator.trigger(0.4)
         self.guard.note_reward(now)
         self._last_reward_ts = now
         return True
 
-    def handle_command(
+    def _dispense(self) -> None:
+        start = perf_counter()
+        self.actuator.trigger(0.4)
+        observe_stage_latency("reward", perf_counter() - start)
+
+    def _speak(self, text: str) -> None:
+        start = perf_counter()
+        self.tts.speak(text)
+        observe_stage_latency("tts", perf_counter() - start)
+
+    def _maybe_reward(self, action: str, score: float) -> bool:
+        if not self._claim_reward(action, score):
+            return False
+        self._dispense()
+        return True
+
+    def _decide(
+        self,
+        text: str,
+        confidence: float,
+        reward_bias: float,
+        mood: float,
+        fatigue: float | None,
+    ) -> tuple[dict[str, Any], str]:
+        """Score the command and settle the reward; return the result and feedback."""
+
+        start = perf_counter()
+        result = self.decide(text, confidence, reward_bias, mood, fatigue)
+        feedback = self._feedback_text(result["action"], result["score"], result["rewarded"])
+        observe_stage_latency("decide", perf_counter() - start)
+        return result, feedback
+
+    def decide(
         self,
         text: str,
         confidence: float = 0.85,
@@ -74,8 +211,30 @@ class RoboDogBrain:
         mood: float = 0.0,
         fatigue: float | None = None,
     ) -> dict[str, Any]:
+        """Return the decision for a command without any side effects.
+
+        This is the headless path used by simulations: the command is scored and
+        the reward rules are applied (so cooldowns still hold), but nothing is
+        spoken, logged, dispensed or exported as a metric.
+        """
+
         action = self._action_from_text(text)
-        now = time.time()
+        inputs = self._behavior_inputs(
+            action, confidence, reward_bias, mood, fatigue, self.clock.time()
+        )
+        vec = self.policy.decide(action, inputs)
+        rewarded = self._claim_reward(vec.action, vec.score)
+        return {"action": vec.action, "score": vec.score, "rewarded": rewarded}
+
+    def _behavior_inputs(
+        self,
+        action: str,
+        confidence: float,
+        reward_bias: float,
+        mood: float,
+        fatigue: float | None,
+        now: float,
+    ) -> BehaviorInputs:
         time_since_reward = now - self._last_reward_ts if self._last_reward_ts else self.cooldown_s
         if fatigue is None:
             fatigue_value = _clamp(time_since_reward / max(self.cooldown_s * 2.0, 1.0))
@@ -84,7 +243,7 @@ class RoboDogBrain:
         stress = _clamp(1.0 - confidence)
         env_complexity = _clamp(float(self.environment_context.get("complexity", 0.5)))
         social_engagement = _clamp(float(self.environment_context.get("social_engagement", 0.5)))
-        inputs = BehaviorInputs(
+        return BehaviorInputs(
             stimulus=1.0 if action != "NONE" else 0.0,
             confidence=confidence,
             reward_bias=reward_bias,
@@ -94,24 +253,142 @@ class RoboDogBrain:
             environmental_complexity=env_complexity,
             social_engagement=social_engagement,
         )
-        vec = self.policy.decide(action, inputs)
-        rewarded = self._maybe_reward(vec.action, vec.score)
-        feedback = f"Дія: {vec.action} score={vec.score:.2f}" + (
-            " — ✅ винагорода" if rewarded else ""
-        )
-        self.tts.speak(feedback)
+
+    def _decide_batch(self, commands: Sequence[Command]) -> Iterator[tuple[dict[str, Any], str]]:
+        """Score ``commands`` with batched policy passes and yield decisions in order.
+
+        A granted reward changes the fatigue input of every later command, so the
+        remainder of the batch is rescored after each one: that is one policy pass
+        per reward plus one, and results match handling the commands one by one.
+        Rewards are claimed only as decisions are consumed, so a caller that stops
+        early never claims rewards for commands it did not get to.
+        """
+
+        actions = [self._action_from_text(command.text) for command in commands]
+        decided = 0
+        scoring = 0.0
+        try:
+            while decided < len(commands):
+                start = perf_counter()
+                now = self.clock.time()
+                inputs = [
+                    self._behavior_inputs(
+                        actions[i], c.confidence, c.reward_bias, c.mood, c.fatigue, now
+                    )
+                    for i, c in enumerate(commands[decided:], start=decided)
+                ]
+                vectors = self.policy.decide_many(actions[decided:], inputs)
+                scoring += perf_counter() - start
+                for vec in vectors:
+                    rewarded = self._claim_reward(vec.action, vec.score)
+                    decided += 1
+                    result = {"action": vec.action, "score": vec.score, "rewarded": rewarded}
+                    yield result, self._feedback_text(vec.action, vec.score, rewarded)
+                    if rewarded:
+                        break
+        finally:
+            observe_stage_latency("decide_batch", scoring)
+
+    def _feedback_text(self, action: str, score: float, rewarded: bool) -> str:
+        # Rounding the spoken score to ``tts_score_step`` keeps the set of phrases
+        # small, so synthesized audio is mostly served from the TTS cache.
+        step = self.settings.tts_score_step
+        if step:
+            score = round(score / step) * step
+        return f"Дія: {action} score={score:.2f}" + (" — ✅ винагорода" if rewarded else "")
+
+    def handle_command(
+        self,
+        text: str,
+        confidence: float = 0.85,
+        reward_bias: float = 0.5,
+        mood: float = 0.0,
+        fatigue: float | None = None,
+    ) -> dict[str, Any]:
+        result, feedback = self._decide(text, confidence, reward_bias, mood, fatigue)
+        if result["rewarded"]:
+            self._dispense()
+        self._speak(feedback)
         log.info(feedback)
-        record_reward(vec.action, rewarded)
-        return {"action": vec.action, "score": vec.score, "rewarded": rewarded}
+        record_reward(result["action"], result["rewarded"])
+        return result
+
+    async def handle_command_async(
+        self,
+        text: str,
+        confidence: float = 0.85,
+        reward_bias: float = 0.5,
+        mood: float = 0.0,
+        fatigue: float | None = None,
+    ) -> dict[str, Any]:
+        """Return the decision as soon as it is scored.
+
+        Reward actuation and spoken feedback are handed to :attr:`effects`, whose
+        worker tasks run them in the background on the current event loop.
+        """
+
+        result, feedback = self._decide(text, confidence, reward_bias, mood, fatigue)
+        await self.effects.submit(feedback, rewarded=result["rewarded"])
+        log.info(feedback)
+        record_reward(result["action"], result["rewarded"])
+        return result
+
+    async def handle_batch_async(
+        self, commands: Sequence[Command], *, speak: bool = True
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Decide a batch of commands at once and yield the results in order.
+
+        Commands are scored in batched passes by :meth:`_decide_batch`; each reward
+        is claimed and queued on :attr:`effects` just before its result is yielded,
+        so an aborted stream leaves later commands unrewarded. With ``speak=False``
+        no feedback phrases are synthesized for the batch.
+        """
+
+        for result, feedback in self._decide_batch(commands):
+            await self.effects.submit(feedback if speak else None, rewarded=result["rewarded"])
+            log.info(feedback)
+            record_reward(result["action"], result["rewarded"])
+            yield result
+
+    async def aclose(self) -> None:
+        """Flush pending background side effects."""
+
+        await self.effects.aclose()
 
     def run_once_from_wav(self, wav_path: str) -> dict[str, Any]:
         try:
             text = self.stt.transcribe(wav_path=wav_path)
         except RuntimeError as exc:
             log.warning("STT engine failed (%s); switching to rule-based fallback", exc)
-            self.stt = RuleBasedSTT()
+            self.stt = self._with_stt_cache(RuleBasedSTT())
             text = self.stt.transcribe(wav_path=wav_path)
         if not text:
             self.tts.speak("Команду не розпізнано")
             return {"action": "NONE", "score": 0.0, "rewarded": False}
         return self.handle_command(text)
+
+    def run_stream(
+        self,
+        chunks: Iterable[bytes],
+        sample_rate: int = 16000,
+        on_partial: Callable[[str], None] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Act on each utterance of a live PCM stream as soon as it is finished.
+
+        ``chunks`` is any iterable of mono 16-bit PCM, e.g. a
+        :class:`~vct.engines.stt_stream.PCMRingBuffer` fed by a microphone or a
+        :class:`~vct.engines.stt_stream.WavFileSource`. Partial transcripts are only
+        decoded when ``on_partial`` is given, so by default each utterance costs a
+        single decode; silent or unrecognised utterances are skipped.
+        """
+
+        stream = StreamingSTT(
+            self.stt, sample_rate=sample_rate, partial_ms=500 if on_partial else None
+        )
+        for transcript in stream.transcripts(chunks):
+            if not transcript.final:
+                if on_partial is not None:
+                    on_partial(transcript.text)
+                continue
+            if transcript.text:
+                yield self.handle_command(transcript.text)
@@ -0,0 +1,114 @@
+"""Asyncio background workers for the slow side effects of a command."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from ..utils.logging import get_logger
+from ..utils.metrics import observe_stage_latency, record_background_drop
+
+log = get_logger("RoboDogEffects")
+
+
+class BackgroundEffects:
+    """Run speech and reward actuation off the request path.
+
+    Each side effect has its own bounded :class:`asyncio.Queue` drained by a worker
+    task that executes the blocking call in a thread. Feedback phrases are dropped
+    when the speech queue is full, since a stale phrase is worthless. Rewards are
+    never dropped: producers wait for a free slot instead, which the reward
+    cooldown keeps rare.
+
+    Time spent waiting in each queue is exported as the ``tts_queue`` and
+    ``reward_queue`` pipeline stages. Workers are bound to the event loop that first
+    submits work and are restarted transparently if a different loop is used later.
+    """
+
+    def __init__(
+        self,
+        speak: Callable[[str], None],
+        dispense: Callable[[], None],
+        *,
+        tts_queue_size: int = 8,
+        reward_queue_size: int = 4,
+    ) -> None:
+        self._speak = speak
+        self._dispense = dispense
+        self._tts_queue_size = tts_queue_size
+        self._reward_queue_size = reward_queue_size
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tts_queue: asyncio.Queue[tuple[float, str]] | None = None
+        self._reward_queue: asyncio.Queue[tuple[float, None]] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+
+    def _ensure_started(
+        self,
+    ) -> tuple[asyncio.Queue[tuple[float, str]], asyncio.Queue[tuple[float, None]]]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._tts_queue is None or self._reward_queue is None:
+            self._loop = loop
+            self._tts_queue = asyncio.Queue(maxsize=self._tts_queue_size)
+            self._reward_queue = asyncio.Queue(maxsize=self._reward_queue_size)
+            self._workers = [
+                loop.create_task(self._drain(self._reward_queue, "reward", self._run_reward)),
+                loop.create_task(self._drain(self._tts_queue, "tts", self._speak)),
+            ]
+        return self._tts_queue, self._reward_queue
+
+    def _run_reward(self, _: None) -> None:
+        self._dispense()
+
+    async def _drain(
+        self, queue: asyncio.Queue[Any], stage: str, func: Callable[[Any], None]
+    ) -> None:
+        while True:
+            enqueued_at, item = await queue.get()
+            observe_stage_latency(f"{stage}_queue", perf_counter() - enqueued_at)
+            try:
+                await asyncio.to_thread(func, item)
+            except Exception:
+                log.exception("Background %s stage failed", stage)
+            finally:
+                queue.task_done()
+
+    async def submit(self, feedback: str | None, *, rewarded: bool) -> None:
+        """Queue the reward (if any) and the spoken feedback (if any) for a decision."""
+
+        tts_queue, reward_queue = self._ensure_started()
+        if rewarded:
+            await reward_queue.put((perf_counter(), None))
+        if feedback is None:
+            return
+        try:
+            tts_queue.put_nowait((perf_counter(), feedback))
+        except asyncio.QueueFull:
+            record_background_drop("tts")
+            log.warning("TTS queue full; dropping feedback %r", feedback)
+
+    async def join(self) -> None:
+        """Wait until every queued side effect has been executed."""
+
+        if self._loop is not asyncio.get_running_loop():
+            return
+        for queue in (self._reward_queue, self._tts_queue):
+            if queue is not None:
+                await queue.join()
+
+    async def aclose(self) -> None:
+        """Finish pending side effects and stop the worker tasks."""
+
+        if self._loop is asyncio.get_running_loop():
+            await self.join()
+            for task in self._workers:
+                task.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+        self._tts_queue = None
+        self._reward_queue = None
+
+
+__all__ = ["BackgroundEffects"]
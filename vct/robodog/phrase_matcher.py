@@ -0,0 +1,94 @@
+"""Aho-Corasick matcher that maps recognised text to RoboDog actions."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+
+
+class PhraseMatcher:
+    """Find the command phrase contained in a transcript in a single pass.
+
+    Phrases are compared with spaces removed and in lower case, mirroring how
+    transcripts are normalised. When several phrases occur in the same text the
+    longest one wins; ties go to the earliest occurrence and then to the phrase that
+    appears first in the mapping.
+    """
+
+    def __init__(self, phrases: Mapping[str, str], default: str = "NONE") -> None:
+        self.default = default
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Best phrase ending at each node as (length, insertion order, action).
+        self._best: list[tuple[int, int, str] | None] = [None]
+        self._size = 0
+        for order, (phrase, action) in enumerate(phrases.items()):
+            self._insert(self.normalize(phrase), order, action)
+        self._link()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return text.strip().lower().replace(" ", "")
+
+    def _insert(self, pattern: str, order: int, action: str) -> None:
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            node = nxt
+        if self._best[node] is None:
+            self._best[node] = (len(pattern), order, action)
+            self._size += 1
+
+    def _link(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # A phrase ending exactly at ``child`` is always longer than any
+                # phrase reachable through its suffix link.
+                if self._best[child] is None:
+                    self._best[child] = self._best[self._fail[child]]
+                queue.append(child)
+
+    def match(self, text: str) -> str:
+        """Return the action for the best phrase found in ``text``."""
+
+        goto = self._goto
+        fail = self._fail
+        best = self._best
+        node = 0
+        winner: tuple[int, int, int] | None = None
+        winner_action = self.default
+        for end, char in enumerate(self.normalize(text)):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            found = best[node]
+            if found is None:
+                continue
+            length, order, action = found
+            # Rank by longest phrase, then earliest start, then mapping order.
+            rank = (-length, end - length, order)
+            if winner is None or rank < winner:
+                winner = rank
+                winner_action = action
+        return winner_action
+
+
+__all__ = ["PhraseMatcher"]
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import random
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+from ..utils.clock import VirtualClock
+from .sinks import SimulationSink, step_record
+
 if TYPE_CHECKING:  # pragma: no cover - only for type checking
     from ..robodog.dog_bot_brain import RoboDogBrain
 
@@ -32,11 +35,27 @@ class EnvState:
 
 
 class DogEnv:
-    """Environment that can interact with :class:`RoboDogBrain` in a loop."""
+    """Environment that can interact with :class:`RoboDogBrain` in a loop.
+
+    The environment keeps simulated time in :attr:`clock`, a
+    :class:`~vct.utils.clock.VirtualClock` that advances by ``command_interval_s``
+    after every brain step. Brains run on that clock: one built with another clock
+    is switched over with :meth:`RoboDogBrain.set_clock` on its first step here.
+    Reward cooldowns and actuator pauses then pass in simulated time, so episodes
+    run as fast as the CPU allows and are deterministic for a given seed.
+    """
 
-    def __init__(self, seed: int = 42):
+    def __init__(
+        self,
+        seed: int = 42,
+        *,
+        clock: VirtualClock | None = None,
+        command_interval_s: float = 1.0,
+    ):
         self._rng = random.Random(seed)
         self.s = EnvState()
+        self.clock = clock if clock is not None else VirtualClock()
+        self.command_interval_s = command_interval_s
 
     # ------------------------------------------------------------------
     # Environment dynamics helpers
@@ -89,6 +108,7 @@ class DogEnv:
         *,
         confidence: float = 0.85,
         reward_bias: float = 0.5,
+        headless: bool = False,
     ) -> dict[str, Any]:
         """Execute a closed-loop interaction between the environment and brain.
 
@@ -96,10 +116,16 @@ class DogEnv:
         reason about the dog's mood and fatigue before selecting an action.
         Afterwards the action/score are fed back into the environment dynamics
         and the new state is returned alongside the brain's response.
+
+        With ``headless=True`` the brain only decides (:meth:`RoboDogBrain.decide`):
+        no speech, logging, metrics or reward actuation.
         """
 
+        if brain.clock is not self.clock:
+            brain.set_clock(self.clock)
         current_state = self.observe()
-        brain_out = brain.handle_command(
+        handle = brain.decide if headless else brain.handle_command
+        brain_out = handle(
             command,
             confidence=confidence,
             reward_bias=reward_bias,
@@ -107,33 +133,69 @@ class DogEnv:
             fatigue=current_state["fatigue"],
         )
         env_out = self.step(brain_out["action"], float(brain_out["score"]))
+        self.clock.advance(self.command_interval_s)
         return {"brain": brain_out, "state": env_out}
 
-    def simulate_commands(
+    def iter_commands(
         self,
         brain: RoboDogBrain,
-        commands: Sequence[str],
+        commands: Iterable[str],
         *,
         confidence: float = 0.85,
         reward_bias: float = 0.5,
-    ) -> dict[str, Any]:
-        """Run a batch of commands through the closed-loop simulator."""
+        headless: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield the outcome of each command as soon as it has been simulated.
+
+        ``commands`` may be any iterable, including an endless generator; nothing
+        is retained between steps.
+        """
 
-        history: list[dict[str, Any]] = []
-        successes = 0
         for text in commands:
-            outcome = self.run_brain_step(
+            yield self.run_brain_step(
                 brain,
                 text,
                 confidence=confidence,
                 reward_bias=reward_bias,
+                headless=headless,
             )
-            history.append(outcome)
+
+    def simulate_commands(
+        self,
+        brain: RoboDogBrain,
+        commands: Iterable[str],
+        *,
+        confidence: float = 0.85,
+        reward_bias: float = 0.5,
+        headless: bool = False,
+        sink: SimulationSink | None = None,
+    ) -> dict[str, Any]:
+        """Run a batch of commands through the closed-loop simulator.
+
+        Without a ``sink`` every outcome is returned in ``history``. With one, each
+        step is written to the sink as a compact record (see
+        :func:`~vct.simulation.sinks.step_record`) and ``history`` is left empty,
+        so memory use does not grow with the number of steps.
+        """
+
+        history: list[dict[str, Any]] = []
+        steps = 0
+        successes = 0
+        outcomes = self.iter_commands(
+            brain, commands, confidence=confidence, reward_bias=reward_bias, headless=headless
+        )
+        for outcome in outcomes:
+            if sink is None:
+                history.append(outcome)
+            else:
+                sink.write(step_record(steps, outcome))
+            steps += 1
             if outcome["state"].get("success"):
                 successes += 1
-        success_rate = successes / len(commands) if commands else 0.0
+        success_rate = successes / steps if steps else 0.0
         return {
             "history": history,
+            "steps": steps,
             "success_rate": success_rate,
             "final_state": self.observe(),
         }
@@ -0,0 +1,145 @@
+"""Sinks that record simulation steps without keeping every outcome in memory."""
+
+from __future__ import annotations
+
+import json
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any
+
+from ..utils.optional import require_numpy
+
+_FLOAT_FIELDS = ("score", "reward", "fatigue", "mood", "reward_hist", "success_probability")
+_FLAG_FIELDS = ("rewarded", "success")
+
+
+def step_record(step: int, outcome: dict[str, Any]) -> dict[str, Any]:
+    """Flatten one :meth:`DogEnv.run_brain_step` outcome into a flat record."""
+
+    brain, state = outcome["brain"], outcome["state"]
+    return {
+        "step": step,
+        "action": brain["action"],
+        "score": float(brain["score"]),
+        "rewarded": bool(brain["rewarded"]),
+        "success": bool(state["success"]),
+        "reward": state["reward"],
+        "fatigue": state["fatigue"],
+        "mood": state["mood"],
+        "reward_hist": state["reward_hist"],
+        "success_probability": state["success_probability"],
+    }
+
+
+class SimulationSink:
+    """Base class for consumers of :func:`step_record` records."""
+
+    def write(self, record: dict[str, Any]) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> SimulationSink:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class NDJSONSink(SimulationSink):
+    """Write one compact JSON object per step to a file or text stream."""
+
+    def __init__(self, target: str | Path | IO[str]) -> None:
+        if isinstance(target, (str, Path)):
+            self._fh: IO[str] = Path(target).open("w", encoding="utf-8")
+            self._owned = True
+        else:
+            self._fh = target
+            self._owned = False
+        self.records = 0
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._fh.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.records += 1
+
+    def close(self) -> None:
+        if self._owned:
+            self._fh.close()
+        else:
+            self._fh.flush()
+
+
+class ColumnarBuffer(SimulationSink):
+    """Collect records into typed arrays, one per field.
+
+    Floats take 8 bytes and flags one byte per step; actions are stored as indices
+    into :attr:`actions`. With ``max_rows`` the buffer hands its columns to
+    ``on_flush`` whenever it fills up (and on :meth:`close`) and then starts over,
+    so memory stays bounded however long the simulation runs.
+    """
+
+    def __init__(
+        self,
+        max_rows: int | None = None,
+        on_flush: Callable[[ColumnarBuffer], None] | None = None,
+    ) -> None:
+        if max_rows is not None and (max_rows < 1 or on_flush is None):
+            raise ValueError("max_rows must be positive and needs an on_flush callback")
+        self.max_rows = max_rows
+        self.on_flush = on_flush
+        self.actions: list[str] = []
+        self._action_codes: dict[str, int] = {}
+        self._clear()
+
+    def _clear(self) -> None:
+        self.step = array("q")
+        self.action = array("H")
+        self.flags = {name: array("b") for name in _FLAG_FIELDS}
+        self.floats = {name: array("d") for name in _FLOAT_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.step)
+
+    def write(self, record: dict[str, Any]) -> None:
+        code = self._action_codes.get(record["action"])
+        if code is None:
+            code = self._action_codes[record["action"]] = len(self.actions)
+            self.actions.append(record["action"])
+        self.step.append(record["step"])
+        self.action.append(code)
+        for name, flag in self.flags.items():
+            flag.append(record[name])
+        for name, value in self.floats.items():
+            value.append(record[name])
+        if self.max_rows is not None and len(self) >= self.max_rows:
+            self.flush()
+
+    def columns(self) -> dict[str, array[Any]]:
+        """Return the buffered columns keyed by record field (``action`` as codes)."""
+
+        return {"step": self.step, "action": self.action, **self.flags, **self.floats}
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Return numpy copies of :meth:`columns`; the buffer can keep growing."""
+
+        np = require_numpy("ColumnarBuffer.to_numpy")
+        views: dict[str, Any] = {}
+        for name, column in self.columns().items():
+            dtype = np.dtype(column.typecode)
+            views[name] = (
+                np.frombuffer(column, dtype=dtype).copy() if column else np.empty(0, dtype)
+            )
+        return views
+
+    def flush(self) -> None:
+        if self.on_flush is not None and len(self):
+            self.on_flush(self)
+            self._clear()
+
+    def close(self) -> None:
+        self.flush()
+
+
+__all__ = ["ColumnarBuffer", "NDJSONSink", "SimulationSink", "step_record"]
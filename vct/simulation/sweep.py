@@ -0,0 +1,348 @@
+"""Parameter sweeps over :class:`RoboDogSettings` on simulated episodes."""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from ..behavior.policy import BehaviorPolicy
+from ..configuration import RoboDogSettings, apply_key_path
+from ..robodog.dog_bot_brain import RoboDogBrain
+from .dog_env import DogEnv
+
+_RANGE_KINDS = ("uniform", "loguniform", "int")
+_POLICY_CACHE_SIZE = 32
+
+RESULT_COLUMNS: dict[str, type] = {
+    "episodes": int,
+    "success_mean": float,
+    "success_std": float,
+    "success_min": float,
+    "success_max": float,
+    "reward_rate": float,
+    "elapsed_s": float,
+}
+
+
+@dataclass(frozen=True)
+class Range:
+    """A continuous, log-scaled or integer interval sampled by random search."""
+
+    low: float
+    high: float
+    log: bool = False
+    integer: bool = False
+
+    def sample(self, rng: random.Random) -> float | int:
+        if self.integer:
+            return rng.randint(int(self.low), int(self.high))
+        if self.log:
+            return math.exp(rng.uniform(math.log(self.low), math.log(self.high)))
+        return rng.uniform(self.low, self.high)
+
+
+Domain = Sequence[Any] | Range
+
+
+def _parse_value(raw: str) -> Any:
+    raw = raw.strip()
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def parse_param(spec: str) -> tuple[str, Domain]:
+    """Parse ``key.path=v1,v2,...`` or ``key.path=uniform:LOW:HIGH``.
+
+    Keys are dot separated paths into the settings, as for ``vct config set``.
+    Ranges may also be ``loguniform`` or ``int``; they need random search.
+    """
+
+    name, sep, raw = spec.partition("=")
+    name = name.strip()
+    if not sep or not name or not raw.strip():
+        raise ValueError(f"Expected KEY=VALUES, got {spec!r}")
+    kind, _, bounds = raw.partition(":")
+    if kind.strip() in _RANGE_KINDS and bounds:
+        low, _, high = bounds.partition(":")
+        try:
+            lo, hi = float(low), float(high)
+        except ValueError as exc:
+            raise ValueError(f"Invalid range in {spec!r}") from exc
+        if hi < lo or (kind == "loguniform" and lo <= 0):
+            raise ValueError(f"Invalid range in {spec!r}")
+        return name, Range(lo, hi, log=kind == "loguniform", integer=kind == "int")
+    return name, [_parse_value(value) for value in raw.split(",")]
+
+
+class SearchSpace:
+    """Named domains of setting overrides, enumerated as a grid or sampled."""
+
+    def __init__(self, params: Mapping[str, Domain]) -> None:
+        if not params:
+            raise ValueError("A sweep needs at least one parameter")
+        unknown = [k for k in params if k.split(".")[0] not in RoboDogSettings.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(unknown)}")
+        self.params = dict(params)
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[str]) -> SearchSpace:
+        return cls(dict(parse_param(spec) for spec in specs))
+
+    def grid(self) -> Iterator[dict[str, Any]]:
+        ranged = [name for name, domain in self.params.items() if isinstance(domain, Range)]
+        if ranged:
+            raise ValueError(f"Ranges need random search: {', '.join(ranged)}")
+        domains = [domain for domain in self.params.values() if not isinstance(domain, Range)]
+        for values in itertools.product(*domains):
+            yield dict(zip(self.params, values))
+
+    def sample(self, count: int, seed: int | None = None) -> Iterator[dict[str, Any]]:
+        rng = random.Random(seed)
+        for _ in range(count):
+            yield {
+                name: domain.sample(rng) if isinstance(domain, Range) else rng.choice(domain)
+                for name, domain in self.params.items()
+            }
+
+    def column_types(self) -> dict[str, type]:
+        """Return the value type of every parameter column."""
+
+        types: dict[str, type] = {}
+        for name, domain in self.params.items():
+            if isinstance(domain, Range):
+                types[name] = int if domain.integer else float
+                continue
+            kinds = {type(value) for value in domain}
+            if kinds <= {bool}:
+                types[name] = bool
+            elif kinds <= {int}:
+                types[name] = int
+            elif kinds <= {int, float}:
+                types[name] = float
+            else:
+                types[name] = str
+        return types
+
+
+def apply_overrides(settings: RoboDogSettings, overrides: Mapping[str, Any]) -> RoboDogSettings:
+    for key, value in overrides.items():
+        settings = apply_key_path(settings, key.split("."), value)
+    return settings
+
+
+@dataclass(frozen=True)
+class EpisodeSpec:
+    """How every point of a sweep is evaluated."""
+
+    commands: tuple[str, ...]
+    steps: int = 200
+    episodes: int = 8
+    seed: int = 0
+    command_interval_s: float = 1.0
+    confidence: float = 0.85
+    reward_bias: float = 0.5
+
+    def __post_init__(self) -> None:
+        if not self.commands:
+            raise ValueError("An episode needs at least one command")
+        if self.steps < 1 or self.episodes < 1:
+            raise ValueError("steps and episodes must be at least 1")
+
+
+# Per-process state of sweep workers: one brain, reconfigured for every run, and
+# the policies built for recently seen policy configurations.
+_worker_brain: RoboDogBrain | None = None
+_worker_settings: RoboDogSettings | None = None
+_worker_policies: dict[str, BehaviorPolicy] = {}
+
+
+def _init_worker(config_path: str) -> None:
+    global _worker_brain, _worker_settings
+    _worker_brain = RoboDogBrain(cfg_path=config_path, simulate=True)
+    _worker_settings = _worker_brain.settings
+    _worker_policies.clear()
+
+
+def _policy_for(settings: RoboDogSettings) -> BehaviorPolicy:
+    key = json.dumps(settings.policy_config, sort_keys=True, default=str)
+    policy = _worker_policies.get(key)
+    if policy is None:
+        if len(_worker_policies) >= _POLICY_CACHE_SIZE:
+            del _worker_policies[next(iter(_worker_policies))]
+        policy = _worker_policies[key] = BehaviorPolicy(settings.policy_config)
+    return policy
+
+
+def _run_point(run_id: int, overrides: dict[str, Any], spec: EpisodeSpec) -> dict[str, Any]:
+    if _worker_brain is None or _worker_settings is None:
+        raise RuntimeError("Sweep worker was not initialised")
+    brain = _worker_brain
+    settings = apply_overrides(_worker_settings, overrides)
+    policy = _policy_for(settings)
+    start = perf_counter()
+    rates: list[float] = []
+    rewards = 0
+    for episode in range(spec.episodes):
+        env = DogEnv(seed=spec.seed + episode, command_interval_s=spec.command_interval_s)
+        commands = itertools.islice(itertools.cycle(spec.commands), spec.steps)
+        brain.reconfigure(settings, policy=policy)
+        brain.set_clock(env.clock)
+        successes = 0
+        outcomes = env.iter_commands(
+            brain,
+            commands,
+            confidence=spec.confidence,
+            reward_bias=spec.reward_bias,
+            headless=True,
+        )
+        for outcome in outcomes:
+            successes += outcome["state"]["success"]
+            rewards += outcome["brain"]["rewarded"]
+        rates.append(successes / spec.steps)
+    return {
+        "run_id": run_id,
+        **overrides,
+        "episodes": spec.episodes,
+        "success_mean": statistics.fmean(rates),
+        "success_std": statistics.pstdev(rates),
+        "success_min": min(rates),
+        "success_max": max(rates),
+        "reward_rate": rewards / (spec.episodes * spec.steps),
+        "elapsed_s": perf_counter() - start,
+    }
+
+
+def run_sweep(
+    config_path: str,
+    points: Iterable[dict[str, Any]],
+    spec: EpisodeSpec,
+    *,
+    workers: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Evaluate every point in a process pool and yield rows as runs finish.
+
+    Each worker builds one :class:`RoboDogBrain` from ``config_path`` and reuses it
+    for all of its runs, swapping settings with :meth:`RoboDogBrain.reconfigure`.
+    Episodes use the headless decision path and virtual time. Rows arrive in
+    completion order; ``run_id`` is the index of the point.
+    """
+
+    base = RoboDogSettings.load(config_path)
+    points = list(points)
+    for overrides in points:
+        apply_overrides(base, overrides)  # fail fast on invalid values
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        initializer=_init_worker,
+        initargs=(config_path,),
+    ) as pool:
+        futures = [
+            pool.submit(_run_point, i, overrides, spec) for i, overrides in enumerate(points)
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+class CSVResultsWriter:
+    """Append result rows to a CSV file, flushing after every row."""
+
+    def __init__(self, path: str | Path, columns: Mapping[str, type]) -> None:
+        self._fh = Path(path).open("w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._fh, fieldnames=list(columns), extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, row: Mapping[str, Any]) -> None:
+        self._writer.writerow(row)
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class ParquetResultsWriter:
+    """Write result rows to a Parquet file, one row group per ``row_group_size`` rows.
+
+    The default writes every row as soon as it arrives; larger groups compress
+    better but hold finished points back in memory until the group is full.
+    """
+
+    _ARROW_TYPES = {bool: "bool_", int: "int64", float: "float64", str: "string"}
+
+    def __init__(
+        self, path: str | Path, columns: Mapping[str, type], *, row_group_size: int = 1
+    ) -> None:
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be at least 1")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError(
+                "pyarrow is required for Parquet sweep results. "
+                "Install it with `pip install pyarrow`."
+            ) from exc
+        self._pa = pa
+        self._schema = pa.schema(
+            [(name, getattr(pa, self._ARROW_TYPES[kind])()) for name, kind in columns.items()]
+        )
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+        self._columns = columns
+        self._rows: list[dict[str, Any]] = []
+        self.row_group_size = row_group_size
+
+    def write(self, row: Mapping[str, Any]) -> None:
+        self._rows.append({name: kind(row[name]) for name, kind in self._columns.items()})
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            table = self._pa.Table.from_pylist(self._rows, schema=self._schema)
+            self._writer.write_table(table)
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def open_results_writer(
+    path: str | Path, columns: Mapping[str, type], *, row_group_size: int = 1
+) -> CSVResultsWriter | ParquetResultsWriter:
+    """Pick the writer from the suffix: ``.parquet`` (needs pyarrow) or CSV."""
+
+    if Path(path).suffix.lower() == ".parquet":
+        return ParquetResultsWriter(path, columns, row_group_size=row_group_size)
+    return CSVResultsWriter(path, columns)
+
+
+__all__ = [
+    "CSVResultsWriter",
+    "EpisodeSpec",
+    "ParquetResultsWriter",
+    "RESULT_COLUMNS",
+    "Range",
+    "SearchSpace",
+    "apply_overrides",
+    "open_results_writer",
+    "parse_param",
+    "run_sweep",
+]
@@ -0,0 +1,134 @@
+"""Vectorised counterpart of :class:`~vct.simulation.dog_env.DogEnv`."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from ..utils.optional import require_numpy
+
+
+class VectorDogEnv:
+    """Step many independent :class:`DogEnv` instances at once.
+
+    Environment ``i`` behaves exactly like ``DogEnv(seed=seeds[i])``: fatigue, mood
+    and reward history are float64 arrays updated with the same expressions as
+    :meth:`DogEnv.step`, and every environment owns a ``random.Random(seed)`` that
+    is consumed once per step, as in the scalar simulator. Given the same scores the
+    trajectories are therefore bit-for-bit identical.
+
+    Draws are pulled ``block`` steps at a time per environment into a buffer, so a
+    step itself is a handful of array operations over all environments.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        seed: int = 42,
+        *,
+        seeds: Sequence[int] | None = None,
+        block: int = 256,
+    ) -> None:
+        np = require_numpy("VectorDogEnv")
+        self._np = np
+        if num_envs < 1 or block < 1:
+            raise ValueError("num_envs and block must be positive")
+        if seeds is None:
+            seeds = range(seed, seed + num_envs)
+        elif len(seeds) != num_envs:
+            raise ValueError(f"Expected {num_envs} seeds, got {len(seeds)}")
+        self.num_envs = num_envs
+        self.seeds = list(seeds)
+        self.block = block
+        self._streams = [random.Random(s) for s in self.seeds]
+        self._draws = np.empty((block, num_envs))
+        self._cursor = block
+        self.reset()
+
+    def _next_draws(self) -> Any:
+        if self._cursor == self.block:
+            steps = range(self.block)
+            for i, rng in enumerate(self._streams):
+                draw = rng.random
+                self._draws[:, i] = [draw() for _ in steps]
+            self._cursor = 0
+        row = self._draws[self._cursor]
+        self._cursor += 1
+        return row
+
+    # ------------------------------------------------------------------
+    # Environment dynamics helpers
+    # ------------------------------------------------------------------
+    def reset(self) -> dict[str, Any]:
+        """Reset every environment to a neutral state; random streams continue."""
+
+        np = self._np
+        self.fatigue = np.zeros(self.num_envs)
+        self.mood = np.zeros(self.num_envs)
+        self.reward_history = np.full(self.num_envs, 0.5)
+        return self.observe()
+
+    def observe(self) -> dict[str, Any]:
+        """Return copies of the state arrays keyed like :meth:`DogEnv.observe`."""
+
+        return {
+            "fatigue": self.fatigue.copy(),
+            "mood": self.mood.copy(),
+            "reward_hist": self.reward_history.copy(),
+        }
+
+    # ------------------------------------------------------------------
+    # Simulation logic
+    # ------------------------------------------------------------------
+    def step(self, scores: Any) -> dict[str, Any]:
+        """Advance all environments given one action score per environment.
+
+        ``scores`` is a scalar or an array of shape ``(num_envs,)``. The result has
+        the keys of :meth:`DogEnv.step` with one array entry per environment.
+        """
+
+        np = self._np
+        score = np.broadcast_to(np.asarray(scores, dtype=np.float64), (self.num_envs,))
+        fatigue_penalty = 0.25 * self.fatigue
+        mood_bonus = 0.1 * self.mood
+        success_p = 0.5 + 0.4 * score - fatigue_penalty + mood_bonus
+        success = self._next_draws() < np.clip(success_p, 0.05, 0.95)
+
+        fatigue_gain = np.where(success, 0.1, 0.05)
+        self.fatigue = np.clip(self.fatigue + fatigue_gain, 0.0, 1.0)
+
+        mood_change = np.where(success, 0.15, -0.1 - 0.05 * self.fatigue)
+        self.mood = np.clip(self.mood + mood_change, -1.0, 1.0)
+
+        reward_target = success.astype(np.float64)
+        self.reward_history = 0.8 * self.reward_history + 0.2 * reward_target
+
+        observation = self.observe()
+        observation.update(
+            {
+                "success": success,
+                "reward": reward_target,
+                "success_probability": np.clip(success_p, 0.0, 1.0),
+            }
+        )
+        return observation
+
+    def rollout(self, score_fn: Callable[[dict[str, Any]], Any], steps: int) -> dict[str, Any]:
+        """Run ``steps`` steps, scoring each from the current observation.
+
+        ``score_fn`` receives the dict returned by :meth:`observe` and returns the
+        scores for :meth:`step`, e.g. a policy evaluated on the whole batch.
+        """
+
+        np = self._np
+        successes = np.zeros(self.num_envs, dtype=np.int64)
+        for _ in range(steps):
+            successes += self.step(score_fn(self.observe()))["success"]
+        return {
+            "success_rate": successes / steps if steps else np.zeros(self.num_envs),
+            "final_state": self.observe(),
+        }
+
+
+__all__ = ["VectorDogEnv"]
@@ -0,0 +1,47 @@
+"""Clocks that decouple reward timing from wall time."""
+
+from __future__ import annotations
+
+import time
+
+# Virtual clocks start at a large timestamp so that code which treats ``0.0`` as
+# "never happened" (e.g. the last reward time) behaves as it does with wall time.
+VIRTUAL_EPOCH = 1_000_000_000.0
+
+
+class Clock:
+    """Wall-clock time and real sleeps; the default for every component."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """A clock that only moves when told to, for fast and deterministic simulations.
+
+    :meth:`sleep` advances the clock instead of blocking, so simulated actuator
+    pulses and cooldowns cost no real time.
+    """
+
+    def __init__(self, start: float = VIRTUAL_EPOCH) -> None:
+        self._now = float(start)
+
+    def time(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> float:
+        if seconds < 0:
+            raise ValueError("Cannot move a clock backwards")
+        self._now += seconds
+        return self._now
+
+
+SYSTEM_CLOCK = Clock()
+
+__all__ = ["SYSTEM_CLOCK", "VIRTUAL_EPOCH", "Clock", "VirtualClock"]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 API_REQUEST_COUNTER = Counter(
     "vct_api_requests_total",
@@ -29,6 +29,43 @@ REWARD_COUNTER = Counter(
     ("action", "outcome"),
 )
 
+STAGE_LATENCY = Histogram(
+    "vct_stage_latency_seconds",
+    "Time spent in each stage of the command pipeline",
+    ("stage",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+BACKGROUND_DROPPED = Counter(
+    "vct_background_dropped_total",
+    "Background side effects dropped because their queue was full",
+    ("stage",),
+)
+
+TTS_CACHE_LOOKUPS = Counter(
+    "vct_tts_cache_lookups_total",
+    "Synthesized speech cache lookups",
+    ("result",),
+)
+
+TTS_QUEUE_EVENTS = Counter(
+    "vct_tts_queue_events_total",
+    "Phrases dropped or coalesced by the queued TTS worker",
+    ("event",),
+)
+
+API_KEY_REQUESTS = Counter(
+    "vct_api_key_requests_total",
+    "API key checks by key id (invalid and missing keys are grouped)",
+    ("key_id",),
+)
+
+STARTUP_SECONDS = Gauge(
+    "vct_startup_seconds",
+    "Time spent initialising each component at startup",
+    ("component",),
+)
+
 
 def record_api_request(endpoint: str, method: str, status_code: int) -> None:
     """Increment API request counter with labels for downstream analysis."""
@@ -44,10 +81,10 @@ def observe_command_latency(endpoint: str, duration_s: float) -> None:
     COMMAND_LATENCY.labels(endpoint=endpoint).observe(duration_s)
 
 
-def record_command(source: str) -> None:
+def record_command(source: str, count: int = 1) -> None:
     """Track command processing by its source (e.g. API or CLI)."""
 
-    COMMAND_COUNTER.labels(source=source).inc()
+    COMMAND_COUNTER.labels(source=source).inc(count)
 
 
 def record_reward(action: str, rewarded: bool) -> None:
@@ -57,13 +94,54 @@ def record_reward(action: str, rewarded: bool) -> None:
     REWARD_COUNTER.labels(action=action or "UNKNOWN", outcome=outcome).inc()
 
 
+def observe_stage_latency(stage: str, duration_s: float) -> None:
+    """Observe how long a single pipeline stage (decide, tts, reward) took."""
+
+    STAGE_LATENCY.labels(stage=stage).observe(duration_s)
+
+
+def record_background_drop(stage: str) -> None:
+    """Track side effects discarded by a saturated background queue."""
+
+    BACKGROUND_DROPPED.labels(stage=stage).inc()
+
+
+def record_tts_cache_lookup(hit: bool) -> None:
+    """Track whether synthesized audio was served from the cache."""
+
+    TTS_CACHE_LOOKUPS.labels(result="hit" if hit else "miss").inc()
+
+
+def record_tts_queue_event(event: str) -> None:
+    """Track queued TTS overflow handling ("dropped" or "coalesced")."""
+
+    TTS_QUEUE_EVENTS.labels(event=event).inc()
+
+
+def record_startup_duration(component: str, duration_s: float) -> None:
+    """Record how long a component (config, stt, tts, policy, ...) took to start."""
+
+    STARTUP_SECONDS.labels(component=component).set(duration_s)
+
+
 __all__ = [
+    "API_KEY_REQUESTS",
     "API_REQUEST_COUNTER",
+    "BACKGROUND_DROPPED",
     "COMMAND_COUNTER",
     "COMMAND_LATENCY",
     "REWARD_COUNTER",
+    "STAGE_LATENCY",
+    "STARTUP_SECONDS",
+    "TTS_CACHE_LOOKUPS",
+    "TTS_QUEUE_EVENTS",
     "observe_command_latency",
+    "observe_stage_latency",
     "record_api_request",
+    "record_background_drop",
     "record_command",
     "record_reward",
+    "record_startup_duration",
+    "record_tts_cache_lookup",
+    "record_tts_queue_event",
 ]
@@ -0,0 +1,20 @@
+"""Imports of optional third-party packages with an actionable error."""
+
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+
+
+def require_numpy(feature: str) -> ModuleType:
+    """Return the numpy module or raise :class:`RuntimeError` naming ``feature``."""
+
+    try:
+        return importlib.import_module("numpy")
+    except ImportError as exc:
+        raise RuntimeError(
+            f"numpy is required for {feature}. Install it with `pip install numpy`."
+        ) from exc
+
+
+__all__ = ["require_numpy"]